@@ -0,0 +1,58 @@
+"""
+Sparse fieldsets for list endpoints (``?fields=slug,title,summary``).
+"""
+from typing import Any, Dict, Optional, Set, Type
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Set[str]]:
+    """
+    Parse a comma-separated ``fields`` parameter against a schema.
+
+    Args:
+        fields: Raw query parameter value
+        model: Schema of the list items
+
+    Returns:
+        Requested field names, or None to return every field
+
+    Raises:
+        HTTPException: 400 if a field is not part of the schema
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return requested or None
+
+
+def select_fields(data: Any, fields: Optional[Set[str]], model: Type[BaseModel]) -> Any:
+    """
+    Trim the items of a paginated response to the requested fields.
+
+    Args:
+        data: Paginated response (model instance or dict) with an ``items`` list
+        fields: Field names from :func:`parse_fields`
+        model: Response schema used to serialize ``data``
+
+    Returns:
+        ``data`` unchanged when no fields were requested, otherwise a
+        JSONResponse with pagination metadata and trimmed items (returned
+        directly so FastAPI does not re-validate it against the full schema)
+    """
+    if fields is None:
+        return data
+    response = data if isinstance(data, model) else model.model_validate(data)
+    include: Dict[str, Any] = {
+        name: True for name in model.model_fields if name != "items"
+    }
+    include["items"] = {"__all__": fields}
+    return JSONResponse(response.model_dump(mode="json", include=include))
@@ -4,6 +4,7 @@ from .blog import router as blog_router
 from .essays import router as essays_router
 from .about import router as about_router
 from .contact import router as contact_router
+from .search import router as search_router
 
 # Create main router (can be used to group API routes under /api)
 api_router = APIRouter(prefix="/api")
@@ -13,3 +14,4 @@ api_router.include_router(blog_router, prefix="/blog", tags=["blog"])
 api_router.include_router(essays_router, prefix="/essays", tags=["essays"])
 api_router.include_router(about_router, prefix="/about", tags=["about"])
 api_router.include_router(contact_router, prefix="/contact", tags=["contact"])
+api_router.include_router(search_router, prefix="/search", tags=["search"])
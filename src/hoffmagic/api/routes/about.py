@@ -32,7 +32,7 @@ async def get_author_info(
     """
     try:
         about_service = AboutService(db)
-        author = await about_service.get_author_info()
+        author = await about_service.get_author_view()
         
         if not author:
             raise HTTPException(
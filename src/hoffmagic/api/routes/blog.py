@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 
+from hoffmagic.cache import is_not_modified, make_etag, not_modified, validator_headers
+from hoffmagic.api.fieldsets import parse_fields, select_fields
 from hoffmagic.db.engine import get_session
+from hoffmagic.db.models import Comment
 from hoffmagic.services.blog import BlogService
-from hoffmagic.api.schemas import PostRead, PostDetailRead, BlogPostsResponse
+from hoffmagic.services.read_models import post_validators
+from hoffmagic.config import settings
+from hoffmagic.api.schemas import (
+    PostRead, PostListItem, BlogPostsResponse, CommentCreate, CommentRead,
+    CommentThreadsResponse,
+)
 
 import logging
 
@@ -15,12 +23,23 @@ router = APIRouter()
 async def get_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous response's next_cursor"
+    ),
+    include_total: bool = Query(
+        True, description="Set false to skip counting the total"
+    ),
     tag: Optional[str] = None,
     search: Optional[str] = None,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated item fields to return, e.g. slug,title,summary",
+    ),
     lang: str = Query('en'),
     db: AsyncSession = Depends(get_session)
 ):
     blog_service = BlogService(db)
+    selected = parse_fields(fields, PostListItem)
     try:
         # Note: The service method name changed in the diff
         posts_data = await blog_service.get_posts(
@@ -28,22 +47,75 @@ async def get_posts(
             page_size=page_size,
             tag_slug=tag,
             search=search,
+            cursor=cursor,
+            include_total=include_total,
             is_essay=False,
             lang=lang
         )
-        return posts_data
+        return select_fields(posts_data, selected, BlogPostsResponse)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting posts: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{slug}", response_model=PostDetailRead)
+@router.get("/{slug}", response_model=PostRead)
 async def get_post(
+    request: Request,
+    response: Response,
     slug: str,
     lang: str = Query('en'),
     db: AsyncSession = Depends(get_session)
 ):
     blog_service = BlogService(db)
-    post = await blog_service.get_post_by_slug(slug, is_essay=False, lang=lang)
+    validator = await blog_service.get_post_validator(slug, is_essay=False)
+    if not validator:
+        raise HTTPException(status_code=404, detail="Post not found")
+    etag, last_modified = post_validators(validator, lang)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    post = await blog_service.get_post_view(slug, is_essay=False, lang=lang)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    response.headers.update(validator_headers(etag, last_modified))
     return post
+
+@router.get("/{slug}/comments", response_model=CommentThreadsResponse)
+async def get_comments(
+    request: Request,
+    response: Response,
+    slug: str,
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous response's next_cursor"
+    ),
+    limit: int = Query(settings.COMMENTS_PAGE_SIZE, ge=1, le=100),
+    db: AsyncSession = Depends(get_session)
+) -> Union[CommentThreadsResponse, Response]:
+    blog_service = BlogService(db)
+    validator = await blog_service.get_post_validator(
+        slug, is_essay=False, include_comments=True
+    )
+    if not validator:
+        raise HTTPException(status_code=404, detail="Post not found")
+    # Approving, unapproving, adding or editing a comment changes one of
+    # these; the reply depth changes which comments are returned
+    etag = make_etag(
+        validator.approved_ids_hash, validator.last_comment_change,
+        settings.COMMENT_MAX_DEPTH, cursor, limit,
+    )
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None)
+
+    threads = await blog_service.get_comment_threads(slug, cursor=cursor, limit=limit)
+    response.headers.update(validator_headers(etag, None))
+    return threads
+
+@router.post("/{slug}/comments", response_model=CommentRead, status_code=201)
+async def add_comment(
+    slug: str,
+    comment: CommentCreate,
+    db: AsyncSession = Depends(get_session)
+) -> Comment:
+    blog_service = BlogService(db)
+    return await blog_service.add_comment(slug, comment)
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, Optional, List
 
+from hoffmagic.cache import is_not_modified, not_modified, validator_headers
+from hoffmagic.api.fieldsets import parse_fields, select_fields
 from hoffmagic.db.engine import get_session
 from hoffmagic.services.essays import EssaysService
-from hoffmagic.api.schemas import PostRead, PostDetailRead, EssaysResponse
+from hoffmagic.services.read_models import post_validators
+from hoffmagic.api.schemas import PostRead, PostListItem, EssaysResponse
 
 import logging
 
@@ -15,31 +18,57 @@ router = APIRouter()
 async def get_essays(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous response's next_cursor"
+    ),
+    include_total: bool = Query(
+        True, description="Set false to skip counting the total"
+    ),
     tag: Optional[str] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_session)
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated item fields to return, e.g. slug,title,summary",
+    ),
+    db: AsyncSession = Depends(get_session),
 ):
     essays_service = EssaysService(db)
+    selected = parse_fields(fields, PostListItem)
     try:
         # Note: The service method name changed in the diff
         essays_data = await essays_service.get_essays(
             page=page,
             page_size=page_size,
             tag_slug=tag, # Pass tag as tag_slug
-            search=search
+            search=search,
+            cursor=cursor,
+            include_total=include_total
         )
-        return essays_data
+        return select_fields(essays_data, selected, EssaysResponse)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting essays: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{slug}", response_model=PostDetailRead)
+@router.get("/{slug}", response_model=PostRead)
 async def get_essay(
+    request: Request,
+    response: Response,
     slug: str,
+    lang: str = Query('en'),
     db: AsyncSession = Depends(get_session)
 ):
     essays_service = EssaysService(db)
-    essay = await essays_service.get_essay_by_slug(slug)
+    validator = await essays_service.get_essay_validator(slug)
+    if not validator:
+        raise HTTPException(status_code=404, detail="Essay not found")
+    etag, last_modified = post_validators(validator, lang)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    essay = await essays_service.get_essay_view(slug, lang=lang)
     if not essay:
         raise HTTPException(status_code=404, detail="Essay not found")
+    response.headers.update(validator_headers(etag, last_modified))
     return essay
@@ -0,0 +1,41 @@
+"""
+API routes for search-as-you-type suggestions.
+"""
+import logging
+
+from fastapi import APIRouter, Query, Response
+
+from hoffmagic.api.schemas import SuggestResponse
+from hoffmagic.config import settings
+from hoffmagic.search import suggest_index
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.api.search")
+
+# Create router
+router = APIRouter()
+
+
+@router.get(
+    "/suggest",
+    response_model=SuggestResponse,
+    summary="Autocomplete search",
+    description="Complete a partially typed query with post titles and tag names",
+)
+async def suggest(
+    response: Response,
+    q: str = Query("", max_length=100),
+    lang: str = Query("en"),
+    limit: int = Query(8, ge=1, le=10),
+) -> SuggestResponse:
+    """
+    Complete a partially typed query.
+
+    Served from the in-memory prefix index without a database session, so it
+    is cheap enough to call on every keystroke. Returns no items until the
+    index has been built.
+    """
+    items = suggest_index.suggest(q, lang, limit) if suggest_index.ready else []
+    # Let browsers reuse completions while the user edits back and forth
+    response.headers["Cache-Control"] = f"public, max-age={min(settings.CACHE_TTL, 60)}"
+    return {"query": q, "items": items}
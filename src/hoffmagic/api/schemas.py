@@ -2,7 +2,7 @@
 Pydantic schemas for API data validation.
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, EmailStr, Field, HttpUrl, constr
 
@@ -63,7 +63,7 @@ class PostCreate(PostBase):
 
 
 class CommentCreate(CommentBase):
-    post_id: int
+    # The post is taken from the URL
     parent_id: Optional[int] = None
 
 
@@ -143,6 +143,19 @@ class CommentRead(CommentBase):
         from_attributes = True
 
 
+class CommentThreadRead(BaseModel):
+    """Public view of an approved comment and its approved replies (no email)."""
+    id: int
+    parent_id: Optional[int] = None
+    author_name: str
+    content: str
+    created_at: datetime
+    replies: List["CommentThreadRead"] = []
+
+    class Config:
+        from_attributes = True
+
+
 class PostRead(PostBase):
     id: int
     slug: str
@@ -152,14 +165,33 @@ class PostRead(PostBase):
     author_id: int
     author: AuthorRead
     tags: List[TagRead] = []
+    # Per-language toc, words, reading_minutes and excerpt computed at write time
+    content_meta: Optional[Dict[str, Any]] = None
+    # Highlighted HTML excerpt, only set on search results
+    search_snippet: Optional[str] = None
     
     class Config:
         from_attributes = True
 
 
-class PostDetailRead(PostRead):
-    comments: List[CommentRead] = []
-    
+class PostListItem(BaseModel):
+    """Listing projection of a post: everything except the bodies."""
+    id: int
+    slug: str
+    title: str
+    summary: Optional[str] = None
+    is_published: bool = False
+    is_essay: bool = False
+    featured_image: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    publish_date: Optional[datetime] = None
+    author_id: int
+    author: AuthorRead
+    tags: List[TagRead] = []
+    content_meta: Optional[Dict[str, Any]] = None
+    search_snippet: Optional[str] = None
+
     class Config:
         from_attributes = True
 
@@ -184,19 +216,21 @@ class ContactMessageRead(ContactMessageBase):
 
 # Response schemas
 class PaginatedResponse(BaseModel):
-    total: int
-    page: int
+    # total/pages are None when the count was skipped; page is None for cursor requests
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
-    pages: int
+    pages: Optional[int] = None
     items: List[BaseModel]
+    next_cursor: Optional[str] = None
 
 
 class BlogPostsResponse(PaginatedResponse):
-    items: List[PostRead]
+    items: List[PostListItem]
 
 
 class EssaysResponse(PaginatedResponse):
-    items: List[PostRead]
+    items: List[PostListItem]
 
 
 class TagsResponse(PaginatedResponse):
@@ -207,6 +241,10 @@ class CommentsResponse(PaginatedResponse):
     items: List[CommentRead]
 
 
+class CommentThreadsResponse(PaginatedResponse):
+    items: List[CommentThreadRead]
+
+
 class SubscribersResponse(PaginatedResponse):
     items: List[SubscriberRead]
 
@@ -215,6 +253,21 @@ class ContactMessagesResponse(PaginatedResponse):
     items: List[ContactMessageRead]
 
 
+# Search schemas
+class SuggestionRead(BaseModel):
+    kind: str
+    label: str
+    url: str
+
+    class Config:
+        from_attributes = True
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    items: List[SuggestionRead]
+
+
 # Error response
 class ErrorResponse(BaseModel):
     detail: str
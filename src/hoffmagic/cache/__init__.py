@@ -0,0 +1,29 @@
+"""
+In-process caching primitives for HoffMagic Blog.
+"""
+from .conditional import (
+    is_not_modified, make_etag, not_modified, parse_http_date, validator_headers,
+)
+from .lru import ByteLRUCache
+from .page import (
+    CachedPage, PageCache, cacheable_path, page_cache, post_cache_tags, tag_response,
+)
+from .singleflight import SingleFlight
+from .ttl import TTLCache
+
+__all__ = [
+    "ByteLRUCache",
+    "TTLCache",
+    "CachedPage",
+    "PageCache",
+    "SingleFlight",
+    "page_cache",
+    "cacheable_path",
+    "post_cache_tags",
+    "tag_response",
+    "make_etag",
+    "is_not_modified",
+    "not_modified",
+    "parse_http_date",
+    "validator_headers",
+]
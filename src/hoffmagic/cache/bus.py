@@ -0,0 +1,137 @@
+"""
+Cross-replica cache invalidation over PostgreSQL LISTEN/NOTIFY.
+
+Service writes publish an event naming what changed (page cache tags,
+slugs, a post or author id) on ``Settings.CACHE_INVALIDATION_CHANNEL`` in the
+same transaction as the write, so other replicas hear about exactly the
+writes that committed. Each replica keeps one dedicated connection
+listening on the channel and hands events from other processes to a
+handler; after a reconnect it resyncs, since notifications sent while it
+was away are lost.
+"""
+import asyncio
+import json
+import logging
+import random
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+import psycopg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hoffmagic.config import settings
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.cache.bus")
+
+# Identifies this process, so it skips its own events
+ORIGIN = uuid.uuid4().hex
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+
+async def publish(
+    db: AsyncSession,
+    pages: Iterable[str] = (),
+    slugs: Iterable[Optional[str]] = (),
+    post_id: Optional[int] = None,
+    author_id: Optional[int] = None,
+) -> None:
+    """
+    Queue an invalidation event; it is delivered when ``db`` commits.
+
+    Args:
+        db: SQLAlchemy async session holding the write
+        pages: Page cache tags to invalidate
+        slugs: Post slugs whose cached ids are stale
+        post_id: Post to reload into in-memory indexes
+        author_id: Author to reload into in-memory indexes
+    """
+    if not settings.CACHE_INVALIDATION_ENABLED:
+        return
+    event = {
+        "origin": ORIGIN,
+        "pages": sorted(set(pages)),
+        "slugs": sorted({slug for slug in slugs if slug}),
+        "post_id": post_id,
+        "author_id": author_id,
+    }
+    payload = json.dumps(event, separators=(",", ":"))
+    if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+        # Too many keys for one notification; receivers drop everything instead
+        payload = json.dumps({"origin": ORIGIN, "resync": True}, separators=(",", ":"))
+    await db.execute(
+        select(func.pg_notify(settings.CACHE_INVALIDATION_CHANNEL, payload))
+    )
+
+
+def _conninfo() -> str:
+    """
+    libpq connection string for listening (without the SQLAlchemy driver).
+
+    LISTEN needs a session of its own, so behind a transaction-pooling
+    pgbouncer ``Settings.CACHE_INVALIDATION_DATABASE_URL`` must point at
+    the database directly (or at a session-mode pool).
+    """
+    url = str(settings.CACHE_INVALIDATION_DATABASE_URL or settings.DATABASE_URL)
+    scheme, _, rest = url.partition("://")
+    return f"postgresql://{rest}" if scheme.startswith("postgresql") else url
+
+
+async def listen(
+    handle: Callable[[Dict[str, Any]], Awaitable[None]],
+    resync: Callable[[], Awaitable[None]],
+) -> None:
+    """
+    Apply invalidation events from other processes until cancelled.
+
+    Reconnects with capped exponential backoff (with jitter). Once it is
+    listening again after a lost or failed connection it calls ``resync``,
+    as events may have been missed in the meantime. Runs as a background task.
+
+    Args:
+        handle: Applies one event from another process
+        resync: Rebuilds every local cache from the database
+    """
+    delay = settings.CACHE_INVALIDATION_RECONNECT_MIN_SECONDS
+    missed = False
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                _conninfo(), autocommit=True
+            ) as conn:
+                await conn.execute(f'LISTEN "{settings.CACHE_INVALIDATION_CHANNEL}"')
+                logger.info(
+                    "Listening for cache invalidations on "
+                    f"'{settings.CACHE_INVALIDATION_CHANNEL}'"
+                )
+                delay = settings.CACHE_INVALIDATION_RECONNECT_MIN_SECONDS
+                if missed:
+                    await resync()
+                    missed = False
+                async for notify in conn.notifies():
+                    try:
+                        event = json.loads(notify.payload)
+                        if event.get("origin") == ORIGIN:
+                            continue
+                        if event.get("resync"):
+                            await resync()
+                        else:
+                            await handle(event)
+                    except Exception as e:
+                        logger.error(
+                            f"Error applying cache invalidation {notify.payload!r}: {e}"
+                        )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                f"Cache invalidation listener disconnected: {e}; "
+                f"reconnecting in {delay:.1f}s"
+            )
+        # Also reached when the server closes the connection cleanly
+        missed = True
+        await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        delay = min(delay * 2, settings.CACHE_INVALIDATION_RECONNECT_MAX_SECONDS)
@@ -0,0 +1,130 @@
+"""
+Conditional GET support: ETag / Last-Modified validators and 304 responses.
+
+Routes compute a validator from a cheap query (e.g. ``Post.updated_at``)
+before loading or rendering anything, and answer ``304 Not Modified`` when
+the client's copy is still current.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from hoffmagic.config import settings
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the values a response depends on.
+
+    ``Settings.TEMPLATE_VERSION`` is always included so template changes
+    invalidate every validator.
+
+    Args:
+        parts: Values such as updated_at, language or comment aggregates
+
+    Returns:
+        Weak entity tag, e.g. ``W/"3f2a..."``
+    """
+    raw = "\0".join(str(part) for part in (settings.TEMPLATE_VERSION, *parts))
+    return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP-date (always GMT)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP-date header value, returning None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    request: Request, etag: Optional[str], last_modified: Optional[datetime]
+) -> bool:
+    """
+    Check the request's conditional headers against the current validators.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since`` (RFC 9110).
+    ETags are compared weakly.
+
+    Args:
+        request: Incoming request
+        etag: Current entity tag, if any
+        last_modified: Current modification time, if any
+
+    Returns:
+        True if the client's cached copy is still current
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        candidates = {_strip_weak(tag) for tag in if_none_match.split(",")}
+        return "*" in candidates or _strip_weak(etag) in candidates
+
+    since = parse_http_date(request.headers.get("if-modified-since"))
+    if since is not None and last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP-dates have one second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(
+    etag: Optional[str], last_modified: Optional[datetime]
+) -> Dict[str, str]:
+    """
+    Build the headers that let clients revalidate instead of refetching.
+
+    Args:
+        etag: Current entity tag, if any
+        last_modified: Current modification time, if any
+
+    Returns:
+        ETag, Last-Modified and Cache-Control headers
+    """
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(
+    etag: Optional[str], last_modified: Optional[datetime], vary: Optional[str] = None
+) -> Response:
+    """
+    Build an empty ``304 Not Modified`` response carrying the validators.
+
+    Args:
+        etag: Current entity tag, if any
+        last_modified: Current modification time, if any
+        vary: Vary header of the full response, if any
+
+    Returns:
+        304 response
+    """
+    headers = validator_headers(etag, last_modified)
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=304, headers=headers)
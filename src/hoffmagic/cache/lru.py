@@ -0,0 +1,99 @@
+"""
+Size-bounded LRU cache for rendered strings.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Approximate per-entry bookkeeping cost (OrderedDict node + tuple)
+ENTRY_OVERHEAD_BYTES = 120
+
+
+class ByteLRUCache:
+    """
+    Least-recently-used cache bounded by the memory held by its values.
+
+    Entry-count bounds are a poor fit for rendered documents whose sizes vary
+    by orders of magnitude; bounding by bytes keeps memory use predictable.
+    Values larger than the whole budget are never stored.
+    """
+
+    def __init__(self, max_bytes: int, name: str = "cache") -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Upper bound for the memory held by keys and values
+            name: Name used in statistics and log messages
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, Tuple[str, int]] = OrderedDict()
+        # Renders may run in worker threads, so guard every mutation
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_size(key: str, value: str) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD_BYTES
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a value and mark it as most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a value, evicting least recently used entries as needed."""
+        size = self._entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, key: str) -> bool:
+        """Remove a single entry. Returns True if it was present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self.current_bytes -= entry[1]
+            return True
+
+    def clear(self) -> None:
+        """Remove every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters and current memory usage."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,258 @@
+"""
+Full-page response cache for anonymous HTML reads.
+
+Routes opt in by tagging the request with the data they depend on (see
+:func:`tag_response`). Service writes invalidate entries by those tags, and
+every entry expires after ``Settings.CACHE_TTL`` so other replicas converge.
+Expired entries are kept for ``Settings.PAGE_CACHE_STALE_SECONDS`` more, to
+be served stale while a single request re-renders them.
+"""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from starlette.requests import Request
+
+from hoffmagic.config import settings
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.cache.page")
+
+# Query parameters that never change the rendered page
+IGNORED_QUERY_PARAMS = frozenset({"lang"})
+
+# Path prefixes that are never cached or coalesced: API responses, static
+# files and operational endpoints
+UNCACHED_PATH_PREFIXES = ("/api", "/static", "/health", "/metrics")
+
+
+@dataclass
+class CachedPage:
+    """A stored response with the tags it was rendered from."""
+
+    body: bytes
+    status_code: int
+    headers: List[Tuple[str, str]]
+    tags: FrozenSet[str]
+    expires_at: float
+    size: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.size = len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+    @property
+    def stale(self) -> bool:
+        """Whether the entry has expired (and is only usable while revalidating)."""
+        return self.expires_at <= time.monotonic()
+
+
+class PageCache:
+    """
+    Byte-bounded LRU of rendered pages with TTL expiry, a stale grace period
+    and a tag index.
+
+    Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int, stale_ttl: int = 0) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Upper bound for the memory held by cached bodies and headers
+            ttl: Seconds an entry stays valid
+            stale_ttl: Seconds an expired entry is still kept for stale reads
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.current_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def make_key(request: Request, lang: str) -> str:
+        """
+        Build a cache key from path, normalized query params and resolved language.
+
+        Params are sorted and blank values dropped so equivalent URLs share an entry.
+        """
+        params = sorted(
+            (name, value)
+            for name, value in request.query_params.multi_items()
+            if value and name not in IGNORED_QUERY_PARAMS
+        )
+        query = urlencode(params)
+        return (
+            f"{lang}:{request.url.path}?{query}"
+            if query
+            else f"{lang}:{request.url.path}"
+        )
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CachedPage]:
+        """
+        Get an entry and mark it as most recently used.
+
+        Args:
+            key: Cache key from :meth:`make_key`
+            allow_stale: Also return entries that expired less than
+                ``stale_ttl`` seconds ago (check ``CachedPage.stale``)
+
+        Returns:
+            The entry, or None if missing or expired
+        """
+        page = self._entries.get(key)
+        if page is None:
+            self.misses += 1
+            return None
+        now = time.monotonic()
+        if page.expires_at <= now:
+            if page.expires_at + self.stale_ttl <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            if not allow_stale:
+                self.misses += 1
+                return None
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        self._entries.move_to_end(key)
+        return page
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        tags: Iterable[str],
+    ) -> None:
+        """Store a rendered page, evicting least recently used entries as needed."""
+        page = CachedPage(
+            body, status_code, headers, frozenset(tags), time.monotonic() + self.ttl
+        )
+        if page.size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = page
+        self.current_bytes += page.size
+        for tag in page.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Remove one entry if present."""
+        self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        page = self._entries.pop(key, None)
+        if page is None:
+            return
+        self.current_bytes -= page.size
+        for tag in page.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Drop every entry rendered from any of the given tags.
+
+        Returns:
+            Number of entries removed
+        """
+        keys = set()
+        for tag in tags:
+            keys.update(self._tag_index.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        if keys:
+            self.invalidations += len(keys)
+            logger.debug(
+                f"Invalidated {len(keys)} cached page(s) "
+                f"for tags: {', '.join(sorted(tags))}"
+            )
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove every entry. Counters are kept."""
+        self._entries.clear()
+        self._tag_index.clear()
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters and current memory usage."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def cacheable_path(path: str) -> bool:
+    """Whether responses for a path may be served from the page cache or coalesced."""
+    return not any(
+        path == prefix or path.startswith(prefix + "/")
+        for prefix in UNCACHED_PATH_PREFIXES
+    )
+
+
+def tag_response(request: Request, *tags: str) -> None:
+    """
+    Mark the response to this request as cacheable, depending on the given tags.
+
+    Args:
+        request: Incoming request
+        tags: Invalidation tags, e.g. ``post:<slug>``, ``tag:<slug>``, ``list:blog``
+    """
+    existing = getattr(request.state, "cache_tags", None) or set()
+    request.state.cache_tags = existing | set(tags)
+
+
+def post_cache_tags(
+    slug: str, is_essay: bool, tag_slugs: Iterable[str] = ()
+) -> List[str]:
+    """
+    Get the invalidation tags affected by a write to a post.
+
+    Args:
+        slug: Post slug
+        is_essay: Whether the post is an essay
+        tag_slugs: Slugs of the post's tags
+
+    Returns:
+        Tags covering the post page, its list pages, its tag pages and the stats
+    """
+    return [
+        f"post:{slug}",
+        "list:essays" if is_essay else "list:blog",
+        "stats",
+        *(f"tag:{tag_slug}" for tag_slug in tag_slugs),
+    ]
+
+
+page_cache = PageCache(
+    settings.PAGE_CACHE_MAX_BYTES, settings.CACHE_TTL, settings.PAGE_CACHE_STALE_SECONDS
+)
@@ -0,0 +1,87 @@
+"""
+Per-key coalescing of concurrent identical computations.
+
+When many requests miss the same cache entry at once (a hot post expiring,
+a link going viral), only the first one computes the value; the others wait
+for it and share the result, or the exception. A thundering herd then costs
+one database query and one render instead of one per request.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time and share its outcome.
+
+    The first caller for a key runs the computation itself; callers arriving
+    while it runs wait for it. If the first caller is cancelled
+    (e.g. its client disconnected), a waiting caller takes over instead of
+    failing. Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, name: str = "flight") -> None:
+        """
+        Initialize with no computations in flight.
+
+        Args:
+            name: Name used in statistics and log messages
+        """
+        self.name = name
+        self.leaders = 0
+        self.coalesced = 0
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a computation for ``key`` is running."""
+        return key in self._flights
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get the result of ``compute``, sharing one run among concurrent callers.
+
+        Args:
+            key: Identifies equivalent computations
+            compute: Produces the value; only called by the leading caller
+
+        Returns:
+            The value computed by whichever caller led the flight
+        """
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not us: retry and maybe lead
+                if not flight.cancelled():
+                    raise
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        self.leaders += 1
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            # Waiters get the exception; don't warn about it going unretrieved
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get counters of led and coalesced calls."""
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
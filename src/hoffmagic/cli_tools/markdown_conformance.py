@@ -0,0 +1,97 @@
+# src/hoffmagic/cli_tools/markdown_conformance.py
+
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+# --- Add Project Root (Keep this) ---
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+src_path = project_root / 'src'
+if not src_path.is_dir():
+    print(
+        "Warning: Could not automatically determine project root containing 'src'. "
+        f"Calculated root: {project_root}",
+        file=sys.stderr,
+    )
+else:
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+        print(f"Added project root to sys.path: {project_root}", file=sys.stderr)
+
+
+try:
+    from src.hoffmagic.rendering.conformance import load_corpus, render_diff
+    from src.hoffmagic.rendering.engines import (
+        ENGINES, PythonMarkdownEngine, create_engine,
+    )
+except ImportError as e:
+    print(
+        f"Error importing application modules AFTER adding sys.path: {e}",
+        file=sys.stderr,
+    )
+    sys.exit(1)
+
+# Configure logging
+log_format = "%(asctime)s - %(levelname)s - %(message)s"
+logging.basicConfig(level=logging.INFO, format=log_format)
+logger = logging.getLogger(__name__)
+
+app = typer.Typer()
+
+
+@app.command()
+def check(
+    content_dir: Path = typer.Argument(
+        project_root / "src" / "content",
+        exists=True, file_okay=False, dir_okay=True, readable=True, resolve_path=True,
+        help="Directory searched recursively for Markdown files (.md).",
+    ),
+    engines: Optional[List[str]] = typer.Option(
+        None, "--engine",
+        help="Engine to compare against python-markdown (repeatable). Defaults to all.",
+    ),
+) -> None:
+    """
+    Checks that every markdown engine renders the content corpus like python-markdown.
+
+    Exits with status 1 if any document renders differently, so it can gate
+    a change of Settings.MARKDOWN_ENGINE in CI.
+    """
+    reference = PythonMarkdownEngine()
+    candidate_names = engines or [name for name in ENGINES if name != reference.name]
+
+    corpus = load_corpus(content_dir)
+    typer.echo(f"Comparing {len(corpus)} documents against {reference.name}")
+
+    failures = 0
+    for name in candidate_names:
+        try:
+            engine = create_engine(name)
+        except (ValueError, ImportError) as e:
+            typer.secho(f"Skipping engine '{name}': {e}", fg=typer.colors.YELLOW)
+            continue
+
+        for doc_name, source in corpus.items():
+            diff = render_diff(reference, engine, source)
+            if not diff:
+                typer.echo(f"[{name}] OK       {doc_name}")
+                continue
+            failures += 1
+            typer.secho(f"[{name}] MISMATCH {doc_name}", fg=typer.colors.RED)
+            for line in diff[:40]:
+                typer.echo(f"    {line}")
+
+    if failures:
+        typer.secho(
+            f"\n{failures} document(s) rendered differently", fg=typer.colors.RED
+        )
+        raise typer.Exit(code=1)
+    typer.secho("\nAll engines conform", fg=typer.colors.GREEN)
+
+
+# --- Entry point for running script ---
+if __name__ == "__main__":
+    app() # Run the Typer app
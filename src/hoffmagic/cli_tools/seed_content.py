@@ -30,6 +30,8 @@ try:
     from src.hoffmagic.config import settings
     from src.hoffmagic.db.engine import SessionLocal
     from src.hoffmagic.db.models import Author, Post, Tag
+    from src.hoffmagic.rendering import prerender_post, set_translation
+    from src.hoffmagic.services.slugs import resolve_post_ids
 except ImportError as e:
     print(f"Error importing application modules AFTER adding sys.path: {e}", file=sys.stderr)
     sys.exit(1)
@@ -110,11 +112,27 @@ async def _seed_logic(directory: Path, is_essay: bool, overwrite: bool, dry_run:
     error_count = 0
 
     async with SessionLocal() as db:
+        # Parse every file first so existing slugs resolve in one query
+        parsed_files = {}
+        for md_file in markdown_files:
+            try:
+                parsed_files[md_file] = frontmatter.load(md_file)
+            except Exception:
+                pass  # Reported when the file is processed below
+        existing_ids = await resolve_post_ids(
+            db,
+            [
+                str(parsed.metadata["slug"])
+                for parsed in parsed_files.values()
+                if "slug" in parsed.metadata
+            ],
+        )
+
         for md_file in markdown_files:
             action = "" # Reset action for each file
             try:
                 typer.echo(f"\n--- Processing: {md_file.name} ---")
-                parsed_md = frontmatter.load(md_file)
+                parsed_md = parsed_files.get(md_file) or frontmatter.load(md_file)
                 metadata = parsed_md.metadata
                 content = parsed_md.content
 
@@ -136,6 +154,15 @@ async def _seed_logic(directory: Path, is_essay: bool, overwrite: bool, dry_run:
                 tag_names = metadata.get("tags", [])
                 featured_image = metadata.get("featured_image", None)
                 publish_date_str = metadata.get("publish_date", None)
+
+                # --- Check if post exists, before creating tags for it ---
+                existing_post_id = existing_ids.get(slug)
+                if existing_post_id is not None and not overwrite:
+                    logger.info(
+                        f"Skipping existing post {slug} (use --overwrite to update)."
+                    )
+                    skipped_count += 1
+                    continue
                 
                 # --- Extract Portuguese metadata fields ---
                 title_pt = metadata.get("title_pt", None)
@@ -176,43 +203,45 @@ async def _seed_logic(directory: Path, is_essay: bool, overwrite: bool, dry_run:
                      publish_date = datetime.datetime.now(datetime.timezone.utc)
                      logger.info(f"No publish_date found for published post {md_file.name}. Setting to current time.")
 
-                # --- Check if post exists ---
-                existing_post_stmt = (
-                    select(Post)
-                    .where(Post.slug == slug)
-                    .options(selectinload(Post.tags))
-                )
-                existing_post = (await db.execute(existing_post_stmt)).scalar_one_or_none()
+                existing_post = None
+                if existing_post_id is not None:
+                    existing_post = await db.get(
+                        Post,
+                        existing_post_id,
+                        options=[
+                            selectinload(Post.tags),
+                            selectinload(Post.translations),
+                        ],
+                    )
 
                 post_data_dict = {
                     "title": title, "content": content, "summary": summary,
                     "is_published": is_published, "is_essay": is_essay,
                     "author_id": author.id, "publish_date": publish_date,
                     "featured_image": str(featured_image) if featured_image else None,
-                    # Add Portuguese fields
-                    "title_pt": title_pt,
-                    "content_pt": content_pt,
-                    "summary_pt": summary_pt
+                }
+                # Portuguese fields are stored as the post's translation
+                translation_pt = {
+                    "title": title_pt, "content": content_pt, "summary": summary_pt,
                 }
 
                 # --- Perform Create or Update ---
                 if existing_post:
                     logger.info(f"Post with slug '{slug}' already exists.")
-                    if overwrite:
-                        logger.warning(f"--overwrite enabled. Updating post: {slug}")
-                        for key, value in post_data_dict.items():
-                            setattr(existing_post, key, value)
-                        existing_post.tags = tags
-                        action = "Updated"
-                        updated_count += 1
-                    else:
-                        logger.info(f"Skipping existing post {slug} (use --overwrite to update).")
-                        skipped_count += 1
-                        continue
+                    logger.warning(f"--overwrite enabled. Updating post: {slug}")
+                    for key, value in post_data_dict.items():
+                        setattr(existing_post, key, value)
+                    existing_post.tags = tags
+                    set_translation(existing_post, "pt", **translation_pt)
+                    await prerender_post(existing_post)
+                    action = "Updated"
+                    updated_count += 1
                 else:
                     logger.info(f"Creating new post: {slug}")
                     new_post = Post(slug=slug, **post_data_dict)
                     new_post.tags = tags
+                    set_translation(new_post, "pt", **translation_pt)
+                    await prerender_post(new_post)
                     db.add(new_post)
                     action = "Created"
                     created_count += 1
@@ -226,6 +255,9 @@ async def _seed_logic(directory: Path, is_essay: bool, overwrite: bool, dry_run:
                     try:
                         await db.commit()
                         logger.info(f"Successfully {action.lower()} post '{title}' (slug: {slug})")
+                        if action == "Created":
+                            # A later file with the same slug updates or skips it
+                            existing_ids[slug] = new_post.id
                         # Log Portuguese content status
                         if title_pt:
                             logger.info(f"Portuguese title added for {slug}: '{title_pt}'")
@@ -28,13 +28,75 @@ class Settings(BaseSettings):
     
     # Database settings
     DATABASE_URL: PostgresDsn
-    
+    # "queue", or "null" (new connection per checkout, for an external pooler)
+    DB_POOL_CLASS: str = "queue"
+    DB_POOL_SIZE: int = 5  # connections kept per worker process
+    # extra connections opened under load, closed when returned
+    DB_MAX_OVERFLOW: int = 10
+    # seconds to wait for a free connection before failing
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1  # seconds before a connection is replaced; -1 keeps them
+    DB_POOL_PRE_PING: bool = True  # test connections on checkout
+    DB_CONNECT_TIMEOUT: int = 10  # seconds to establish a new connection
+    # pgbouncer transaction pooling: no server-side prepared statements
+    DB_PGBOUNCER: bool = False
+
     # Content settings
     BLOG_DIR: Path = CONTENT_DIR / "blog"
     ESSAYS_DIR: Path = CONTENT_DIR / "essays"
+    READING_WORDS_PER_MINUTE: int = 220
+    EXCERPT_LENGTH: int = 240  # characters of the first paragraph used as an excerpt
+    COMMENTS_PAGE_SIZE: int = 20  # top-level comments per page
+    COMMENT_MAX_DEPTH: int = 5  # reply levels loaded below a top-level comment
     
     # Cache settings
     CACHE_TTL: int = 60 * 5  # 5 minutes
+    PAGE_CACHE_ENABLED: bool = True  # serve anonymous HTML page reads from memory
+    PAGE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MiB of cached pages per worker
+    # serve expired pages this long while one request re-renders them
+    PAGE_CACHE_STALE_SECONDS: int = 60
+    TEMPLATE_VERSION: str = "1"  # bump when templates change so ETags change too
+    RENDER_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # 32 MiB of rendered HTML per worker
+    HIGHLIGHT_CACHE_MAX_BYTES: int = 8 * 1024 * 1024  # 8 MiB of highlighted code blocks
+    # serve published posts, authors and tags from memory (small corpora)
+    CONTENT_STORE_ENABLED: bool = False
+    # LISTEN/NOTIFY bus keeping replicas' caches in sync
+    CACHE_INVALIDATION_ENABLED: bool = True
+    CACHE_INVALIDATION_CHANNEL: str = "hoffmagic_invalidation"
+    # direct connection for LISTEN; required behind pgbouncer
+    CACHE_INVALIDATION_DATABASE_URL: Optional[str] = None
+    CACHE_INVALIDATION_RECONNECT_MIN_SECONDS: float = 1.0
+    CACHE_INVALIDATION_RECONNECT_MAX_SECONDS: float = 30.0
+
+    # Markdown rendering settings
+    MARKDOWN_ENGINE: str = "python-markdown"  # or "markdown-it" (optional dependency)
+    # in characters; smaller documents render inline
+    MARKDOWN_OFFLOAD_THRESHOLD: int = 20_000
+    MARKDOWN_RENDER_EXECUTOR: str = "process"  # "process" or "thread"
+    MARKDOWN_RENDER_WORKERS: int = 2
+    # seconds before serving a plain-text fallback
+    MARKDOWN_RENDER_TIMEOUT: float = 10.0
+
+    # Search settings
+    # "postgres", or "memory" (in-process BM25 index, no DB round trip)
+    SEARCH_BACKEND: str = "postgres"
+    # full rebuild of in-memory indexes to pick up external writes
+    SEARCH_INDEX_REFRESH_SECONDS: int = 300
+    SUGGEST_MIN_CHARS: int = 2
+    SUGGEST_MAX_SCAN: int = 2000  # keys examined per lookup
+    SUGGEST_BUDGET_MS: float = 5.0  # hard latency budget per lookup
+
+    # Monitoring settings
+    # expose GET /metrics (pool, page cache and flight statistics)
+    METRICS_ENABLED: bool = False
+    # bearer token for /metrics; without one only loopback clients are served
+    METRICS_TOKEN: Optional[str] = None
+
+    # Syntax highlighting settings
+    HIGHLIGHT_PREWARM_LEXERS: List[str] = [
+        "python", "bash", "console", "javascript", "typescript", "json",
+        "yaml", "toml", "sql", "html", "css", "nix", "docker", "text",
+    ]
     
     @validator("ALLOWED_HOSTS", pre=True)
     def parse_allowed_hosts(cls, v):
@@ -2,31 +2,68 @@
 Database engine configuration for HoffMagic Blog.
 """
 import logging
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession, 
     async_sessionmaker, 
     create_async_engine
 )
 from sqlalchemy.orm import declarative_base
+from starlette.requests import Request
 
 from hoffmagic.config import settings
 
+from .pool import POOL_CLASSES, pool_monitor
+
 # Initialize logger
 logger = logging.getLogger("hoffmagic.db")
 
 # Create SQLAlchemy base
 Base = declarative_base()
 
+
+def engine_options() -> Dict[str, Any]:
+    """
+    Build the engine's pool and connection options from settings.
+
+    Returns:
+        Keyword arguments for ``create_async_engine``
+
+    Raises:
+        ValueError: If ``Settings.DB_POOL_CLASS`` is unknown
+    """
+    if settings.DB_POOL_CLASS not in POOL_CLASSES:
+        raise ValueError(f"Unknown database pool class: {settings.DB_POOL_CLASS}")
+    connect_args: Dict[str, Any] = {"connect_timeout": settings.DB_CONNECT_TIMEOUT}
+    if settings.DB_PGBOUNCER:
+        # Prepared statements live on a server connection, which pgbouncer
+        # hands to another client after each transaction
+        connect_args["prepare_threshold"] = None
+    options: Dict[str, Any] = {
+        "poolclass": POOL_CLASSES[settings.DB_POOL_CLASS],
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+    if settings.DB_POOL_CLASS == "queue":
+        options.update({
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        })
+    return options
+
+
 # Create engine
 engine = create_async_engine(
     str(settings.DATABASE_URL),
     echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    **engine_options(),
 )
+pool_monitor.pool = engine.sync_engine.pool
 
 # Create session factory
 SessionLocal = async_sessionmaker(
@@ -54,15 +91,104 @@ async def init_db() -> None:
         raise
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+class LazySession:
+    """
+    Request-scoped stand-in for an AsyncSession that creates it on first use.
+
+    Attribute access is forwarded to a session made on demand, which itself
+    only checks out a pooled connection on its first query or flush. Routes
+    answered from memory (caches, the content store) therefore cost neither
+    a session nor a connection. Records how the request used the database.
+    """
+
+    def __init__(self, factory: async_sessionmaker = SessionLocal) -> None:
+        """
+        Initialize without a session.
+
+        Args:
+            factory: Session factory used on first access
+        """
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+        self.queries = 0
+        self.flushes = 0
+        self.connected_seconds = 0.0
+        self._connected_at: Optional[float] = None
+
+    @property
+    def session(self) -> AsyncSession:
+        """The underlying session, created on first access."""
+        if self._session is None:
+            self._session = self._factory()
+            sync_session = self._session.sync_session
+            event.listen(sync_session, "do_orm_execute", self._on_execute)
+            event.listen(sync_session, "after_flush", self._on_flush)
+            event.listen(sync_session, "after_begin", self._on_begin)
+            event.listen(
+                sync_session, "after_transaction_end", self._on_transaction_end
+            )
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    def _on_execute(self, orm_execute_state: Any) -> None:
+        self.queries += 1
+
+    def _on_flush(self, session: Any, flush_context: Any) -> None:
+        self.flushes += 1
+
+    def _on_begin(self, session: Any, transaction: Any, connection: Any) -> None:
+        if self._connected_at is None:
+            self._connected_at = time.perf_counter()
+
+    def _on_transaction_end(self, session: Any, transaction: Any) -> None:
+        # The outermost transaction ending returns the connection to the pool
+        if transaction.parent is None and self._connected_at is not None:
+            self.connected_seconds += time.perf_counter() - self._connected_at
+            self._connected_at = None
+
+    @property
+    def used(self) -> bool:
+        """Whether a session was created at all."""
+        return self._session is not None
+
+    def usage(self) -> str:
+        """Summarize the database work done so far, for request logs."""
+        if not self.used:
+            return "no session"
+        held = self.connected_seconds
+        if self._connected_at is not None:
+            held += time.perf_counter() - self._connected_at
+        if not held and not self.queries:
+            return "session unused"
+        return (
+            f"{self.queries} queries, {self.flushes} flushes, "
+            f"connection held {held * 1000:.1f}ms"
+        )
+
+    async def close(self) -> None:
+        """Close the session if one was created."""
+        if self._session is not None:
+            await self._session.close()
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    Get a database session for dependency injection.
-    
+    Get a lazily created database session for dependency injection.
+
+    The session is kept on ``request.state.db_session`` so request logs can
+    report its usage.
+
+    Args:
+        request: Incoming request
+
     Yields:
-        A SQLAlchemy async session
+        A :class:`LazySession` standing in for a SQLAlchemy async session
     """
-    async with SessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+    session = LazySession(SessionLocal)
+    request.state.db_session = session
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -0,0 +1,61 @@
+"""add_post_translations
+
+Revision ID: 3f6a9c2d8b14
+Revises: b71f0c9d4e52
+Create Date: 2026-10-17 15:26:41.503718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a9c2d8b14'
+down_revision: Union[str, None] = 'b71f0c9d4e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'post_translations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('lang', sa.String(length=8), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('rendered_html', sa.Text(), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_post_translations_id'), 'post_translations', ['id'], unique=False
+    )
+    op.create_index(
+        'ix_post_translations_post_id_lang',
+        'post_translations',
+        ['post_id', 'lang'],
+        unique=True,
+    )
+    # Copy existing Portuguese text, keeping its rendered HTML so nothing re-renders.
+    # The *_pt columns stay: search_vector_pt is generated from them.
+    op.execute("""
+        INSERT INTO post_translations
+            (post_id, lang, title, summary, content, rendered_html, content_hash)
+        SELECT id, 'pt', title_pt, summary_pt, content_pt, content_html_pt,
+               content_hash_pt
+        FROM posts
+        WHERE title_pt IS NOT NULL OR summary_pt IS NOT NULL OR content_pt IS NOT NULL
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_post_translations_post_id_lang', table_name='post_translations')
+    op.drop_index(op.f('ix_post_translations_id'), table_name='post_translations')
+    op.drop_table('post_translations')
@@ -0,0 +1,35 @@
+"""add_prerendered_html_fields
+
+Revision ID: 5c1e8f3a9b27
+Revises: d928a76a14cb
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8f3a9b27'
+down_revision: Union[str, None] = 'd928a76a14cb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are rendered lazily on first read (hash is NULL, so stale)
+    op.add_column('posts', sa.Column('content_html', sa.Text(), nullable=True))
+    op.add_column('posts', sa.Column('content_html_pt', sa.Text(), nullable=True))
+    op.add_column('posts', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('posts', sa.Column('content_hash_pt', sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'content_html')
+    op.drop_column('posts', 'content_html_pt')
+    op.drop_column('posts', 'content_hash')
+    op.drop_column('posts', 'content_hash_pt')
@@ -0,0 +1,50 @@
+"""add_listing_and_lookup_indexes
+
+Revision ID: 6a1d4e8f2c73
+Revises: 3f6a9c2d8b14
+Create Date: 2026-10-17 16:02:19.847321
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1d4e8f2c73'
+down_revision: Union[str, None] = '3f6a9c2d8b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Published listings per section, in (publish_date DESC NULLS LAST, id DESC) order
+    op.create_index(
+        'ix_posts_published_listing',
+        'posts',
+        ['is_essay', sa.text('publish_date DESC NULLS LAST'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('is_published'),
+    )
+    # The post_tags primary key leads on post_id; tag listings need tag_id first
+    op.create_index(
+        'ix_post_tags_tag_id_post_id', 'post_tags', ['tag_id', 'post_id'], unique=False
+    )
+    op.create_index('ix_comments_post_id', 'comments', ['post_id'], unique=False)
+    op.create_index(
+        'ix_comments_post_id_approved',
+        'comments',
+        ['post_id'],
+        unique=False,
+        postgresql_where=sa.text('is_approved'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_post_id_approved', table_name='comments')
+    op.drop_index('ix_comments_post_id', table_name='comments')
+    op.drop_index('ix_post_tags_tag_id_post_id', table_name='post_tags')
+    op.drop_index('ix_posts_published_listing', table_name='posts')
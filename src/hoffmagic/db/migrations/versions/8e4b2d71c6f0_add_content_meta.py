@@ -0,0 +1,29 @@
+"""add_content_meta
+
+Revision ID: 8e4b2d71c6f0
+Revises: 5c1e8f3a9b27
+Create Date: 2026-10-17 11:03:27.184602
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b2d71c6f0'
+down_revision: Union[str, None] = '5c1e8f3a9b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are analyzed on their next render or read
+    op.add_column('posts', sa.Column('content_meta', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'content_meta')
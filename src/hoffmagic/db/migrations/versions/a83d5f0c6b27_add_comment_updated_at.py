@@ -0,0 +1,37 @@
+"""add_comment_updated_at
+
+Revision ID: a83d5f0c6b27
+Revises: e5b9c3a71f48
+Create Date: 2026-10-18 11:04:52.318467
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83d5f0c6b27'
+down_revision: Union[str, None] = 'e5b9c3a71f48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Part of comment validators: edits and (un)approvals change the thread
+    op.add_column(
+        'comments',
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('comments', 'updated_at')
@@ -0,0 +1,57 @@
+"""add_fulltext_search_vectors
+
+Revision ID: b71f0c9d4e52
+Revises: 8e4b2d71c6f0
+Create Date: 2026-10-17 13:26:50.742911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71f0c9d4e52'
+down_revision: Union[str, None] = '8e4b2d71c6f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _weighted_vector(config: str, suffix: str) -> str:
+    return (
+        f"setweight(to_tsvector('{config}', coalesce(title{suffix}, '')), 'A') || "
+        f"setweight(to_tsvector('{config}', coalesce(summary{suffix}, '')), 'B') || "
+        f"setweight(to_tsvector('{config}', coalesce(content{suffix}, '')), 'C')"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored generated columns: Postgres keeps them in sync on every write
+    op.add_column('posts', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(_weighted_vector('english', ''), persisted=True),
+    ))
+    op.add_column('posts', sa.Column(
+        'search_vector_pt', postgresql.TSVECTOR(),
+        sa.Computed(_weighted_vector('portuguese', '_pt'), persisted=True),
+    ))
+    op.create_index(
+        'ix_posts_search_vector', 'posts', ['search_vector'], postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_posts_search_vector_pt',
+        'posts',
+        ['search_vector_pt'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_search_vector_pt', table_name='posts')
+    op.drop_index('ix_posts_search_vector', table_name='posts')
+    op.drop_column('posts', 'search_vector_pt')
+    op.drop_column('posts', 'search_vector')
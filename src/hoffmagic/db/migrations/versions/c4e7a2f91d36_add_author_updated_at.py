@@ -0,0 +1,37 @@
+"""add_author_updated_at
+
+Revision ID: c4e7a2f91d36
+Revises: 6a1d4e8f2c73
+Create Date: 2026-10-17 19:41:08.512937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a2f91d36'
+down_revision: Union[str, None] = '6a1d4e8f2c73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Part of post validators: editing the byline changes the rendered page
+    op.add_column(
+        'authors',
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('authors', 'updated_at')
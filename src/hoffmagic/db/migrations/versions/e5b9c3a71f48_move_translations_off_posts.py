@@ -0,0 +1,98 @@
+"""move_translations_off_posts
+
+Revision ID: e5b9c3a71f48
+Revises: c4e7a2f91d36
+Create Date: 2026-10-18 10:12:37.904215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9c3a71f48'
+down_revision: Union[str, None] = 'c4e7a2f91d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRANSLATION_CONFIG = (
+    "CASE lang WHEN 'pt' THEN 'portuguese'::regconfig ELSE 'simple'::regconfig END"
+)
+
+
+def _weighted_vector(config: str, suffix: str) -> str:
+    return (
+        f"setweight(to_tsvector({config}, coalesce(title{suffix}, '')), 'A') || "
+        f"setweight(to_tsvector({config}, coalesce(summary{suffix}, '')), 'B') || "
+        f"setweight(to_tsvector({config}, coalesce(content{suffix}, '')), 'C')"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # post_translations becomes the only store of translated text; bring it up
+    # to date with the *_pt columns before dropping them
+    op.execute("""
+        INSERT INTO post_translations
+            (post_id, lang, title, summary, content, rendered_html, content_hash)
+        SELECT id, 'pt', title_pt, summary_pt, content_pt, content_html_pt,
+               content_hash_pt
+        FROM posts
+        WHERE title_pt IS NOT NULL OR summary_pt IS NOT NULL OR content_pt IS NOT NULL
+        ON CONFLICT (post_id, lang) DO UPDATE SET
+            title = EXCLUDED.title,
+            summary = EXCLUDED.summary,
+            content = EXCLUDED.content,
+            rendered_html = EXCLUDED.rendered_html,
+            content_hash = EXCLUDED.content_hash
+        """)
+    op.add_column('post_translations', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(_weighted_vector(TRANSLATION_CONFIG, ''), persisted=True),
+    ))
+    op.create_index(
+        'ix_post_translations_search_vector', 'post_translations', ['search_vector'],
+        postgresql_using='gin',
+    )
+    op.drop_index('ix_posts_search_vector_pt', table_name='posts')
+    op.drop_column('posts', 'search_vector_pt')
+    op.drop_column('posts', 'title_pt')
+    op.drop_column('posts', 'summary_pt')
+    op.drop_column('posts', 'content_pt')
+    op.drop_column('posts', 'content_html_pt')
+    op.drop_column('posts', 'content_hash_pt')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        'posts', sa.Column('content_hash_pt', sa.String(length=64), nullable=True)
+    )
+    op.add_column('posts', sa.Column('content_html_pt', sa.Text(), nullable=True))
+    op.add_column('posts', sa.Column('content_pt', sa.Text(), nullable=True))
+    op.add_column('posts', sa.Column('summary_pt', sa.Text(), nullable=True))
+    op.add_column('posts', sa.Column('title_pt', sa.String(length=255), nullable=True))
+    op.execute(
+        """
+        UPDATE posts
+        SET title_pt = t.title, summary_pt = t.summary, content_pt = t.content,
+            content_html_pt = t.rendered_html, content_hash_pt = t.content_hash
+        FROM post_translations AS t
+        WHERE t.post_id = posts.id AND t.lang = 'pt'
+        """
+    )
+    op.add_column('posts', sa.Column(
+        'search_vector_pt', postgresql.TSVECTOR(),
+        sa.Computed(_weighted_vector("'portuguese'", '_pt'), persisted=True),
+    ))
+    op.create_index(
+        'ix_posts_search_vector_pt',
+        'posts',
+        ['search_vector_pt'],
+        postgresql_using='gin',
+    )
+    op.drop_index('ix_post_translations_search_vector', table_name='post_translations')
+    op.drop_column('post_translations', 'search_vector')
@@ -5,11 +5,12 @@ import datetime
 from typing import List, Optional
 
 from sqlalchemy import (
-    Boolean, Column, ForeignKey, Integer, String,
+    Boolean, Column, Computed, ForeignKey, Index, Integer, JSON, String,
     Text, DateTime, Table, UniqueConstraint
 )
-from sqlalchemy.orm import relationship, backref # Import backref here
-from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship, backref # Import backref here
+from sqlalchemy.sql import func, text
 
 from hoffmagic.db.engine import Base
 
@@ -20,6 +21,8 @@ post_tags = Table(
     Base.metadata,
     Column("post_id", Integer, ForeignKey("posts.id"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    # The primary key leads on post_id; tag listings look up by tag_id
+    Index("ix_post_tags_tag_id_post_id", "tag_id", "post_id"),
 )
 
 
@@ -31,12 +34,14 @@ class Post(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
-    title_pt = Column(String(255), nullable=True)
     slug = Column(String(255), unique=True, nullable=False, index=True)
     content = Column(Text, nullable=False)
-    content_pt = Column(Text, nullable=True)
+    # Pre-rendered English HTML, with a hash of source + renderer config
+    content_html = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    # Per-language analysis of the rendered HTML: toc, words, reading_minutes, excerpt
+    content_meta = Column(JSON, nullable=True)
     summary = Column(Text, nullable=True)
-    summary_pt = Column(Text, nullable=True)
     is_published = Column(Boolean, default=False)
     is_essay = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -47,12 +52,84 @@ class Post(Base):
     )
     publish_date = Column(DateTime(timezone=True), nullable=True)
     featured_image = Column(String(255), nullable=True)
+    # Full-text search documents maintained by Postgres,
+    # weighted title > summary > content
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+        persisted=True,
+    )))
     
     # Relationships
     author_id = Column(Integer, ForeignKey("authors.id"), nullable=False)
     author = relationship("Author", back_populates="posts")
     tags = relationship("Tag", secondary=post_tags, back_populates="posts")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
+    # Non-English text; only needed when a post entity is re-rendered or edited,
+    # so it must be loaded explicitly with selectinload(Post.translations).
+    # Rows go with the post via ON DELETE CASCADE.
+    translations = relationship(
+        "PostTranslation", back_populates="post", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True,
+    )
+
+    __table_args__ = (
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+        # Published listings in LISTING_ORDER, per section
+        Index(
+            "ix_posts_published_listing",
+            "is_essay", text("publish_date DESC NULLS LAST"), text("id DESC"),
+            postgresql_where=text("is_published"),
+        ),
+    )
+
+
+# Text search config of a translation row, picked by its language
+TRANSLATION_SEARCH_CONFIG = (
+    "CASE lang WHEN 'pt' THEN 'portuguese'::regconfig ELSE 'simple'::regconfig END"
+)
+TRANSLATION_SEARCH_VECTOR = " || ".join(
+    f"setweight(to_tsvector({TRANSLATION_SEARCH_CONFIG}, coalesce({column}, '')), "
+    f"'{weight}')"
+    for column, weight in (("title", "A"), ("summary", "B"), ("content", "C"))
+)
+
+
+class PostTranslation(Base):
+    """
+    A post's title, summary and content in one non-English language.
+
+    English lives on the post row itself and is the fallback for missing fields.
+    """
+    __tablename__ = "post_translations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    post_id = Column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False
+    )
+    lang = Column(String(8), nullable=False)
+    title = Column(String(255), nullable=True)
+    summary = Column(Text, nullable=True)
+    content = Column(Text, nullable=True)
+    # Pre-rendered HTML with a hash of source + renderer config, as on posts
+    rendered_html = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    # Full-text search document, as on posts but in the row's language
+    search_vector = deferred(Column(
+        TSVECTOR, Computed(TRANSLATION_SEARCH_VECTOR, persisted=True)
+    ))
+
+    # Relationships
+    post = relationship("Post", back_populates="translations")
+
+    __table_args__ = (
+        Index("ix_post_translations_post_id_lang", "post_id", "lang", unique=True),
+        Index(
+            "ix_post_translations_search_vector", "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
 
 class Author(Base):
@@ -66,6 +143,11 @@ class Author(Base):
     bio = Column(Text, nullable=True)
     avatar = Column(String(255), nullable=True)
     email = Column(String(255), unique=True, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
     
     # Relationships
     posts = relationship("Post", back_populates="author")
@@ -96,6 +178,12 @@ class Comment(Base):
     author_name = Column(String(100), nullable=False)
     author_email = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Part of comment validators: edits and (un)approvals change the thread
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
     is_approved = Column(Boolean, default=False)
     
     # Relationships
@@ -110,6 +198,16 @@ class Comment(Base):
         single_parent=True  # Add this line to fix the error
     )
 
+    __table_args__ = (
+        Index("ix_comments_post_id", "post_id"),
+        # Public comment threads and approved-comment counts
+        Index(
+            "ix_comments_post_id_approved",
+            "post_id",
+            postgresql_where=text("is_approved"),
+        ),
+    )
+
 
 class Subscriber(Base):
     """
@@ -0,0 +1,133 @@
+"""
+Connection pool classes that record checkout waits, for pool sizing.
+
+The engine uses one of these instead of SQLAlchemy's stock pools (see
+``Settings.DB_POOL_CLASS``). Every checkout is timed, from asking the pool
+for a connection to getting one, including opening a new connection when
+the pool has room or is a :class:`NullPool`. The shared :data:`pool_monitor`
+keeps how many checkouts are waiting, a histogram of wait times and the
+number of timeouts; ``GET /metrics`` publishes them with the pool's own
+counters.
+"""
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMonitor:
+    """
+    Checkout wait statistics of the engine's pool.
+
+    Checkouts run on the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = WAIT_BUCKETS) -> None:
+        """
+        Initialize empty statistics.
+
+        Args:
+            buckets: Upper bounds in seconds of the wait histogram buckets
+        """
+        self.buckets = buckets
+        self.pool: Optional[Pool] = None
+        self.waiting = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        # One count per bucket, plus one for waits above the last bound
+        self._wait_counts: List[int] = [0] * (len(buckets) + 1)
+
+    def observe(self, waited: float, timed_out: bool = False) -> None:
+        """Record one checkout attempt that waited ``waited`` seconds."""
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.wait_seconds += waited
+        self._wait_counts[bisect_left(self.buckets, waited)] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the pool's state and checkout wait statistics.
+
+        Returns:
+            Dict with the pool class and sizing counters (queue pools only),
+            waiting and checked-out connections, and a cumulative wait
+            histogram keyed by upper bound in seconds
+        """
+        stats: Dict[str, Any] = {
+            "pool": type(self.pool).__name__ if self.pool else None,
+            "checked_out": self.checked_out,
+        }
+        if isinstance(self.pool, AsyncAdaptedQueuePool):
+            stats.update({
+                "size": self.pool.size(),
+                "checked_in": self.pool.checkedin(),
+                "checked_out": self.pool.checkedout(),
+                "overflow": max(self.pool.overflow(), 0),
+                "max_overflow": self.pool._max_overflow,
+            })
+        buckets, cumulative = {}, 0
+        for bound, count in zip(
+            (*self.buckets, float("inf")), self._wait_counts, strict=True
+        ):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        stats.update({
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds": {
+                "count": cumulative,
+                "sum": round(self.wait_seconds, 6),
+                "buckets": buckets,
+            },
+        })
+        return stats
+
+
+pool_monitor = PoolMonitor()
+
+
+class MonitoredPoolMixin:
+    """Times every checkout of the pool class it is mixed into."""
+
+    def _do_get(self) -> Any:
+        pool_monitor.pool = self
+        pool_monitor.waiting += 1
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_monitor.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        finally:
+            pool_monitor.waiting -= 1
+        pool_monitor.observe(time.perf_counter() - start)
+        pool_monitor.checked_out += 1
+        return connection
+
+    def _do_return_conn(self, record: Any) -> None:
+        pool_monitor.checked_out -= 1
+        super()._do_return_conn(record)
+
+
+class MonitoredQueuePool(MonitoredPoolMixin, AsyncAdaptedQueuePool):
+    """Bounded pool of reused connections (the default)."""
+
+
+class MonitoredNullPool(MonitoredPoolMixin, NullPool):
+    """Opens a connection per checkout; for an external pooler such as pgbouncer."""
+
+
+POOL_CLASSES = {
+    "queue": MonitoredQueuePool,
+    "null": MonitoredNullPool,
+}
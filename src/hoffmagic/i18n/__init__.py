@@ -4,7 +4,8 @@ This module provides a structured system for handling translations in the applic
 It separates translations by domain and provides a unified interface for accessing
 translations with proper fallbacks.
 """
-from typing import Dict, Optional, Any, List, Union
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Optional, Any, List, Union
 import logging
 from pathlib import Path
 import json
@@ -18,7 +19,7 @@ logger = logging.getLogger("hoffmagic.i18n")
 class TranslationKey:
     """Class for handling string interpolation in translations."""
     
-    def __init__(self, key: str, default: Optional[str] = None):
+    def __init__(self, key: str, default: Optional[str] = None) -> None:
         self.key = key
         self.default = default
 
@@ -37,7 +38,7 @@ class TranslationKey:
 class TranslationDomain:
     """Represents a domain of translations (e.g., 'common', 'blog', 'contact')."""
     
-    def __init__(self, name: str, translations: Dict[str, str]):
+    def __init__(self, name: str, translations: Dict[str, str]) -> None:
         self.name = name
         self.translations = translations
 
@@ -58,7 +59,7 @@ class TranslationDomain:
 class TranslationManager:
     """Manages translations for the application across multiple domains and languages."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.translations: Dict[str, Dict[str, Dict[str, str]]] = {}
         self.domains: List[str] = []
         self._load_translations()
@@ -117,41 +118,99 @@ class TranslationManager:
         return domains
 
 
+class TranslationCatalog:
+    """Immutable, pre-compiled view over every loaded translation.
+
+    All ``domain:key`` pairs of a language are flattened into a single dict so
+    that a lookup is one hash probe. A ``*:key`` entry records the first domain
+    (in sorted order) defining ``key``, which backs the cross-domain fallback.
+    One shared :class:`I18n` view is built per language.
+    """
+
+    def __init__(self, manager: TranslationManager) -> None:
+        self.domains: FrozenSet[str] = frozenset(manager.domains)
+        self.tables: Dict[str, Mapping[str, str]] = {}
+        self.views: Dict[str, "I18n"] = {}
+
+        ordered_domains = sorted(self.domains)
+        for lang_code in LANGUAGES:
+            lang_translations = manager.translations.get(lang_code, {})
+            table: Dict[str, str] = {}
+            for domain in ordered_domains:
+                for key, value in lang_translations.get(domain, {}).items():
+                    table[f"{domain}:{key}"] = value
+                    table.setdefault(f"*:{key}", value)
+            self.tables[lang_code] = MappingProxyType(table)
+
+        for lang_code in LANGUAGES:
+            self.views[lang_code] = I18n(lang_code, catalog=self)
+
+    @classmethod
+    def load(cls) -> "TranslationCatalog":
+        """Read every translation file from disk and compile a new catalog."""
+        catalog = cls(TranslationManager())
+        logger.info(
+            f"Compiled translation catalog: {len(catalog.views)} languages, "
+            f"{len(catalog.domains)} domains"
+        )
+        return catalog
+
+    def get(self, lang: str) -> "I18n":
+        """Get the shared view for a language, falling back to the default."""
+        view = self.views.get(lang)
+        if view is None:
+            return self.views[DEFAULT_LANGUAGE]
+        return view
+
+
 class I18n:
-    """Main internationalization class that provides translations for templates."""
-    
-    def __init__(self, lang: str):
+    """Main internationalization class that provides translations for templates.
+
+    Instances are read-only views over a :class:`TranslationCatalog` and are
+    shared between requests; obtain them through :func:`get_translations`.
+    """
+
+    def __init__(self, lang: str, catalog: Optional[TranslationCatalog] = None) -> None:
+        catalog = catalog or _catalog
         self.lang = lang if lang in LANGUAGES else DEFAULT_LANGUAGE
-        self.manager = TranslationManager()
-        self.domains = self.manager.get_all_domains(self.lang)
-    
+        self._table = catalog.tables[self.lang]
+        self._domain_names = catalog.domains
+        self.domains = {
+            domain: TranslationDomain(
+                domain,
+                {
+                    key.split(":", 1)[1]: value
+                    for key, value in self._table.items()
+                    if key.startswith(f"{domain}:")
+                },
+            )
+            for domain in sorted(catalog.domains)
+        }
+
     def get(self, key: str, default: Optional[str] = None, domain: str = "common") -> str:
         """Get a translation by key with optional domain and default value."""
         # Check if the key contains a domain prefix (domain:key)
         if ":" in key:
             domain_name, key = key.split(":", 1)
-            if domain_name in self.domains:
+            if domain_name in self._domain_names:
                 domain = domain_name
-        
-        # Get from specific domain if exists
-        if domain in self.domains:
-            return self.domains[domain].get(key, default)
-            
-        # Fallback: try in every domain
-        for domain_obj in self.domains.values():
-            value = domain_obj.get(key, None)
-            if value != key:  # Found a non-fallback value
-                return value
-                
+
+        # Get from specific domain if exists, otherwise from any domain
+        if domain not in self._domain_names:
+            domain = "*"
+        value = self._table.get(f"{domain}:{key}")
+        if value is not None:
+            return value
+
         # Final fallback
         return default if default is not None else key
-    
+
     def __getattr__(self, key: str) -> str:
         """Allow accessing common translations as attributes."""
-        if "common" in self.domains:
-            return self.domains["common"].get(key, key)
-        return key
-    
+        if key.startswith("_"):
+            raise AttributeError(key)
+        return self._table.get(f"common:{key}", key)
+
     def format(self, key: str, default: Optional[str] = None, domain: str = "common", **kwargs: Any) -> str:
         """Get a translation and format it with the given kwargs."""
         translation = self.get(key, default, domain)
@@ -162,13 +221,22 @@ class I18n:
             return translation
 
 
-# Singleton instance of the translation manager
-_manager = TranslationManager()
+# Process-wide compiled catalog, loaded once at import time
+_catalog = TranslationCatalog.load()
 
 def get_translations(lang: str) -> I18n:
-    """Get translations for a specific language."""
-    return I18n(lang)
+    """Get the shared translations view for a specific language."""
+    return _catalog.get(lang)
+
+def reload_translations() -> TranslationCatalog:
+    """Reload translation files from disk and atomically swap the catalog.
+
+    Views obtained before the reload keep serving the previous catalog.
+    """
+    global _catalog
+    _catalog = TranslationCatalog.load()
+    return _catalog
 
 def get_available_languages() -> List[Language]:
     """Get all available languages."""
-    return [LANGUAGES[code] for code in LANGUAGES]
\ No newline at end of file
+    return [LANGUAGES[code] for code in LANGUAGES]
@@ -1,30 +1,34 @@
-import logging
+import asyncio
+import secrets
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import logging
-import time
-from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, Optional
-
-from fastapi import Depends, FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from jinja2 import pass_context # Import pass_context
-import markdown as md
-# Remove redundant markdown import if md is used consistently
+from jinja2 import pass_context
+from starlette.middleware.base import RequestResponseEndpoint
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Depends, FastAPI, Request, HTTPException # Ensure HTTPException is imported
 
 from .api.routes import api_router
+from .cache import (
+    CachedPage, SingleFlight, cacheable_path, is_not_modified, not_modified,
+    page_cache, parse_http_date, tag_response, validator_headers,
+)
 from .config import settings
-from .db.engine import get_session, init_db
-from .i18n import get_translations, DEFAULT_LANGUAGE
+from .db.engine import SessionLocal, get_session, init_db
+from .db.pool import pool_monitor
+from .i18n import get_translations, DEFAULT_LANGUAGE, LANGUAGES
 from .logger import setup_logging
+from .rendering import content_analysis, render_executor, render_markdown_cached
+from .rendering.highlight import warm_lexers
+from .search import refresh_periodically, search_index, suggest_index
+from .services.content_store import content_store
+from .services.invalidation import listen_for_invalidations
+from .services.read_models import post_validators
 
 logger = setup_logging()
 CONTAINER_APP_DIR = Path("/app")
@@ -35,21 +39,178 @@ app = FastAPI(
     debug=settings.DEBUG,
 )
 
+# Concurrent renders of the same page (cache misses and stale refreshes) run once
+page_flights = SingleFlight(name="pages")
+# Background revalidations by page key, referenced until they finish
+_revalidations: Dict[str, asyncio.Task] = {}
+
+# Validators that would turn a shared or background render into a 304
+CONDITIONAL_HEADERS = (b"if-none-match", b"if-modified-since")
+
+def without_conditional_headers(scope: Dict[str, Any]) -> List[Tuple[bytes, bytes]]:
+    """Get a request's headers minus the validators, so the app renders the page."""
+    return [
+        (name, value)
+        for name, value in scope["headers"]
+        if name not in CONDITIONAL_HEADERS
+    ]
+
+def page_response(
+    request: Request,
+    body: bytes,
+    status_code: int,
+    headers: List[Tuple[str, str]],
+    status: str,
+) -> Response:
+    """Build the response for a page, honouring conditional request headers."""
+    headers = dict(headers)
+    etag = headers.get("etag")
+    last_modified = parse_http_date(headers.get("last-modified"))
+    if (
+        status_code == 200
+        and (etag or last_modified)
+        and is_not_modified(request, etag, last_modified)
+    ):
+        response = not_modified(etag, last_modified, vary=headers.get("vary"))
+    else:
+        response = Response(body, status_code=status_code, headers=headers)
+    response.headers["X-Cache"] = status
+    return response
+
+def cached_page_response(request: Request, cached: CachedPage, status: str) -> Response:
+    """Build the response for a cached page, honouring conditional request headers."""
+    return page_response(
+        request, cached.body, cached.status_code, cached.headers, status
+    )
+
+async def render_page(
+    request: Request, call_next: RequestResponseEndpoint, key: str
+) -> Response:
+    """Render a page through the app, buffered to be shared; store it if cacheable.
+
+    The route tags the request when its response is cacheable; anything else
+    is only shared with requests coalesced onto this render.
+    """
+    response = await call_next(request)
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = dict(response.headers)
+    tags = getattr(request.state, "cache_tags", None)
+    if not tags or response.status_code != 200 or "set-cookie" in headers:
+        # Don't keep serving a stale copy of a page that is gone or no longer cacheable
+        page_cache.discard(key)
+    else:
+        # The key depends on the lang cookie, so shared caches must key on it too
+        headers["vary"] = "Cookie"
+        page_cache.put(key, body, response.status_code, list(headers.items()), tags)
+    return Response(body, status_code=response.status_code, headers=headers)
+
+def revalidate_page(request: Request, key: str) -> None:
+    """Re-render a stale page in the background, through the whole app.
+
+    The copy of the request skips the cache lookup (see ``serve_cached_pages``)
+    and stores its response like any miss would. It runs in its own flight:
+    requests that miss meanwhile need a response to share, which this render
+    does not return.
+    """
+    scope = {
+        **request.scope,
+        "headers": without_conditional_headers(request.scope),
+        "state": {**request.scope.get("state", {}), "revalidate": True},
+    }
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        pass
+
+    async def revalidate() -> None:
+        try:
+            await page_flights.do(
+                ("revalidate", key), lambda: app(scope, receive, send)
+            )
+        except Exception as e:
+            logger.error(f"Error revalidating cached page {key}: {e}")
+
+    _revalidations[key] = asyncio.create_task(revalidate())
+    _revalidations[key].add_done_callback(lambda _: _revalidations.pop(key, None))
+
+@app.middleware("http")
+async def serve_cached_pages(
+    request: Request, call_next: RequestResponseEndpoint
+) -> Response:
+    """Serve anonymous page reads from the page cache and store cacheable responses.
+
+    Routes opt in with ``tag_response``; API, static and operational paths
+    bypass the cache entirely. Concurrent misses for a page wait for a single
+    render and share its response, and an expired page is served stale while
+    one background request re-renders it, so a hot page costs one database
+    query and render per expiry instead of one per request. Registered before
+    ``log_requests`` so cache hits are still logged.
+    """
+    lang = resolve_language(request)
+    if (
+        not settings.PAGE_CACHE_ENABLED
+        or request.method != "GET"
+        or "authorization" in request.headers
+        or lang not in LANGUAGES
+        or not cacheable_path(request.url.path)
+    ):
+        return await call_next(request)
+
+    key = page_cache.make_key(request, lang)
+    if getattr(request.state, "revalidate", False):
+        return await render_page(request, call_next, key)
+
+    cached = page_cache.get(key, allow_stale=True)
+    if cached is not None:
+        if (
+            cached.stale
+            and key not in _revalidations
+            and not page_flights.in_flight(key)
+        ):
+            revalidate_page(request, key)
+        return cached_page_response(request, cached, "STALE" if cached.stale else "HIT")
+
+    leader = False
+
+    async def render() -> Response:
+        nonlocal leader
+        leader = True
+        # Render the full page for every waiter; validators are checked per request
+        request.scope["headers"] = without_conditional_headers(request.scope)
+        return await render_page(request, call_next, key)
+
+    response = await page_flights.do(key, render)
+    # Followers never render again: they serve the leader's copy
+    cached = page_cache.get(key) if not leader else None
+    if cached is not None:
+        return cached_page_response(request, cached, "COALESCED")
+    headers = list(response.headers.items())
+    return page_response(
+        request,
+        response.body,
+        response.status_code,
+        headers,
+        "MISS" if leader else "COALESCED",
+    )
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests with timing information."""
     start_time = time.time()
     response = await call_next(request)
     process_time = time.time() - start_time
+    db_session = getattr(request.state, "db_session", None)
     logger.info(
         f"{request.client.host}:{request.client.port} - "
         f"\"{request.method} {request.url.path}\" {response.status_code} "
         f"- {process_time:.4f}s"
+        + (f" - db: {db_session.usage()}" if db_session is not None else "")
     )
     return response
 
 # Include API routes
-from hoffmagic.api.routes import api_router
 app.include_router(api_router)
 
 # Mount static files
@@ -62,46 +223,16 @@ app.mount(
 # Setup Jinja2 templates
 templates = Jinja2Templates(directory=CONTAINER_APP_DIR / "templates")
 
-import html # Import html for escaping in error handling
-
 # Register markdown filter using pass_context
 @pass_context
 def markdown_filter(context, value):
     """Converts markdown text to HTML with specific extensions enabled."""
-    if not value:
-        return "" # Return empty string if value is None or empty
-
-    extensions = [
-        'fenced_code', # For ``` ``` code blocks
-        'codehilite',  # Name of the syntax highlighting extension
-        'tables',      # For Markdown tables
-        'nl2br',       # Convert single newlines to <br> (optional, keep if desired)
-        'extra'        # Includes abbreviations, attribute lists, definitions lists, footnotes, etc.
-    ]
-    extension_configs = {
-        'codehilite': {
-            'css_class': 'highlight', # The CSS class to wrap the <pre> tag
-            'noclasses': False,       # IMPORTANT: MUST be False to use Pygments CSS classes like .k, .s1 etc.
-            'use_pygments': True,     # Ensure Pygments is explicitly used
-            # 'pygments_style': 'dracula', # Example: Set style here INSTEAD of CSS file. Remove if using pygments.css.
-            # 'lang_prefix': 'language-' # Optional class prefix for <code> tags
-        }
-    }
-    try:
-        # Process the markdown using the imported 'md' alias
-        processed_html = md.markdown(
-            value,
-            extensions=extensions,
-            extension_configs=extension_configs
-        )
-        return processed_html
-    except Exception as e:
-        logger.error(f"Error processing markdown: {e}", exc_info=True)
-        # Return original value wrapped in pre tags or a safe HTML representation
-        return f"<pre>Error rendering markdown:\n{html.escape(str(value))}</pre>"
+    return render_markdown_cached(value)
 
 # Make sure the filter is registered with the Jinja environment AFTER templates are defined
 templates.env.filters["markdown"] = markdown_filter
+# Precomputed TOC / reading time for list views: {% set meta = post | analysis(lang) %}
+templates.env.filters["analysis"] = content_analysis
 
 # Define startup and shutdown events
 @app.on_event("startup")
@@ -110,17 +241,89 @@ async def startup_event() -> None:
     logger.info("Starting up hoffmagic blog application")
     await init_db()
     logger.info("Database initialized")
+    warm_lexers(settings.HIGHLIGHT_PREWARM_LEXERS)
+    indexes = [suggest_index]
+    if settings.CONTENT_STORE_ENABLED:
+        indexes.insert(0, content_store)
+    if settings.SEARCH_BACKEND == "memory":
+        indexes.append(search_index)
+    for index in indexes:
+        try:
+            async with SessionLocal() as db:
+                await index.rebuild(db)
+        except Exception as e:
+            # Reads and searches fall back to Postgres (suggestions stay empty)
+            # until a refresh succeeds
+            logger.error(f"Error building {type(index).__name__}: {e}")
+    app.state.search_refresh = asyncio.create_task(
+        refresh_periodically(
+            SessionLocal, settings.SEARCH_INDEX_REFRESH_SECONDS, indexes
+        )
+    )
+    if settings.CACHE_INVALIDATION_ENABLED:
+        # Applies writes made on other replicas to this one's caches
+        app.state.invalidation_listener = asyncio.create_task(
+            listen_for_invalidations(SessionLocal, indexes)
+        )
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     """Perform cleanup operations during shutdown."""
     logger.info("Shutting down hoffmagic blog application")
+    for task_name in ("search_refresh", "invalidation_listener"):
+        task = getattr(app.state, task_name, None)
+        if task is not None:
+            task.cancel()
+    for task in list(_revalidations.values()):
+        task.cancel()
+    render_executor.shutdown()
 
 @app.get("/health")
 async def health_check() -> JSONResponse:
     """Health check endpoint for container orchestration."""
     return JSONResponse({"status": "healthy", "time": datetime.now().isoformat()})
 
+# Clients served /metrics when no METRICS_TOKEN is configured
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+def require_metrics_access(request: Request) -> None:
+    """Only serve /metrics when enabled, to holders of the token or to loopback clients.
+
+    Anyone else gets a 404, so the endpoint's existence isn't revealed.
+    """
+    if settings.METRICS_ENABLED:
+        if settings.METRICS_TOKEN:
+            supplied = request.headers.get("authorization", "")
+            if secrets.compare_digest(
+                supplied.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()
+            ):
+                return
+        elif request.client is not None and request.client.host in LOOPBACK_HOSTS:
+            return
+    raise HTTPException(status_code=404, detail="Not Found")
+
+
+@app.get(
+    "/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)]
+)
+async def metrics() -> JSONResponse:
+    """Per-worker database pool and page cache statistics, for sizing pools and caches.
+
+    Disabled unless ``Settings.METRICS_ENABLED``; see :func:`require_metrics_access`.
+    """
+    return JSONResponse({
+        "db_pool": pool_monitor.stats(),
+        "page_cache": page_cache.stats(),
+        "page_flights": page_flights.stats(),
+    })
+
+def resolve_language(request: Request) -> str:
+    """Get the requested language from query param, cookie, or default."""
+    lang = request.query_params.get("lang", None)
+    if not lang:
+        lang = request.cookies.get("lang", DEFAULT_LANGUAGE)
+    return lang
+
 async def common_context(request: Request) -> Dict[str, Any]:
     """Build common context data for templates.
     
@@ -131,9 +334,7 @@ async def common_context(request: Request) -> Dict[str, Any]:
         Dict containing common template context variables
     """
     # Get language from query param, cookie, or default
-    lang = request.query_params.get("lang", None)
-    if not lang:
-        lang = request.cookies.get("lang", DEFAULT_LANGUAGE)
+    lang = resolve_language(request)
         
     # Get translations for the selected language
     i18n = get_translations(lang)
@@ -150,11 +351,9 @@ async def common_context(request: Request) -> Dict[str, Any]:
     return context
 
 @app.get("/", response_class=HTMLResponse, name="home")
-async def home(
-    request: Request, 
-    db: AsyncSession = Depends(get_session)
-) -> HTMLResponse:
+async def home(request: Request) -> HTMLResponse:
     """Render the home page."""
+    tag_response(request, "page:home")
     context = await common_context(request)
     return templates.TemplateResponse("index.html", context)
 
@@ -182,6 +381,7 @@ async def blog_page(
     )
     
     context["posts_response"] = posts_response
+    tag_response(request, "list:blog", *([f"tag:{tag}"] if tag else []))
     return templates.TemplateResponse("blog/list.html", context)
 
 @app.get("/blog/{slug}", response_class=HTMLResponse, name="blog_detail")
@@ -198,23 +398,41 @@ async def blog_detail(
     logger.debug(f"Rendering blog detail for slug: {slug}, lang: {lang}")
 
     blog_service = BlogService(db)
+    # Answer revalidations from the post's timestamp before loading or rendering it
+    validator = await blog_service.get_post_validator(slug, is_essay=False)
+    if not validator or not validator.is_published:
+        logger.warning(f"Blog post not found or not published for slug: {slug}")
+        raise HTTPException(status_code=404, detail="Post not found")
+    etag, last_modified = post_validators(validator, lang)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified, vary="Cookie")
+
     # Pass lang to the service call
-    post_data = await blog_service.get_post_by_slug(slug, is_essay=False, lang=lang)
+    post_data = await blog_service.get_post_view(slug, is_essay=False, lang=lang)
 
     if not post_data or not post_data.is_published:
         logger.warning(f"Blog post not found or not published for slug: {slug}")
         # Use the standard 404 handler by raising HTTPException
         raise HTTPException(status_code=404, detail="Post not found")
 
-    context.update({"post": post_data}) # Use update to add to existing context
-    return templates.TemplateResponse("blog/detail.html", context)
+    # Stored HTML is the norm; otherwise render here so large posts leave the event loop
+    content_html = post_data.content_html or await render_executor.render(
+        post_data.content
+    )
+    tag_response(request, f"post:{slug}", "author")
+    context.update({
+        "post": post_data,
+        "content_html": content_html,
+        "content_meta": content_analysis(post_data, lang),
+    }) # Use update to add to existing context
+    response = templates.TemplateResponse("blog/detail.html", context)
+    response.headers.update(validator_headers(etag, last_modified))
+    return response
 
 @app.get("/essays", response_class=HTMLResponse, name="essays_page")
-async def essays_page(
-    request: Request,
-    db: AsyncSession = Depends(get_session)
-) -> HTMLResponse:
+async def essays_page(request: Request) -> HTMLResponse:
     """Render the essays listing page."""
+    tag_response(request, "list:essays")
     context = await common_context(request)
     return templates.TemplateResponse("essays/list.html", context)
 
@@ -232,16 +450,35 @@ async def essay_detail(
     logger.debug(f"Rendering essay detail for slug: {slug}, lang: {lang}")
 
     essays_service = EssaysService(db)
+    # Answer revalidations from the essay's timestamp before loading or rendering it
+    validator = await essays_service.get_essay_validator(slug)
+    if not validator or not validator.is_published:
+        logger.warning(f"Essay not found or not published for slug: {slug}")
+        raise HTTPException(status_code=404, detail="Essay not found")
+    etag, last_modified = post_validators(validator, lang)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified, vary="Cookie")
+
     # Pass lang to the service call
-    essay = await essays_service.get_essay_by_slug(slug, lang=lang)
+    essay = await essays_service.get_essay_view(slug, lang=lang)
 
     if not essay or not essay.is_published:
         logger.warning(f"Essay not found or not published for slug: {slug}")
         # Use the standard 404 handler by raising HTTPException
         raise HTTPException(status_code=404, detail="Essay not found")
 
-    context.update({"essay": essay}) # Use update to add to existing context
-    return templates.TemplateResponse("essays/detail.html", context)
+    # Stored HTML is the norm; otherwise render here so large essays leave the
+    # event loop
+    content_html = essay.content_html or await render_executor.render(essay.content)
+    tag_response(request, f"post:{slug}", "author")
+    context.update({
+        "essay": essay,
+        "content_html": content_html,
+        "content_meta": content_analysis(essay, lang),
+    }) # Use update to add to existing context
+    response = templates.TemplateResponse("essays/detail.html", context)
+    response.headers.update(validator_headers(etag, last_modified))
+    return response
 
 @app.get("/about", response_class=HTMLResponse, name="about_page")
 async def about_page(
@@ -254,21 +491,16 @@ async def about_page(
     context = await common_context(request)
     about_service = AboutService(db)
     
-    # Get author info
-    author = await about_service.get_author_info()
+    # Author info and blog stats in one query (stats usually from the snapshot)
+    author, stats = await about_service.get_about_page()
     context["author"] = author
-    
-    # Get blog stats
-    stats = await about_service.get_blog_stats()
     context["stats"] = stats
+    tag_response(request, "about", "author", "stats")
     
     return templates.TemplateResponse("about.html", context)
 
 @app.get("/contact", response_class=HTMLResponse, name="contact_page")
-async def contact_page(
-    request: Request,
-    db: AsyncSession = Depends(get_session)
-) -> HTMLResponse:
+async def contact_page(request: Request) -> HTMLResponse:
     """Render the contact page."""
     context = await common_context(request)
     return templates.TemplateResponse("contact.html", context)
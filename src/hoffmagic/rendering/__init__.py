@@ -0,0 +1,29 @@
+"""
+Markdown rendering pipeline for HoffMagic Blog.
+"""
+from .engines import get_engine
+from .renderer import render_markdown, renderer_signature, source_hash
+from .cache import invalidate_rendered, render_cache, render_markdown_cached
+from .executor import render_executor
+from .analysis import analyze_html
+from .persisted import (
+    content_analysis, needs_prerender, prerender_post, rendered_content,
+    set_translation,
+)
+
+__all__ = [
+    "get_engine",
+    "render_markdown",
+    "renderer_signature",
+    "source_hash",
+    "render_cache",
+    "render_markdown_cached",
+    "invalidate_rendered",
+    "render_executor",
+    "prerender_post",
+    "needs_prerender",
+    "rendered_content",
+    "set_translation",
+    "analyze_html",
+    "content_analysis",
+]
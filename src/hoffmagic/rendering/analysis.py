@@ -0,0 +1,134 @@
+"""
+Content analysis run once on rendered HTML at write time.
+
+Extracts the table of contents, word count, reading time and an excerpt so
+views can read them from the post row instead of re-parsing content.
+"""
+import math
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+from hoffmagic.config import settings
+
+TOC_LEVELS = ("h2", "h3", "h4")
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+WORD_RE = re.compile(r"\w+(?:['’-]\w+)*")  # noqa: RUF001 (typographic apostrophe)
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+class _ContentAnalyzer(HTMLParser):
+    """
+    Single pass over rendered HTML collecting headings, prose and the first paragraph.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.toc: List[Dict[str, Any]] = []
+        self.words = 0
+        self.excerpt: Optional[str] = None
+        # Code, footnote refs and the footnote list are not counted as prose
+        self._skip_tags: List[str] = []
+        self._heading: Optional[Dict[str, Any]] = None
+        self._paragraph: Optional[List[str]] = None
+        self._footnotes_depth = 0
+        self._div_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = dict(attrs)
+        if tag == "div":
+            self._div_depth += 1
+            if (
+                "footnote" in (attributes.get("class") or "").split()
+                and not self._footnotes_depth
+            ):
+                self._footnotes_depth = self._div_depth
+        if self._footnotes_depth:
+            return
+        if tag in ("pre", "sup", "script", "style"):
+            self._skip_tags.append(tag)
+        elif tag in TOC_LEVELS and attributes.get("id"):
+            self._heading = {"level": int(tag[1]), "id": attributes["id"], "parts": []}
+        elif tag == "p" and self.excerpt is None and not self._skip_tags:
+            self._paragraph = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "div":
+            if self._footnotes_depth == self._div_depth:
+                self._footnotes_depth = 0
+            self._div_depth -= 1
+            return
+        if self._footnotes_depth:
+            return
+        if self._skip_tags and self._skip_tags[-1] == tag:
+            self._skip_tags.pop()
+        elif tag in HEADING_TAGS and self._heading is not None:
+            title = _collapse(self._heading.pop("parts"))
+            if title:
+                self.toc.append({**self._heading, "title": title})
+            self._heading = None
+        elif tag == "p" and self._paragraph is not None:
+            text = _collapse(self._paragraph)
+            self._paragraph = None
+            if text:
+                self.excerpt = text
+
+    def handle_data(self, data: str) -> None:
+        if self._footnotes_depth or self._skip_tags:
+            return
+        self.words += len(WORD_RE.findall(data))
+        if self._heading is not None:
+            self._heading["parts"].append(data)
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+
+
+def _collapse(parts: List[str]) -> str:
+    return WHITESPACE_RE.sub(" ", "".join(parts)).strip()
+
+
+def truncate_words(text: str, length: int) -> str:
+    """
+    Truncate text at a word boundary, adding an ellipsis when shortened.
+
+    Args:
+        text: Plain text
+        length: Maximum number of characters before the ellipsis
+
+    Returns:
+        Truncated text
+    """
+    if len(text) <= length:
+        return text
+    cut = (
+        text[: length + 1].rsplit(" ", 1)[0]
+        if " " in text[: length + 1]
+        else text[:length]
+    )
+    return cut.rstrip(" ,;:.-") + "…"
+
+
+def analyze_html(rendered: str) -> Dict[str, Any]:
+    """
+    Analyze rendered post HTML.
+
+    Headings keep the ids assigned by the markdown engine, so TOC links
+    match the anchors in the stored HTML.
+
+    Args:
+        rendered: HTML produced by the markdown engine
+
+    Returns:
+        Dict with ``toc`` (level, id, title), ``words``, ``reading_minutes``
+        and ``excerpt``
+    """
+    analyzer = _ContentAnalyzer()
+    analyzer.feed(rendered)
+    analyzer.close()
+    minutes = max(1, math.ceil(analyzer.words / settings.READING_WORDS_PER_MINUTE))
+    return {
+        "toc": analyzer.toc,
+        "words": analyzer.words,
+        "reading_minutes": minutes,
+        "excerpt": truncate_words(analyzer.excerpt or "", settings.EXCERPT_LENGTH),
+    }
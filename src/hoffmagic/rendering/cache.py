@@ -0,0 +1,47 @@
+"""
+In-memory cache of rendered markdown keyed by content hash.
+"""
+import logging
+
+from hoffmagic.cache import ByteLRUCache
+from hoffmagic.config import settings
+
+from .renderer import render_markdown, source_hash
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.rendering.cache")
+
+# Shared by every template render in this worker process
+render_cache = ByteLRUCache(settings.RENDER_CACHE_MAX_BYTES, name="markdown")
+
+
+def render_markdown_cached(source: str) -> str:
+    """
+    Render markdown, reusing a previous render of identical source.
+
+    Args:
+        source: Markdown text
+
+    Returns:
+        Rendered HTML
+    """
+    if not source:
+        return ""
+    key = source_hash(source)
+    rendered = render_cache.get(key)
+    if rendered is None:
+        rendered = render_markdown(source)
+        render_cache.put(key, rendered)
+    return rendered
+
+
+def invalidate_rendered(*sources: str) -> None:
+    """
+    Drop cached renders of the given markdown sources.
+
+    Args:
+        sources: Markdown texts that are no longer current (None is ignored)
+    """
+    for source in sources:
+        if source and render_cache.discard(source_hash(source)):
+            logger.debug("Dropped cached render for replaced content")
@@ -0,0 +1,122 @@
+"""
+Conformance corpus for comparing markdown engines.
+
+Engines must render the content corpus like :class:`PythonMarkdownEngine`,
+the reference engine, up to insignificant differences (whitespace, attribute
+order, inline style spacing). Used by ``src/tests/test_rendering`` and by the
+``markdown_conformance`` CLI (``just md-conformance``).
+"""
+import difflib
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import frontmatter
+
+from .engines import MarkdownEngine
+
+# Minimal documents exercising each feature our content relies on
+FEATURE_SAMPLES: Dict[str, str] = {
+    "fenced_code": (
+        "Intro\n\n```python\ndef f(x):\n    return x * 2\n```\n\n"
+        "```\nplain block\n```\n"
+    ),
+    "tables": "| Left | Right |\n|:-----|------:|\n| a | 1 |\n| b | 2 |\n",
+    "footnotes": (
+        "Claim[^src] and another[^2], repeated[^src].\n\n"
+        "[^src]: The source.\n[^2]: Second note.\n"
+    ),
+    "nl2br": "first line\nsecond line\nthird line\n\nnew paragraph\n",
+    "inline": "Some *emphasis*, **strong**, `code` and a [link](/contact).\n",
+    "headings": (
+        "## Introdução\n\ntext\n\n### The `code` step\n\n"
+        "## Introdução\n\n## Introdução\n"
+    ),
+}
+
+
+class _HTMLSkeleton(HTMLParser):
+    """Reduce HTML to a token stream that ignores insignificant differences."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tokens: List[Tuple[str, ...]] = []
+
+    @staticmethod
+    def _attr(name: str, value: Optional[str]) -> Tuple[str, str]:
+        value = value or ""
+        if name == "style":
+            value = value.replace(" ", "").rstrip(";")
+        return name, value
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.tokens.append(
+            (
+                "start",
+                tag,
+                *sorted(f"{k}={v}" for k, v in map(lambda a: self._attr(*a), attrs)),
+            )
+        )
+
+    def handle_startendtag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.tokens.append(("end", tag))
+
+    def handle_data(self, data: str) -> None:
+        text = " ".join(data.split())
+        if not text:
+            return
+        if self.tokens and self.tokens[-1][0] == "text":
+            text = f"{self.tokens[-1][1]} {text}"
+            self.tokens.pop()
+        self.tokens.append(("text", text))
+
+
+def normalize_html(html_text: str) -> List[str]:
+    """Get a comparable, line-per-token representation of rendered HTML."""
+    parser = _HTMLSkeleton()
+    parser.feed(html_text)
+    parser.close()
+    return [" ".join(token) for token in parser.tokens]
+
+
+def load_corpus(content_dir: Path) -> Dict[str, str]:
+    """Collect documents to compare: feature samples plus all content files."""
+    corpus = {f"feature:{name}": text for name, text in FEATURE_SAMPLES.items()}
+    for md_file in sorted(content_dir.rglob("*.md")):
+        parsed_md = frontmatter.load(md_file)
+        relative = md_file.relative_to(content_dir)
+        corpus[f"{relative}"] = parsed_md.content
+        content_pt = parsed_md.metadata.get("content_pt")
+        if content_pt:
+            corpus[f"{relative}:pt"] = str(content_pt)
+    return corpus
+
+
+def render_diff(
+    reference: MarkdownEngine, engine: MarkdownEngine, source: str
+) -> List[str]:
+    """
+    Compare how two engines render a document.
+
+    Args:
+        reference: Engine whose output is expected
+        engine: Engine under test
+        source: Markdown text
+
+    Returns:
+        Unified diff lines of the normalized HTML, empty if equivalent
+    """
+    expected = normalize_html(reference.render(source))
+    actual = normalize_html(engine.render(source))
+    if expected == actual:
+        return []
+    return list(
+        difflib.unified_diff(
+            expected, actual, reference.name, engine.name, lineterm="", n=2
+        )
+    )
@@ -0,0 +1,325 @@
+"""
+Interchangeable markdown backends.
+
+Every engine must produce equivalent HTML for the features our content uses:
+fenced code with Pygments highlighting, tables, footnotes, heading anchors and
+nl2br line breaks. The conformance tests (``src/tests/test_rendering``) and
+``just md-conformance`` compare engines against the content corpus; run them
+before switching ``Settings.MARKDOWN_ENGINE``.
+"""
+import html
+import logging
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Optional, Sequence, Set
+
+import markdown as md
+import pygments
+from markdown.extensions.codehilite import CodeHiliteExtension
+from markdown.extensions.toc import slugify, unique
+
+from hoffmagic.config import settings
+
+from .highlight import CachedHighlightExtension, highlight_code
+
+if TYPE_CHECKING:
+    # Optional dependencies, only needed by MarkdownItEngine
+    from markdown_it.renderer import RendererProtocol
+    from markdown_it.rules_core import StateCore
+    from markdown_it.token import Token
+    from markdown_it.utils import EnvType, OptionsDict
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.rendering.engines")
+
+MARKDOWN_EXTENSIONS = [
+    'fenced_code', # For ``` ``` code blocks
+    'codehilite',  # Name of the syntax highlighting extension
+    'tables',      # For Markdown tables
+    'nl2br',       # Convert single newlines to <br> (optional, keep if desired)
+    'extra',       # Abbreviations, attribute lists, definition lists, footnotes, etc.
+    'toc',         # Stable heading ids, used as table of contents anchors
+]
+
+MARKDOWN_EXTENSION_CONFIGS = {
+    'codehilite': {
+        'css_class': 'highlight', # The CSS class to wrap the <pre> tag
+        # IMPORTANT: MUST be False to use Pygments CSS classes like .k, .s1 etc.
+        'noclasses': False,
+        'use_pygments': True,     # Ensure Pygments is explicitly used
+    }
+}
+
+
+class MarkdownEngine(ABC):
+    """
+    Base class for markdown backends.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def config(self) -> Dict[str, Any]:
+        """Get everything that influences output, used for the renderer signature."""
+
+    @abstractmethod
+    def render(self, source: str) -> str:
+        """Convert markdown text to HTML."""
+
+
+class PythonMarkdownEngine(MarkdownEngine):
+    """
+    Python-Markdown with the ``extra`` extension set. The reference engine.
+    """
+
+    name = "python-markdown"
+
+    def config(self) -> Dict[str, Any]:
+        return {
+            "extensions": MARKDOWN_EXTENSIONS,
+            "extension_configs": MARKDOWN_EXTENSION_CONFIGS,
+            "markdown": md.__version__,
+            "pygments": pygments.__version__,
+        }
+
+    def render(self, source: str) -> str:
+        rendered: str = md.markdown(
+            source,
+            # Fenced blocks are highlighted through the shared block cache
+            extensions=[*MARKDOWN_EXTENSIONS, CachedHighlightExtension()],
+            extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+        )
+        return rendered
+
+
+BLANK_LINE_RE = re.compile(r"^[ \t]+$", re.MULTILINE)
+
+
+def _highlight_options() -> Dict[str, Any]:
+    """Get exactly the options codehilite passes to Pygments."""
+    options: Dict[str, Any] = CodeHiliteExtension(
+        **MARKDOWN_EXTENSION_CONFIGS["codehilite"]
+    ).getConfigs()
+    return options
+
+
+class MarkdownItEngine(MarkdownEngine):
+    """
+    markdown-it-py with tables and footnotes, several times faster than
+    Python-Markdown. Code blocks and footnotes are rendered with the same
+    markup as :class:`PythonMarkdownEngine` so existing CSS keeps working.
+
+    Requires the optional ``markdown-it`` dependencies.
+    """
+
+    name = "markdown-it"
+
+    OPTIONS: ClassVar[Dict[str, Any]] = {"html": True, "breaks": True, "xhtmlOut": True}
+
+    def __init__(self) -> None:
+        import markdown_it
+        import mdit_py_plugins
+        from markdown_it import MarkdownIt
+        from mdit_py_plugins.footnote import footnote_plugin
+
+        self._versions = {
+            "markdown-it-py": markdown_it.__version__,
+            "mdit-py-plugins": mdit_py_plugins.__version__,
+            "pygments": pygments.__version__,
+        }
+        self._md = (
+            MarkdownIt("commonmark", self.OPTIONS)
+            .enable("table")
+            .use(footnote_plugin)
+        )
+        self._md.core.ruler.after("inline", "heading_anchors", _heading_anchors)
+        self._md.options["highlight_options"] = _highlight_options()
+        for rule_name, rule in _MARKDOWN_IT_RULES.items():
+            self._md.add_render_rule(rule_name, rule)
+
+    def config(self) -> Dict[str, Any]:
+        return {
+            "options": self.OPTIONS,
+            "plugins": ["table", "footnote", "heading_anchors"],
+            "highlight": MARKDOWN_EXTENSION_CONFIGS["codehilite"],
+            **self._versions,
+        }
+
+    def render(self, source: str) -> str:
+        rendered: str = self._md.render(source)
+        return rendered
+
+
+# --- markdown-it rules matching Python-Markdown's markup ---
+
+def _heading_anchors(state: "StateCore") -> None:
+    """Give headings the same ids as Python-Markdown's ``toc`` extension."""
+    used_ids: Set[str] = set()
+    tokens = state.tokens
+    for idx, token in enumerate(tokens):
+        if token.type != "heading_open":
+            continue
+        name = "".join(
+            child.content
+            for child in tokens[idx + 1].children or []
+            if child.type in ("text", "code_inline")
+        )
+        token.attrSet("id", unique(slugify(name, "-"), used_ids))
+
+
+def _render_fence(
+    renderer: "RendererProtocol",
+    tokens: Sequence["Token"],
+    idx: int,
+    options: "OptionsDict",
+    env: "EnvType",
+) -> str:
+    token = tokens[idx]
+    info = token.info.strip()
+    lang: Optional[str] = info.split()[0] if info else None
+    # Python-Markdown empties whitespace-only lines before highlighting
+    code = BLANK_LINE_RE.sub("", token.content)
+    return highlight_code(code, lang, options["highlight_options"])
+
+
+def _render_code_block(
+    renderer: "RendererProtocol",
+    tokens: Sequence["Token"],
+    idx: int,
+    options: "OptionsDict",
+    env: "EnvType",
+) -> str:
+    return highlight_code(tokens[idx].content, None, options["highlight_options"])
+
+
+def _footnote_label(token: "Token") -> str:
+    label = token.meta.get("label")
+    return html.escape(label) if label else str(token.meta["id"] + 1)
+
+
+def _footnote_ref_id(token: "Token") -> str:
+    sub_id = token.meta.get("subId", 0)
+    label = _footnote_label(token)
+    return f"fnref{sub_id + 1}:{label}" if sub_id > 0 else f"fnref:{label}"
+
+
+def _render_footnote_ref(
+    renderer: "RendererProtocol",
+    tokens: Sequence["Token"],
+    idx: int,
+    options: "OptionsDict",
+    env: "EnvType",
+) -> str:
+    token = tokens[idx]
+    number = token.meta["id"] + 1
+    return (
+        f'<sup id="{_footnote_ref_id(token)}"><a class="footnote-ref" '
+        f'href="#fn:{_footnote_label(token)}">{number}</a></sup>'
+    )
+
+
+def _render_footnote_block_open(
+    renderer: "RendererProtocol",
+    tokens: Sequence["Token"],
+    idx: int,
+    options: "OptionsDict",
+    env: "EnvType",
+) -> str:
+    return '<div class="footnote">\n<hr />\n<ol>\n'
+
+
+def _render_footnote_block_close(
+    renderer: "RendererProtocol",
+    tokens: Sequence["Token"],
+    idx: int,
+    options: "OptionsDict",
+    env: "EnvType",
+) -> str:
+    return "</ol>\n</div>\n"
+
+
+def _render_footnote_open(
+    renderer: "RendererProtocol",
+    tokens: Sequence["Token"],
+    idx: int,
+    options: "OptionsDict",
+    env: "EnvType",
+) -> str:
+    return f'<li id="fn:{_footnote_label(tokens[idx])}">\n'
+
+
+def _render_footnote_close(
+    renderer: "RendererProtocol",
+    tokens: Sequence["Token"],
+    idx: int,
+    options: "OptionsDict",
+    env: "EnvType",
+) -> str:
+    return "</li>\n"
+
+
+def _render_footnote_anchor(
+    renderer: "RendererProtocol",
+    tokens: Sequence["Token"],
+    idx: int,
+    options: "OptionsDict",
+    env: "EnvType",
+) -> str:
+    token = tokens[idx]
+    number = token.meta["id"] + 1
+    separator = "" if token.meta.get("subId", 0) > 0 else "&#160;"
+    return (
+        f'{separator}<a class="footnote-backref" href="#{_footnote_ref_id(token)}" '
+        f'title="Jump back to footnote {number} in the text">&#8617;</a>'
+    )
+
+
+_MARKDOWN_IT_RULES = {
+    "fence": _render_fence,
+    "code_block": _render_code_block,
+    "footnote_ref": _render_footnote_ref,
+    "footnote_block_open": _render_footnote_block_open,
+    "footnote_block_close": _render_footnote_block_close,
+    "footnote_open": _render_footnote_open,
+    "footnote_close": _render_footnote_close,
+    "footnote_anchor": _render_footnote_anchor,
+}
+
+
+ENGINES = {
+    PythonMarkdownEngine.name: PythonMarkdownEngine,
+    MarkdownItEngine.name: MarkdownItEngine,
+}
+
+
+def create_engine(name: str) -> MarkdownEngine:
+    """
+    Instantiate an engine by name.
+
+    Raises:
+        ValueError: If the engine name is unknown
+        ImportError: If the engine's optional dependencies are missing
+    """
+    try:
+        engine_class = ENGINES[name]
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown markdown engine '{name}', expected one of: {', '.join(ENGINES)}"
+        ) from e
+    return engine_class()
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> MarkdownEngine:
+    """
+    Get the engine selected by ``Settings.MARKDOWN_ENGINE``.
+
+    Falls back to Python-Markdown if the selected engine cannot be loaded.
+    """
+    try:
+        return create_engine(settings.MARKDOWN_ENGINE)
+    except (ValueError, ImportError) as e:
+        logger.error(f"Cannot use markdown engine '{settings.MARKDOWN_ENGINE}': {e}. "
+                     f"Falling back to {PythonMarkdownEngine.name}")
+        return PythonMarkdownEngine()
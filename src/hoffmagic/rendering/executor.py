@@ -0,0 +1,142 @@
+"""
+Off-event-loop markdown rendering for large documents.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from hoffmagic.cache.singleflight import SingleFlight
+from hoffmagic.config import settings
+
+from .cache import render_cache
+from .renderer import render_fallback, render_markdown, source_hash
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.rendering.executor")
+
+
+class RenderExecutor:
+    """
+    Render markdown inline when small and in a worker pool when large.
+
+    Documents shorter than ``threshold`` characters render on the calling
+    thread; anything larger is sent to a process (or thread) pool so that a
+    long essay cannot stall the event loop. Renders exceeding ``timeout``
+    seconds are abandoned and an escaped plain-text fallback is served.
+    Concurrent off-loop renders of the same source share one pool job.
+    """
+
+    def __init__(
+        self, threshold: int, workers: int, timeout: float, kind: str = "process"
+    ) -> None:
+        """
+        Initialize the executor. The pool itself is created on first use.
+
+        Args:
+            threshold: Minimum source length (characters) to render off-loop
+            workers: Maximum number of pool workers
+            timeout: Seconds to wait for an off-loop render
+            kind: "process" or "thread"
+        """
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown render executor kind: {kind}")
+        self.threshold = threshold
+        self.workers = workers
+        self.timeout = timeout
+        self.kind = kind
+        self._pool: Optional[Executor] = None
+        self._flights = SingleFlight(name="renders")
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="markdown-render",
+                )
+            logger.info(f"Started {self.kind} render pool with {self.workers} workers")
+        return self._pool
+
+    async def _render_offloaded(self, source: str) -> str:
+        """Render in the pool, raising asyncio.TimeoutError on timeout."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._get_pool(), render_markdown, source),
+                timeout=self.timeout,
+            )
+        except BrokenProcessPool:
+            logger.error(
+                "Render pool is broken, restarting it and rendering in a thread"
+            )
+            self.shutdown()
+            return await asyncio.to_thread(render_markdown, source)
+
+    async def render(
+        self, source: str, use_cache: bool = True, fallback: bool = True
+    ) -> str:
+        """
+        Render markdown without blocking the event loop on large documents.
+
+        Args:
+            source: Markdown text
+            use_cache: Whether to read and populate the shared render cache
+            fallback: Serve an escaped fallback on timeout instead of raising
+
+        Returns:
+            Rendered HTML, or an escaped fallback if the render timed out
+
+        Raises:
+            asyncio.TimeoutError: If the render timed out and fallback is False
+        """
+        if not source:
+            return ""
+
+        key = source_hash(source)
+        if use_cache:
+            cached = render_cache.get(key)
+            if cached is not None:
+                return cached
+
+        if len(source) < self.threshold:
+            rendered = render_markdown(source)
+        else:
+            try:
+                rendered = await self._flights.do(
+                    key, lambda: self._render_offloaded(source)
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Markdown render of {len(source)} characters "
+                    f"exceeded {self.timeout}s"
+                )
+                if not fallback:
+                    raise
+                return render_fallback(source)
+
+        if use_cache:
+            render_cache.put(key, rendered)
+        return rendered
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for in-flight renders."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Shared executor for templates, services and CLI tools
+render_executor = RenderExecutor(
+    threshold=settings.MARKDOWN_OFFLOAD_THRESHOLD,
+    workers=settings.MARKDOWN_RENDER_WORKERS,
+    timeout=settings.MARKDOWN_RENDER_TIMEOUT,
+    kind=settings.MARKDOWN_RENDER_EXECUTOR,
+)
@@ -0,0 +1,141 @@
+"""
+Cached Pygments highlighting for fenced code blocks.
+"""
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from markdown import Markdown
+from markdown.extensions import Extension
+from markdown.extensions.codehilite import (
+    CodeHilite, CodeHiliteExtension, parse_hl_lines,
+)
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+from markdown.preprocessors import Preprocessor
+from pygments.formatters import get_formatter_by_name
+from pygments.lexers import get_lexer_by_name
+from pygments.util import ClassNotFound
+
+from hoffmagic.cache import ByteLRUCache
+from hoffmagic.config import settings
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.rendering.highlight")
+
+# Highlighted HTML keyed by (language, options, code) digest
+highlight_cache = ByteLRUCache(settings.HIGHLIGHT_CACHE_MAX_BYTES, name="highlight")
+
+
+def _block_key(code: str, lang: Optional[str], options: Dict[str, Any]) -> str:
+    digest = hashlib.sha256(
+        f"{lang or ''}\0{sorted(options.items())!r}\0".encode("utf-8")
+    )
+    digest.update(code.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def highlight_code(code: str, lang: Optional[str], options: Dict[str, Any]) -> str:
+    """
+    Highlight a code block, reusing the result for identical blocks.
+
+    Args:
+        code: Source code of the block
+        lang: Lexer alias, or None to let Pygments guess
+        options: CodeHilite configuration (as returned by ``getConfigs()``)
+
+    Returns:
+        Highlighted HTML, identical to what ``codehilite`` would produce
+    """
+    key = _block_key(code, lang, options)
+    highlighted = highlight_cache.get(key)
+    if highlighted is None:
+        local_options = dict(options)
+        highlighter = CodeHilite(
+            code,
+            lang=lang,
+            style=local_options.pop("pygments_style", "default"),
+            **local_options
+        )
+        highlighted = highlighter.hilite(shebang=False)
+        highlight_cache.put(key, highlighted)
+    return highlighted
+
+
+def warm_lexers(names: Iterable[str]) -> List[str]:
+    """
+    Import and instantiate lexers ahead of the first request that needs them.
+
+    Args:
+        names: Lexer aliases to load
+
+    Returns:
+        Aliases that were loaded successfully
+    """
+    loaded = []
+    for name in names:
+        try:
+            get_lexer_by_name(name)
+            loaded.append(name)
+        except ClassNotFound:
+            logger.warning(f"Unknown lexer '{name}' in highlight pre-warm list")
+    get_formatter_by_name("html")
+    logger.info(f"Pre-warmed {len(loaded)} Pygments lexers")
+    return loaded
+
+
+class CachedFencedBlockPreprocessor(Preprocessor):
+    """
+    Highlight plain fenced code blocks through :data:`highlight_cache`.
+
+    Runs just before ``fenced_code`` and stashes the highlighted HTML exactly
+    like it would. Blocks using ``{attribute}`` syntax are left untouched for
+    ``fenced_code`` to handle.
+    """
+
+    FENCED_BLOCK_RE = FencedBlockPreprocessor.FENCED_BLOCK_RE
+
+    def __init__(self, md: Markdown) -> None:
+        super().__init__(md)
+        self.codehilite_conf: Optional[Dict[str, Any]] = None
+        self.checked_for_deps = False
+
+    def run(self, lines: List[str]) -> List[str]:
+        if not self.checked_for_deps:
+            for ext in self.md.registeredExtensions:
+                if isinstance(ext, CodeHiliteExtension):
+                    self.codehilite_conf = ext.getConfigs()
+            self.checked_for_deps = True
+
+        if not self.codehilite_conf or not self.codehilite_conf["use_pygments"]:
+            return lines
+
+        text = "\n".join(lines)
+        index = 0
+        while True:
+            m = self.FENCED_BLOCK_RE.search(text, index)
+            if not m:
+                break
+            if m.group("attrs"):
+                index = m.end()
+                continue
+
+            options = dict(self.codehilite_conf)
+            if m.group("hl_lines"):
+                options["hl_lines"] = parse_hl_lines(m.group("hl_lines"))
+            code = highlight_code(m.group("code"), m.group("lang") or None, options)
+
+            placeholder = self.md.htmlStash.store(code)
+            text = f"{text[:m.start()]}\n{placeholder}\n{text[m.end():]}"
+            index = m.start() + 1 + len(placeholder)
+        return text.split("\n")
+
+
+class CachedHighlightExtension(Extension):
+    """Markdown extension installing :class:`CachedFencedBlockPreprocessor`."""
+
+    def extendMarkdown(self, md: Markdown) -> None:  # noqa: N802 (Markdown API)
+        md.registerExtension(self)
+        # fenced_code registers at priority 25; run just before it
+        md.preprocessors.register(
+            CachedFencedBlockPreprocessor(md), "cached_fenced_code_block", 26
+        )
@@ -0,0 +1,258 @@
+"""
+Pre-rendered HTML, content analysis and translation rows stored alongside post rows.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .analysis import analyze_html
+from .executor import render_executor
+from .renderer import render_fallback, source_hash
+# Relative so seed_content (which imports the app as ``src.hoffmagic``) gets
+# its own models
+from ..db.models import PostTranslation
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.rendering.persisted")
+
+# Post columns holding the English markdown source, rendered HTML and hash
+POST_RENDERED_FIELDS: Tuple[str, str, str] = ("content", "content_html", "content_hash")
+
+# The same for a post_translations row
+TRANSLATION_RENDERED_FIELDS: Tuple[str, str, str] = (
+    "content", "rendered_html", "content_hash",
+)
+
+# Translation fields set from editable input; the rest are derived
+TRANSLATION_TEXT_FIELDS: Tuple[str, ...] = ("title", "summary", "content")
+
+
+def row_rendered_fields(lang: str) -> Tuple[str, str, str]:
+    """
+    Get the names of a language's source, HTML and hash columns on a detail row.
+
+    Translated values are labelled ``<field>_<lang>`` by the read model queries.
+
+    Args:
+        lang: Language code ('en' or 'pt')
+
+    Returns:
+        Source, rendered HTML and hash column names
+    """
+    if lang == "en":
+        return POST_RENDERED_FIELDS
+    source_field, html_field, hash_field = POST_RENDERED_FIELDS
+    return (f"{source_field}_{lang}", f"{html_field}_{lang}", f"{hash_field}_{lang}")
+
+
+def get_translation(post: Any, lang: str) -> Optional[PostTranslation]:
+    """
+    Get a post's translation row for a language.
+
+    Args:
+        post: Post instance with ``translations`` loaded, e.g. by
+            ``selectinload(Post.translations)`` (or new)
+        lang: Language code
+
+    Returns:
+        Translation row if the post has one, None otherwise
+    """
+    return next((row for row in post.translations if row.lang == lang), None)
+
+
+def set_translation(post: Any, lang: str, **fields: Optional[str]) -> bool:
+    """
+    Set a post's title, summary and content in a non-English language.
+
+    Fields not given are left as they are. A translation left without any
+    text is removed. Rendered HTML is refreshed by :func:`prerender_post`.
+
+    Args:
+        post: Post instance with ``translations`` loaded, e.g. by
+            ``selectinload(Post.translations)`` (or new)
+        lang: Language code, e.g. 'pt'
+        **fields: New values for ``title``, ``summary`` and ``content``
+
+    Returns:
+        True if the translation row was added, changed or removed
+    """
+    unknown = set(fields) - set(TRANSLATION_TEXT_FIELDS)
+    if unknown:
+        raise ValueError(f"Not translatable: {', '.join(sorted(unknown))}")
+    translation = get_translation(post, lang)
+    current = {
+        field: getattr(translation, field) if translation is not None else None
+        for field in TRANSLATION_TEXT_FIELDS
+    }
+    values = {**current, **fields}
+    if not any(values.values()):
+        if translation is None:
+            return False
+        post.translations.remove(translation)
+        return True
+    if translation is None:
+        translation = PostTranslation(lang=lang)
+        post.translations.append(translation)
+    elif values == current:
+        return False
+    for field, value in values.items():
+        setattr(translation, field, value)
+    return True
+
+
+async def _prerender(
+    post: Any,
+    target: Any,
+    fields: Tuple[str, str, str],
+    lang: str,
+    meta: Dict[str, Any],
+) -> bool:
+    """
+    Render and store one language's HTML on a post or translation row if stale.
+
+    Args:
+        post: Post instance being pre-rendered
+        target: ``post`` itself or one of its translation rows
+        fields: Source, rendered HTML and hash attribute names on ``target``
+        lang: Language code, the key of its analysis in ``meta``
+        meta: Post content analysis per language, updated in place
+
+    Returns:
+        True if anything was changed
+    """
+    source_field, html_field, hash_field = fields
+    source = getattr(target, source_field, None)
+    if not source:
+        if getattr(target, html_field, None) is not None or lang in meta:
+            setattr(target, html_field, None)
+            setattr(target, hash_field, None)
+            meta.pop(lang, None)
+            return True
+        return False
+
+    digest = source_hash(source)
+    if getattr(target, hash_field, None) == digest:
+        if lang not in meta and getattr(target, html_field, None):
+            # Rendered before analysis existed; no need to render again
+            meta[lang] = analyze_html(getattr(target, html_field))
+            return True
+        return False
+
+    logger.debug(f"Rendering {lang} HTML for post slug: {getattr(post, 'slug', None)}")
+    timed_out = False
+    try:
+        rendered = await render_executor.render(source, use_cache=False, fallback=False)
+    except asyncio.TimeoutError:
+        # Store the fallback as current: retrying on every read would make
+        # each request for this post wait out the timeout again
+        logger.error(
+            f"Timed out rendering {lang} HTML for post slug: "
+            f"{getattr(post, 'slug', None)}; storing the escaped source instead"
+        )
+        rendered, timed_out = render_fallback(source), True
+    setattr(target, html_field, rendered)
+    setattr(target, hash_field, digest)
+    meta[lang] = analyze_html(rendered)
+    if timed_out:
+        meta[lang]["render_timed_out"] = True
+    return True
+
+
+async def prerender_post(post: Any) -> bool:
+    """
+    Render and store HTML for every language whose stored copy is stale.
+
+    English HTML is stored on the post, other languages on their translation
+    rows. A stored copy is stale when its hash differs from the hash of the
+    current source and renderer configuration. Whenever HTML is rendered, the
+    analysis in ``content_meta`` is refreshed from it too. The caller is
+    responsible for committing the session. Large documents are rendered off
+    the event loop; if one times out, the escaped source is stored under the
+    current hash (and flagged in its analysis) so reads don't retry the render
+    until the source or renderer changes.
+
+    Args:
+        post: Post instance to update in place, with ``translations`` loaded
+            (or new)
+
+    Returns:
+        True if any rendered field was changed, False otherwise
+    """
+    meta = dict(getattr(post, "content_meta", None) or {})
+    changed = await _prerender(post, post, POST_RENDERED_FIELDS, "en", meta)
+    langs = {"en"}
+    for translation in post.translations:
+        langs.add(translation.lang)
+        fields = TRANSLATION_RENDERED_FIELDS
+        if await _prerender(post, translation, fields, translation.lang, meta):
+            changed = True
+    for lang in set(meta) - langs:
+        # Analysis of a removed translation
+        del meta[lang]
+        changed = True
+    if changed:
+        # Assign a new dict so the JSON column is flagged as modified
+        post.content_meta = meta or None
+    return changed
+
+
+def needs_prerender(row: Any, langs: Iterable[str] = ("en",)) -> bool:
+    """
+    Check, without rendering, whether :func:`prerender_post` would change anything.
+
+    Only the given languages' columns need to be present on the row.
+
+    Args:
+        row: Detail row with the source, HTML and hash columns, translated
+            ones labelled ``<field>_<lang>``
+        langs: Languages to check
+
+    Returns:
+        True if a stored copy or its analysis is stale or missing
+    """
+    meta = getattr(row, "content_meta", None) or {}
+    for lang in langs:
+        source_field, html_field, hash_field = row_rendered_fields(lang)
+        source = getattr(row, source_field, None)
+        if not source:
+            if getattr(row, html_field, None) is not None or lang in meta:
+                return True
+            continue
+        if getattr(row, hash_field, None) != source_hash(source):
+            return True
+        if lang not in meta and getattr(row, html_field, None):
+            return True
+    return False
+
+
+def rendered_content(post: Any, lang: str) -> Optional[str]:
+    """
+    Get the stored HTML for a language, falling back to English.
+
+    Args:
+        post: Post instance, with ``translations`` loaded for other languages
+        lang: Language code ('en' or 'pt')
+
+    Returns:
+        Stored HTML if available, None otherwise
+    """
+    if lang != "en":
+        translation = get_translation(post, lang)
+        if translation is not None and translation.rendered_html:
+            return translation.rendered_html
+    return post.content_html
+
+
+def content_analysis(post: Any, lang: str) -> Dict[str, Any]:
+    """
+    Get the stored content analysis for a language, falling back to English.
+
+    Args:
+        post: Post instance
+        lang: Language code ('en' or 'pt')
+
+    Returns:
+        Analysis dict (toc, words, reading_minutes, excerpt), empty if not analyzed yet
+    """
+    meta = getattr(post, "content_meta", None) or {}
+    return meta.get(lang) or meta.get("en") or {}
@@ -0,0 +1,76 @@
+"""
+Markdown to HTML conversion shared by templates, services and CLI tools.
+"""
+import hashlib
+import html
+import json
+import logging
+from functools import lru_cache
+
+from .engines import get_engine
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.rendering")
+
+
+@lru_cache(maxsize=1)
+def renderer_signature() -> str:
+    """
+    Get a digest identifying the current renderer configuration.
+
+    Changes whenever the engine, its configuration or library versions
+    change, so stored HTML can be detected as stale.
+    """
+    engine = get_engine()
+    config = {"engine": engine.name, **engine.config()}
+    encoded = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def source_hash(source: str) -> str:
+    """
+    Hash markdown source together with the renderer signature.
+
+    Args:
+        source: Markdown text
+
+    Returns:
+        Hex digest that changes if either the source or the renderer changes
+    """
+    digest = hashlib.sha256(renderer_signature().encode("ascii"))
+    digest.update(b"\0")
+    digest.update(source.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def render_fallback(source: str) -> str:
+    """
+    Build a safe plain-text representation of markdown that could not be rendered.
+
+    Args:
+        source: Markdown text
+
+    Returns:
+        The escaped source wrapped in a ``<pre>`` block
+    """
+    return f"<pre>{html.escape(source)}</pre>"
+
+
+def render_markdown(source: str) -> str:
+    """
+    Convert markdown text to HTML with the configured engine.
+
+    Args:
+        source: Markdown text
+
+    Returns:
+        Rendered HTML, or an escaped ``<pre>`` block if rendering fails
+    """
+    if not source:
+        return ""
+    try:
+        return get_engine().render(source)
+    except Exception as e:
+        logger.error(f"Error processing markdown: {e}", exc_info=True)
+        # Return original value wrapped in pre tags or a safe HTML representation
+        return f"<pre>Error rendering markdown:\n{html.escape(str(source))}</pre>"
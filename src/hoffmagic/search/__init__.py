@@ -0,0 +1,18 @@
+"""
+Search over published posts and essays.
+"""
+from .bm25 import InvertedIndex, refresh_periodically, search_index
+from .postgres import FullTextSearch, fulltext_search, snippet_html
+from .suggest import SuggestIndex, Suggestion, suggest_index
+
+__all__ = [
+    "FullTextSearch",
+    "fulltext_search",
+    "snippet_html",
+    "InvertedIndex",
+    "search_index",
+    "refresh_periodically",
+    "SuggestIndex",
+    "Suggestion",
+    "suggest_index",
+]
@@ -0,0 +1,324 @@
+"""
+In-process inverted index with BM25 ranking over published posts.
+
+The index holds every published post in both languages and answers
+searches without touching Postgres. Postings are parallel ``array`` objects
+(document numbers and weighted term frequencies), which keeps memory compact
+and scoring a tight loop. Updates are incremental: a changed post gets a new
+document number and its old one is tombstoned until the next compaction.
+Updates applied while a rebuild is reading are replayed onto the rebuilt
+index before it is swapped in.
+"""
+import asyncio
+import logging
+import math
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from hoffmagic.db.models import Post
+
+from .text import analyze, query_variants
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.search.bm25")
+
+# BM25 parameters (standard defaults)
+K1 = 1.2
+B = 0.75
+
+# Term frequency multipliers per field
+FIELD_WEIGHTS = {"title": 3, "summary": 2, "content": 1}
+
+# Fields indexed per language, on the post (English) and its translation rows
+INDEXED_FIELDS = tuple(FIELD_WEIGHTS)
+
+# Compact once this share of document numbers belongs to removed versions
+COMPACT_RATIO = 0.25
+
+
+@dataclass(frozen=True)
+class IndexedDocument:
+    """Per-document data needed for filtering and ordering results."""
+
+    post_id: int
+    is_essay: bool
+    tags: FrozenSet[str]
+    publish_ts: float
+    length: int
+
+
+class _Postings:
+    """Document numbers (ascending) and weighted term frequencies for one term."""
+
+    __slots__ = ("docs", "freqs")
+
+    def __init__(self) -> None:
+        self.docs = array("I")
+        self.freqs = array("I")
+
+
+class InvertedIndex:
+    """
+    Bilingual BM25 index of published posts, keyed by post id.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.built_at: Optional[float] = None
+        # Updates applied during each running rebuild, to replay onto its result
+        self._journals: List[List[Callable[[InvertedIndex], None]]] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        self._postings: Dict[str, _Postings] = {}
+        self._documents: List[Optional[IndexedDocument]] = []
+        self._doc_by_post: Dict[int, int] = {}
+        self._live_length = 0
+
+    # --- building ---
+
+    @staticmethod
+    def _terms(post: Any) -> Counter:
+        """Weighted term frequencies of a post across languages and fields."""
+        frequencies: Counter = Counter()
+        sources = [("en", post), *((row.lang, row) for row in post.translations)]
+        for lang, source in sources:
+            for field in INDEXED_FIELDS:
+                text = getattr(source, field, None)
+                if not text:
+                    continue
+                weight = FIELD_WEIGHTS[field]
+                for term in analyze(text, lang):
+                    frequencies[term] += weight
+        return frequencies
+
+    def upsert(self, post: Any, tag_slugs: Iterable[str]) -> None:
+        """
+        Index the current version of a post, replacing any previous one.
+
+        Unpublished posts are removed instead.
+
+        Args:
+            post: Post instance (column attributes and translations must be loaded)
+            tag_slugs: Slugs of the post's tags
+        """
+        if not post.is_published:
+            self.remove(post.id)
+            return
+        frequencies = self._terms(post)
+        publish_ts = post.publish_date.timestamp() if post.publish_date else 0.0
+        document = IndexedDocument(
+            post.id, bool(post.is_essay), frozenset(tag_slugs), publish_ts,
+            sum(frequencies.values()),
+        )
+        self._apply(lambda index: index._add(document, frequencies))
+
+    def _add(self, document: IndexedDocument, frequencies: Counter) -> None:
+        self._remove(document.post_id)
+        doc = len(self._documents)
+        self._documents.append(document)
+        self._doc_by_post[document.post_id] = doc
+        self._live_length += document.length
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.docs.append(doc)
+            postings.freqs.append(frequency)
+
+    def remove(self, post_id: int) -> bool:
+        """
+        Remove a post from results. Returns True if it was indexed.
+        """
+        indexed = post_id in self._doc_by_post
+        self._apply(lambda index: index._remove(post_id))
+        return indexed
+
+    def _apply(self, change: Callable[["InvertedIndex"], None]) -> None:
+        """Apply an update, and journal it for every rebuild that is reading."""
+        change(self)
+        for journal in self._journals:
+            journal.append(change)
+
+    def _remove(self, post_id: int) -> bool:
+        doc = self._doc_by_post.pop(post_id, None)
+        if doc is None:
+            return False
+        self._live_length -= self._documents[doc].length
+        self._documents[doc] = None
+        if len(self._documents) - len(self._doc_by_post) > COMPACT_RATIO * max(
+            len(self._documents), 8
+        ):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        """Renumber live documents and drop postings of removed ones."""
+        renumber = {}
+        documents = []
+        for doc, document in enumerate(self._documents):
+            if document is not None:
+                renumber[doc] = len(documents)
+                documents.append(document)
+        postings_by_term = {}
+        for term, postings in self._postings.items():
+            compacted = _Postings()
+            for doc, frequency in zip(postings.docs, postings.freqs, strict=True):
+                new_doc = renumber.get(doc)
+                if new_doc is not None:
+                    compacted.docs.append(new_doc)
+                    compacted.freqs.append(frequency)
+            if compacted.docs:
+                postings_by_term[term] = compacted
+        self._documents = documents
+        self._postings = postings_by_term
+        self._doc_by_post = {
+            document.post_id: doc for doc, document in enumerate(documents)
+        }
+        logger.debug(f"Compacted search index to {len(documents)} documents")
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Rebuild the whole index from published posts.
+
+        Args:
+            db: SQLAlchemy async session
+        """
+        start = time.perf_counter()
+        query = (
+            select(Post)
+            .where(Post.is_published == True)
+            .options(selectinload(Post.tags), selectinload(Post.translations))
+        )
+        journal: List[Callable[[InvertedIndex], None]] = []
+        self._journals.append(journal)
+        try:
+            posts = (await db.execute(query)).scalars().all()
+        finally:
+            self._journals.remove(journal)
+        fresh = InvertedIndex()
+        for post in posts:
+            fresh.upsert(post, [tag.slug for tag in post.tags])
+        # Updates applied while reading may be missing from the posts read
+        for change in journal:
+            change(fresh)
+        # Swap everything at once so concurrent searches never see a partial index
+        self._postings, self._documents = fresh._postings, fresh._documents
+        self._doc_by_post, self._live_length = fresh._doc_by_post, fresh._live_length
+        self.ready = True
+        self.built_at = time.time()
+        logger.info(
+            f"Built search index: {len(posts)} posts, {len(self._postings)} terms "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    # --- querying ---
+
+    def search(
+        self,
+        query: str,
+        is_essay: Optional[bool] = None,
+        tag_slug: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 10,
+    ) -> Tuple[int, List[int]]:
+        """
+        Find posts matching any query term, best BM25 score first.
+
+        Each query word is analyzed with both languages' stemmers; a document
+        scores the better of the two variants, so bilingual posts are not
+        counted twice for the same word.
+
+        Args:
+            query: User search input
+            is_essay: Only essays (True), only blog posts (False) or both (None)
+            tag_slug: Only posts with this tag
+            offset: Number of results to skip
+            limit: Maximum number of results to return
+
+        Returns:
+            Tuple of (total matching posts, post ids for the requested window)
+        """
+        live = len(self._doc_by_post)
+        if not live:
+            return 0, []
+        average_length = self._live_length / live
+        documents = self._documents
+
+        scores: Dict[int, float] = {}
+        for word_variants in query_variants(query):
+            best: Dict[int, float] = {}
+            for term in word_variants:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                idf = math.log(
+                    1 + (live - len(postings.docs) + 0.5) / (len(postings.docs) + 0.5)
+                )
+                for doc, frequency in zip(postings.docs, postings.freqs, strict=True):
+                    document = documents[doc]
+                    if document is None:
+                        continue
+                    norm = K1 * (1 - B + B * document.length / average_length)
+                    score = idf * frequency * (K1 + 1) / (frequency + norm)
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] = scores.get(doc, 0.0) + score
+
+        matches = [
+            (score, documents[doc])
+            for doc, score in scores.items()
+            if (is_essay is None or documents[doc].is_essay == is_essay)
+            and (tag_slug is None or tag_slug in documents[doc].tags)
+        ]
+        # Newest first among equal scores, matching the listing order
+        matches.sort(
+            key=lambda match: (-match[0], -match[1].publish_ts, -match[1].post_id)
+        )
+        window = matches[offset:offset + limit]
+        return len(matches), [document.post_id for _, document in window]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index size and freshness."""
+        return {
+            "ready": self.ready,
+            "documents": len(self._doc_by_post),
+            "tombstones": len(self._documents) - len(self._doc_by_post),
+            "terms": len(self._postings),
+            "postings": sum(len(postings.docs) for postings in self._postings.values()),
+            "built_at": self.built_at,
+        }
+
+
+search_index = InvertedIndex()
+
+
+async def refresh_periodically(
+    session_factory: Any, interval: float, indexes: Iterable[Any]
+) -> None:
+    """
+    Rebuild in-memory indexes on a fixed interval so writes made by other
+    processes (seed_content, other replicas) show up.
+
+    Args:
+        session_factory: Callable returning an async session context manager
+        interval: Seconds between rebuilds
+        indexes: Objects with an async ``rebuild(db)`` method
+    """
+    indexes = list(indexes)
+    while True:
+        await asyncio.sleep(interval)
+        for index in indexes:
+            try:
+                async with session_factory() as db:
+                    await index.rebuild(db)
+            except Exception as e:
+                logger.error(f"Error refreshing {type(index).__name__}: {e}")
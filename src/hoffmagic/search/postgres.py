@@ -0,0 +1,103 @@
+"""
+PostgreSQL full-text search over posts and their Portuguese translations.
+
+Matching and ranking use the generated ``search_vector`` columns of posts
+(english) and post_translations (portuguese), which are GIN-indexed, so
+lookups no longer scan every post body.
+"""
+import html
+from dataclasses import dataclass
+
+from sqlalchemy import exists, func, literal_column, or_, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
+
+from hoffmagic.db.models import Post, PostTranslation
+
+# Highlight markers that cannot occur in content; swapped for <mark> after escaping
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+HEADLINE_OPTIONS = (
+    f"MaxFragments=2, MaxWords=30, MinWords=12, FragmentDelimiter=\" … \", "
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}"
+)
+
+
+@dataclass(frozen=True)
+class FullTextSearch:
+    """SQL expressions for one search: filter, rank and snippet."""
+
+    condition: ColumnElement
+    rank: ColumnElement
+    headline: ColumnElement
+
+
+def _regconfig(name: str) -> ColumnElement:
+    # Literal regconfig so Postgres picks the immutable, index-matching overloads
+    return literal_column(f"'{name}'::regconfig")
+
+
+def fulltext_search(search: str, lang: str = "en") -> FullTextSearch:
+    """
+    Build the expressions for a full-text search in both languages.
+
+    Uses ``websearch_to_tsquery`` so user input (quotes, ``or``, ``-term``)
+    never causes a syntax error. A post matches if either language matches,
+    and is ranked by its best match.
+
+    Args:
+        search: User search input
+        lang: Language whose content is used for the snippet ('en' or 'pt')
+
+    Returns:
+        Condition, rank and headline expressions
+    """
+    english, portuguese = _regconfig("english"), _regconfig("portuguese")
+    query_en = func.websearch_to_tsquery(english, search)
+    query_pt = func.websearch_to_tsquery(portuguese, search)
+
+    # Aliased: listing queries in Portuguese already join post_translations
+    translation = aliased(PostTranslation, name="search_translation")
+    is_translation = (translation.post_id == Post.id) & (translation.lang == "pt")
+
+    headline = func.ts_headline(english, Post.content, query_en, HEADLINE_OPTIONS)
+    if lang == "pt":
+        headline = func.coalesce(
+            select(func.ts_headline(
+                portuguese, translation.content, query_pt, HEADLINE_OPTIONS
+            )).where(is_translation).scalar_subquery(),
+            headline,
+        )
+
+    return FullTextSearch(
+        condition=or_(
+            Post.search_vector.op("@@")(query_en),
+            exists().where(
+                is_translation, translation.search_vector.op("@@")(query_pt)
+            ),
+        ),
+        rank=func.greatest(
+            func.ts_rank(Post.search_vector, query_en),
+            select(func.ts_rank(translation.search_vector, query_pt))
+            .where(is_translation)
+            .scalar_subquery(),
+        ),
+        headline=headline,
+    )
+
+
+def snippet_html(headline: str) -> str:
+    """
+    Turn a ``ts_headline`` result into safe HTML with ``<mark>`` highlights.
+
+    Args:
+        headline: Raw headline text from the database
+
+    Returns:
+        Escaped HTML snippet
+    """
+    return (
+        html.escape(headline)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
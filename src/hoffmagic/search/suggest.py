@@ -0,0 +1,304 @@
+"""
+Search-as-you-type completions from an in-memory prefix index.
+
+Post titles (per language) and tag names are kept as accent-folded keys in
+a sorted list; a lookup is a ``bisect`` to the first key with the typed
+prefix followed by a short forward scan. Every word of a title is a key, so
+"carlo" completes "Monte Carlo". Lookups never touch the database.
+
+Posts and tags are ranked on one scale: a post scores by how recent it is
+among indexed posts, a tag by its post count relative to the most used tag,
+both in (0, 1]. Tag counts are kept from each post's tags, so they follow
+``upsert_post`` and ``remove_post`` without a rebuild, and those applied
+while a rebuild is reading are applied again once it has swapped in.
+"""
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hoffmagic.cache.ttl import TTLCache
+from hoffmagic.config import settings
+from hoffmagic.db.models import Post, PostTranslation, Tag, post_tags
+
+from .text import TOKEN_RE, fold_accents
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.search.suggest")
+
+LANGUAGES = ("en", "pt")
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """A completion shown under the search box."""
+
+    kind: str  # "post", "essay" or "tag"
+    label: str
+    url: str
+    weight: float  # publish timestamp for posts, post count for tags
+
+
+def normalize(text: str) -> str:
+    """Accent-fold and reduce text to single-space separated words."""
+    return " ".join(TOKEN_RE.findall(fold_accents(text)))
+
+
+def _keys(label: str) -> List[Tuple[str, int]]:
+    """Keys starting at each word of a label, with their word position."""
+    words = normalize(label).split(" ")
+    return [
+        (" ".join(words[position:]), position)
+        for position in range(len(words))
+        if words[position]
+    ]
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index of post titles and tag names, per language.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.built_at: Optional[float] = None
+        self._posts: Dict[int, Dict[str, Suggestion]] = {}
+        # (name, slug) of each published post's tags; tag suggestions are
+        # counted from it
+        self._post_tags: Dict[int, Tuple[Tuple[str, str], ...]] = {}
+        self._tags: List[Suggestion] = []
+        self._keys: Dict[str, List[Tuple[str, int, int]]] = {
+            lang: [] for lang in LANGUAGES
+        }
+        self._suggestions: List[Suggestion] = []
+        self._scores: List[float] = []
+        self._dirty = True
+        # Changes applied during each running rebuild, to apply again to its result
+        self._journals: List[List[Callable[[SuggestIndex], None]]] = []
+        self._results = TTLCache(settings.CACHE_TTL, max_entries=2048, name="suggest")
+
+    # --- building ---
+
+    @staticmethod
+    def _post_suggestions(
+        post: Any, titles: Dict[str, Optional[str]]
+    ) -> Dict[str, Suggestion]:
+        # titles: translated titles by language; English is the fallback
+        kind, section = ("essay", "essays") if post.is_essay else ("post", "blog")
+        url = f"/{section}/{post.slug}"
+        weight = post.publish_date.timestamp() if post.publish_date else 0.0
+        return {
+            lang: Suggestion(kind, titles.get(lang) or post.title, url, weight)
+            for lang in LANGUAGES
+        }
+
+    def upsert_post(self, post: Any, tags: Optional[Iterable[Any]] = None) -> None:
+        """
+        Add or replace a post's title completions; unpublished posts are removed.
+
+        Args:
+            post: Post instance (column attributes and translations must be loaded)
+            tags: The post's tags (with ``name`` and ``slug``), counted for tag
+                suggestions; None keeps the tags indexed for the post
+        """
+        if not post.is_published:
+            self.remove_post(post.id)
+            return
+        titles = {row.lang: row.title for row in post.translations}
+        post_id, suggestions = post.id, self._post_suggestions(post, titles)
+        tag_pairs = None
+        if tags is not None:
+            tag_pairs = tuple((tag.name, tag.slug) for tag in tags)
+
+        def replace(index: SuggestIndex) -> None:
+            index._posts[post_id] = suggestions
+            if tag_pairs is not None:
+                index._post_tags[post_id] = tag_pairs
+            index._invalidate()
+
+        self._apply(replace)
+
+    def remove_post(self, post_id: int) -> None:
+        """Remove a post's title completions and its tag counts."""
+
+        def remove(index: SuggestIndex) -> None:
+            removed = index._posts.pop(post_id, None)
+            index._post_tags.pop(post_id, None)
+            if removed is not None:
+                index._invalidate()
+
+        self._apply(remove)
+
+    def _apply(self, change: Callable[["SuggestIndex"], None]) -> None:
+        """Apply a change, and journal it for every rebuild that is reading."""
+        change(self)
+        for journal in self._journals:
+            journal.append(change)
+
+    def _invalidate(self) -> None:
+        self._dirty = True
+        self._results.clear()
+
+    def _count_tags(self) -> None:
+        """Recompute tag suggestions from the indexed posts' tags."""
+        counts = Counter(tag for tags in self._post_tags.values() for tag in set(tags))
+        self._tags = [
+            Suggestion("tag", name, f"/blog?tag={slug}", count)
+            for (name, slug), count in counts.items()
+        ]
+
+    def _score(
+        self, suggestion: Suggestion, timestamps: List[float], max_count: float
+    ) -> float:
+        """Rank a suggestion in (0, 1]: recency among posts, or usage among tags."""
+        if suggestion.kind == "tag":
+            return suggestion.weight / max_count
+        return bisect_right(timestamps, suggestion.weight) / len(timestamps)
+
+    def _sort(self) -> None:
+        """Rebuild the sorted key arrays after changes."""
+        self._count_tags()
+        timestamps = sorted(by_lang["en"].weight for by_lang in self._posts.values())
+        max_count = max((tag.weight for tag in self._tags), default=1)
+        suggestions: List[Suggestion] = []
+        scores: List[float] = []
+        keys: Dict[str, List[Tuple[str, int, int]]] = {lang: [] for lang in LANGUAGES}
+        for lang in LANGUAGES:
+            entries = [by_lang[lang] for by_lang in self._posts.values()] + self._tags
+            for suggestion in entries:
+                suggestions.append(suggestion)
+                scores.append(self._score(suggestion, timestamps, max_count))
+                for key, position in _keys(suggestion.label):
+                    keys[lang].append((key, position, len(suggestions) - 1))
+            keys[lang].sort()
+        self._suggestions, self._scores, self._keys = suggestions, scores, keys
+        self._dirty = False
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Rebuild from published post titles and tag names.
+
+        Args:
+            db: SQLAlchemy async session
+        """
+        start = time.perf_counter()
+        journal: List[Callable[[SuggestIndex], None]] = []
+        self._journals.append(journal)
+        try:
+            post_rows, tag_rows = await self._read_rows(db)
+        finally:
+            self._journals.remove(journal)
+        self._posts = {
+            row.id: self._post_suggestions(row, {"pt": row.title_pt})
+            for row in post_rows
+        }
+        post_tag_lists: Dict[int, List[Tuple[str, str]]] = {}
+        for post_id, name, slug in tag_rows:
+            post_tag_lists.setdefault(post_id, []).append((name, slug))
+        self._post_tags = {
+            post_id: tuple(tags) for post_id, tags in post_tag_lists.items()
+        }
+        # Changes applied while reading may be missing from the rows read
+        for change in journal:
+            change(self)
+        self._invalidate()
+        self._sort()
+        self.ready = True
+        self.built_at = time.time()
+        logger.info(
+            f"Built suggest index: {len(self._posts)} titles, {len(self._tags)} tags "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    @staticmethod
+    async def _read_rows(db: AsyncSession) -> Tuple[List[Any], List[Any]]:
+        """Select published post titles and the tags of published posts."""
+        post_rows = (await db.execute(
+            select(
+                Post.id, Post.slug, Post.title, PostTranslation.title.label("title_pt"),
+                Post.is_essay, Post.publish_date, Post.is_published,
+            )
+            .outerjoin(
+                PostTranslation,
+                and_(PostTranslation.post_id == Post.id, PostTranslation.lang == "pt"),
+            )
+            .where(Post.is_published == True)
+        )).all()
+        tag_rows = (await db.execute(
+            select(post_tags.c.post_id, Tag.name, Tag.slug)
+            .join(Tag, Tag.id == post_tags.c.tag_id)
+            .join(Post, Post.id == post_tags.c.post_id)
+            .where(Post.is_published == True)
+        )).all()
+        return list(post_rows), list(tag_rows)
+
+    # --- querying ---
+
+    def suggest(
+        self, prefix: str, lang: str = "en", limit: int = 8
+    ) -> List[Suggestion]:
+        """
+        Complete a typed prefix.
+
+        Matches at the start of a label rank before matches on a later word,
+        then higher scores first, posts and tags alike. The scan stops after
+        ``Settings.SUGGEST_MAX_SCAN`` keys or ``Settings.SUGGEST_BUDGET_MS``,
+        returning what it has so far.
+
+        Args:
+            prefix: Text typed so far
+            lang: Language code ('en' or 'pt')
+            limit: Maximum number of suggestions
+
+        Returns:
+            Suggestions, best first
+        """
+        folded = normalize(prefix)
+        if len(folded) < settings.SUGGEST_MIN_CHARS:
+            return []
+        lang = lang if lang in self._keys else "en"
+        cache_key = (lang, folded, limit)
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            return cached
+        if self._dirty:
+            self._sort()
+
+        deadline = time.perf_counter() + settings.SUGGEST_BUDGET_MS / 1000
+        keys = self._keys[lang]
+        best: Dict[int, int] = {}
+        index = bisect_left(keys, (folded,))
+        for scanned, (key, position, suggestion_index) in enumerate(
+            keys[index : index + settings.SUGGEST_MAX_SCAN]
+        ):
+            if not key.startswith(folded):
+                break
+            if position < best.get(suggestion_index, position + 1):
+                best[suggestion_index] = position
+            if scanned % 64 == 63 and time.perf_counter() > deadline:
+                logger.warning(f"Suggest lookup for '{folded}' hit the latency budget")
+                break
+
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (item[1] > 0, -self._scores[item[0]]),
+        )
+        results = []
+        seen = set()
+        for suggestion_index, _ in ranked:
+            suggestion = self._suggestions[suggestion_index]
+            if suggestion.url not in seen:
+                seen.add(suggestion.url)
+                results.append(suggestion)
+            if len(results) == limit:
+                break
+        self._results.put(cache_key, results)
+        return results
+
+
+suggest_index = SuggestIndex()
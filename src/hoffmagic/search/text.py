@@ -0,0 +1,122 @@
+"""
+Text normalization for the in-memory search index.
+
+Tokens are lowercased and accent-folded, stopwords are dropped and a light
+suffix-stripping stemmer is applied per language, so "Introdução",
+"introducao" and "introduções" all meet at the same term.
+"""
+import re
+import unicodedata
+from typing import Callable, Dict, FrozenSet, List, Set
+
+TOKEN_RE = re.compile(r"\w+")
+
+STOPWORDS: Dict[str, FrozenSet[str]] = {
+    "en": frozenset(
+        "a an and are as at be but by for from has have in is it its of on or "
+        "that the this to was were will with".split()
+    ),
+    "pt": frozenset(
+        "a ao aos as com da das de do dos e em na nas no nos o os ou para "
+        "pela pelo por que se um uma".split()
+    ),
+}
+
+
+def fold_accents(text: str) -> str:
+    """Lowercase and strip diacritics, e.g. ``"Ação"`` -> ``"acao"``."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def stem_en(word: str) -> str:
+    """Strip common English inflections (a small subset of Porter step 1)."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("sses"):
+        return word[:-2]
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("ss"):
+        return word
+    for suffix in ("ingly", "edly", "ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            # running -> run, stopped -> stop
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            return word
+    if word.endswith("ly") and len(word) > 5:
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("us"):
+        return word[:-1]
+    return word
+
+
+# Applied to accent-folded words, first match wins
+_PT_SUFFIXES = (
+    ("mente", ""),
+    ("coes", "cao"),
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("ois", "ol"),
+    ("ns", "m"),
+    ("res", "r"),
+    ("s", ""),
+)
+
+
+def stem_pt(word: str) -> str:
+    """Strip common Portuguese plural and adverb suffixes (accent-folded input)."""
+    if len(word) <= 3:
+        return word
+    for suffix, replacement in _PT_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+STEMMERS: Dict[str, Callable[[str], str]] = {"en": stem_en, "pt": stem_pt}
+
+
+def analyze(text: str, lang: str) -> List[str]:
+    """
+    Turn text into index terms for a language.
+
+    Args:
+        text: Raw text (markdown is fine; punctuation is ignored)
+        lang: Language code ('en' or 'pt')
+
+    Returns:
+        Stemmed, accent-folded terms in document order
+    """
+    stopwords, stem = STOPWORDS[lang], STEMMERS[lang]
+    return [
+        stem(token)
+        for token in TOKEN_RE.findall(fold_accents(text))
+        if token not in stopwords
+    ]
+
+
+def query_variants(text: str) -> List[Set[str]]:
+    """
+    Analyze a query word by word in every language.
+
+    Args:
+        text: User search input
+
+    Returns:
+        One set of alternative terms per distinct query word
+    """
+    variants: List[Set[str]] = []
+    for token in dict.fromkeys(TOKEN_RE.findall(fold_accents(text))):
+        terms = {
+            STEMMERS[lang](token)
+            for lang, stopwords in STOPWORDS.items()
+            if token not in stopwords
+        }
+        if terms:
+            variants.append(terms)
+    return variants
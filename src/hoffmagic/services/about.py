@@ -2,17 +2,69 @@
 Service layer for about functionality.
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Union
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, func
+from sqlalchemy import select, func, true
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
+from hoffmagic.cache import TTLCache, bus, page_cache
+from hoffmagic.config import settings
 from hoffmagic.db.models import Author, Post, Tag, Comment
+from hoffmagic.services.content_store import content_store
+from hoffmagic.services.read_models import AuthorView
 
 # Initialize logger
 logger = logging.getLogger("hoffmagic.services.about")
 
+# Snapshot of get_blog_stats; cleared by post and comment writes, otherwise
+# recomputed at most once per CACHE_TTL
+blog_stats = TTLCache(settings.CACHE_TTL, max_entries=1, name="blog-stats")
+
+STATS_KEY = "stats"
+
+
+def _tag_and_comment_counts() -> Tuple[Any, Any]:
+    """Scalar subqueries counting tags and approved comments."""
+    return (
+        select(func.count()).select_from(Tag).scalar_subquery().label("tag_count"),
+        select(func.count()).select_from(Comment).where(Comment.is_approved == True)
+        .scalar_subquery().label("comment_count"),
+    )
+
+
+def blog_stats_query() -> Select:
+    """
+    Build the single-statement blog statistics query.
+
+    Post and essay counts come from one pass over published posts using
+    ``FILTER``; tag and approved-comment counts are scalar subqueries.
+    """
+    post_stats = (
+        select(
+            func.count().filter(Post.is_essay == False).label("post_count"),
+            func.count().filter(Post.is_essay == True).label("essay_count"),
+        )
+        .where(Post.is_published == True)
+        .subquery("post_stats")
+    )
+    return select(
+        post_stats.c.post_count,
+        post_stats.c.essay_count,
+        *_tag_and_comment_counts(),
+    )
+
+
+def _stats_from_row(row: Row) -> Dict[str, Any]:
+    return {
+        "post_count": row.post_count or 0,
+        "essay_count": row.essay_count or 0,
+        "tag_count": row.tag_count or 0,
+        "comment_count": row.comment_count or 0,
+    }
+
 
 class AboutService:
     """
@@ -30,16 +82,29 @@ class AboutService:
     
     async def get_author_info(self) -> Optional[Author]:
         """
-        Get the primary author information.
+        Get the primary author entity, for modification.
+
+        Reads for display go through :meth:`get_author_view` instead.
         
         Returns:
             Author object if found, None otherwise
         """
         # Get the first author (for simplicity)
-        query = select(Author).order_by(Author.id)
+        query = select(Author).order_by(Author.id).limit(1)
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_author_view(self) -> Optional[Union[AuthorView, Author]]:
+        """
+        Get the primary author for display, from the content store when loaded.
+
+        Returns:
+            Author view (or object) if found, None otherwise
+        """
+        if content_store.ready:
+            return content_store.primary_author()
+        return await self.get_author_info()
+    
     async def update_author_info(self, author_data: Dict[str, Any]) -> Optional[Author]:
         """
         Update the author information.
@@ -61,11 +126,34 @@ class AboutService:
             setattr(author, key, value)
         
         # Save changes
+        await bus.publish(self.db, pages=["about", "author"], author_id=author.id)
         await self.db.commit()
         await self.db.refresh(author)
+        page_cache.invalidate("about", "author")
+        if content_store.ready:
+            content_store.upsert_author(author)
         
         return author
     
+    async def _store_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics with post counts from the content store.
+
+        Tag and comment counts are still queried, as comment approvals and
+        tag changes don't refresh the store; the result is cached like
+        :meth:`get_blog_stats`.
+        """
+        stats = blog_stats.get(STATS_KEY)
+        if stats is None:
+            row = (await self.db.execute(select(*_tag_and_comment_counts()))).one()
+            stats = {
+                **content_store.post_counts(),
+                "tag_count": row.tag_count or 0,
+                "comment_count": row.comment_count or 0,
+            }
+            blog_stats.put(STATS_KEY, stats)
+        return stats
+
     async def get_blog_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the blog.
@@ -73,31 +161,39 @@ class AboutService:
         Returns:
             Dictionary with blog statistics
         """
-        # Count posts
-        post_count_query = select(func.count()).select_from(
-            select(Post).where(and_(Post.is_published == True, Post.is_essay == False)).subquery()
-        )
-        post_count = await self.db.scalar(post_count_query) or 0
-        
-        # Count essays
-        essay_count_query = select(func.count()).select_from(
-            select(Post).where(and_(Post.is_published == True, Post.is_essay == True)).subquery()
-        )
-        essay_count = await self.db.scalar(essay_count_query) or 0
-        
-        # Count tags
-        tag_count_query = select(func.count()).select_from(Tag)
-        tag_count = await self.db.scalar(tag_count_query) or 0
-        
-        # Count comments
-        comment_count_query = select(func.count()).select_from(
-            select(Comment).where(Comment.is_approved == True).subquery()
+        if content_store.ready:
+            return await self._store_stats()
+        stats = blog_stats.get(STATS_KEY)
+        if stats is None:
+            row = (await self.db.execute(blog_stats_query())).one()
+            stats = _stats_from_row(row)
+            blog_stats.put(STATS_KEY, stats)
+        return stats
+
+    async def get_about_page(
+        self,
+    ) -> Tuple[Optional[Union[AuthorView, Author]], Dict[str, Any]]:
+        """
+        Get the author information and blog statistics in one round trip.
+
+        Returns:
+            Tuple of (author if found, statistics dictionary)
+        """
+        if content_store.ready:
+            return content_store.primary_author(), await self._store_stats()
+        stats = blog_stats.get(STATS_KEY)
+        if stats is not None:
+            return await self.get_author_info(), stats
+
+        stats_row = blog_stats_query().subquery("stats")
+        query = (
+            select(Author, stats_row)
+            .select_from(stats_row)
+            .outerjoin(Author, true())
+            .order_by(Author.id)
+            .limit(1)
         )
-        comment_count = await self.db.scalar(comment_count_query) or 0
-        
-        return {
-            "post_count": post_count,
-            "essay_count": essay_count,
-            "tag_count": tag_count,
-            "comment_count": comment_count,
-        }
+        row = (await self.db.execute(query)).one()
+        stats = _stats_from_row(row)
+        blog_stats.put(STATS_KEY, stats)
+        return row.Author, stats
@@ -14,17 +14,38 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload # Add selectinload
 
 from hoffmagic.config import settings
-from sqlalchemy import select, func, or_, and_, desc # Add desc
+from sqlalchemy import (
+    select, delete, func, or_, and_, desc, literal, true, tuple_,
+)  # Add desc
+from sqlalchemy import Text, cast
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload # Add selectinload
 from sqlalchemy.future import select # Keep this if used elsewhere, or consolidate imports
 
 from hoffmagic.config import settings
-from hoffmagic.db.models import Post, Author, Tag, Comment, post_tags # Ensure Comment is imported
+from hoffmagic.cache import bus, page_cache, post_cache_tags
+from hoffmagic.search import fulltext_search, search_index, snippet_html
+from hoffmagic.services.about import blog_stats
+from hoffmagic.services.pagination import (
+    LISTING_ORDER, after_cursor, count_key, decode_cursor, encode_cursor, encode_keyset,
+    post_counts,
+)
+from hoffmagic.rendering import invalidate_rendered, needs_prerender, prerender_post
+from hoffmagic.services.content_store import content_store
+from hoffmagic.services.invalidation import commit_post_write
+from hoffmagic.services.slugs import forget_slugs, resolve_post_id
+from hoffmagic.services.read_models import (
+    CommentView, PostView, detail_query, language_chain, listing_query, load_post_views
+)
+from hoffmagic.db.models import ( # Ensure Comment is imported
+    Post, PostTranslation, Author, Tag, Comment, post_tags
+)
 from hoffmagic.api.schemas import BlogPostsResponse
 from hoffmagic.api.schemas import (
     PostCreate, PostUpdate, CommentCreate,
-    BlogPostsResponse
+    BlogPostsResponse, CommentThreadsResponse
 )
 
 # Initialize logger
@@ -45,13 +66,48 @@ class BlogService:
         """
         self.db = db
 
-    def _get_localized_field(self, obj, field_name, lang):
-        """Get the appropriate field value based on language."""
-        if lang == 'pt':
-            pt_field = getattr(obj, f"{field_name}_pt", None)
-            if pt_field:
-                return pt_field
-        return getattr(obj, field_name)
+    async def _ensure_rendered(self, post: Post) -> None:
+        """Re-render stored HTML if the source or renderer config changed."""
+        if await prerender_post(post):
+            logger.info(f"Refreshed stale rendered HTML for slug: {post.slug}")
+            await self.db.commit()
+
+    async def _search_in_memory(
+        self,
+        search: str,
+        page: int,
+        page_size: int,
+        tag_slug: Optional[str],
+        is_essay: bool,
+        lang: str,
+    ) -> BlogPostsResponse:
+        """
+        Search with the in-process BM25 index; only the requested page is loaded.
+        """
+        total, post_ids = search_index.search(
+            search,
+            is_essay=is_essay,
+            tag_slug=tag_slug,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+        )
+        posts = []
+        if content_store.ready:
+            posts = content_store.get_posts(post_ids, lang)
+        elif post_ids:
+            query = listing_query(lang).where(Post.id.in_(post_ids))
+            by_id = {row.id: row for row in (await self.db.execute(query)).all()}
+            # Keep the index's ranking
+            rows = [by_id[post_id] for post_id in post_ids if post_id in by_id]
+            posts = await load_post_views(self.db, rows, lang)
+
+        return BlogPostsResponse(
+            items=posts,
+            total=total,
+            page=page,
+            page_size=page_size,
+            pages=(total + page_size - 1) // page_size if total > 0 else 1,
+        )
 
     async def get_posts(
         self,
@@ -60,132 +116,362 @@ class BlogService:
         tag_slug: Optional[str] = None,
         search: Optional[str] = None,
         is_essay: bool = False,
-        lang: str = 'en'
+        lang: str = 'en',
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> BlogPostsResponse:
         """
         Get posts (or essays) with pagination, filtering, and search.
         Returns a BlogPostsResponse with localized content.
+
+        Pages are addressed either by ``page`` (offset) or by ``cursor`` (keyset,
+        constant cost at any depth); every response carries ``next_cursor``.
+        Totals come from a short-lived cache and can be skipped entirely.
         """
         try:
+            if content_store.ready and not search:
+                posts, total, next_cursor = content_store.list_posts(
+                    is_essay, lang, tag_slug, page, page_size, cursor, include_total
+                )
+                pages = None
+                if total is not None:
+                    pages = (total + page_size - 1) // page_size if total > 0 else 1
+                return BlogPostsResponse(
+                    items=posts,
+                    total=total,
+                    page=None if cursor else page,
+                    page_size=page_size,
+                    pages=pages,
+                    next_cursor=next_cursor,
+                )
+
             query = (
-                select(Post)
+                listing_query(lang)
                 .where(Post.is_published == True)
                 .where(Post.is_essay == is_essay)
-                .options(
-                    selectinload(Post.author),
-                    selectinload(Post.tags),
-                    # selectinload(Post.comments) # Avoid loading comments in list view
-                )
-                .order_by(desc(Post.publish_date))
+                .order_by(*LISTING_ORDER)
             )
 
             # Apply tag filter
             if tag_slug:
                 tag_subquery = select(Tag.id).where(Tag.slug == tag_slug).scalar_subquery()
-                query = query.join(post_tags).where(post_tags.c.tag_id == tag_subquery)
-
-            # Apply search filter
-            if search:
-                search_term = f"%{search}%"
-                query = query.where(
-                    or_(
-                        Post.title.ilike(search_term),
-                        Post.content.ilike(search_term),
-                        Post.summary.ilike(search_term)
-                    )
+                query = (
+                    query.join(post_tags, post_tags.c.post_id == Post.id)
+                    .where(post_tags.c.tag_id == tag_subquery)
+                )
+
+            if search and cursor:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        "Search results are ranked; "
+                        "paginate them with page instead of cursor"
+                    ),
+                )
+            if search and settings.SEARCH_BACKEND == "memory" and search_index.ready:
+                return await self._search_in_memory(
+                    search, page, page_size, tag_slug, is_essay, lang
                 )
 
-            # Get total count for pagination
-            count_query = select(func.count()).select_from(query.subquery())
-            total = await self.db.scalar(count_query) or 0
+            # Apply full-text search filter (GIN-indexed, English and Portuguese)
+            fts = fulltext_search(search, lang) if search else None
+            if fts is not None:
+                query = query.where(fts.condition)
 
-            # Apply pagination
-            query = query.offset((page - 1) * page_size).limit(page_size)
-            posts = (await self.db.execute(query)).scalars().all()
+            # Get total count for pagination, cached per filter
+            total = None
+            if include_total:
+                key = count_key(is_essay, tag_slug, search)
+                total = post_counts.get(key)
+                if total is None:
+                    count_query = select(func.count()).select_from(
+                        query.order_by(None).subquery()
+                    )
+                    total = await self.db.scalar(count_query) or 0
+                    post_counts.put(key, total)
 
-            # Localize posts
-            localized_posts = []
-            for post in posts:
-                if lang == 'pt':
-                    if hasattr(post, 'title_pt') and post.title_pt:
-                        post.title = post.title_pt
-                    if hasattr(post, 'summary_pt') and post.summary_pt:
-                        post.summary = post.summary_pt
-                localized_posts.append(post)
+            if fts is not None:
+                # Best matches first, newest first among equal ranks
+                query = (
+                    query.add_columns(
+                        fts.rank.label("search_rank"),
+                        fts.headline.label("search_headline"),
+                    )
+                    .order_by(None)
+                    .order_by(desc("search_rank"), *LISTING_ORDER)
+                )
+
+            # Apply pagination; one extra row tells whether a next page exists
+            if cursor:
+                query = after_cursor(query, cursor)
+            else:
+                query = query.offset((page - 1) * page_size)
+            rows = (await self.db.execute(query.limit(page_size + 1))).all()
+            snippets = None
+            if fts is not None:
+                snippets = {
+                    row.id: snippet_html(row.search_headline or "")
+                    for row in rows[:page_size]
+                }
+            posts = await load_post_views(
+                self.db, rows[:page_size], lang, search_snippets=snippets
+            )
+            next_cursor = None
+            if len(rows) > page_size and fts is None:
+                next_cursor = encode_cursor(posts[-1])
 
             # Calculate pages
-            pages = (total + page_size - 1) // page_size if total > 0 else 1
+            pages = None
+            if total is not None:
+                pages = (total + page_size - 1) // page_size if total > 0 else 1
 
             return BlogPostsResponse(
-                items=localized_posts,
+                items=posts,
                 total=total,
-                page=page,
+                page=None if cursor else page,
                 page_size=page_size,
-                pages=pages
+                pages=pages,
+                next_cursor=next_cursor,
             )
         except Exception as e:
             logger.error(f"Error getting posts: {str(e)}")
             raise
 
     async def get_post_by_slug(
-        self,
-        slug: str,
-        is_essay: bool = False,
-        lang: str = 'en'
+        self, slug: str, is_essay: bool = False
     ) -> Optional[Post]:
         """
-        Get a post by its slug, applying localization if necessary.
+        Get a post entity by its slug, for modification.
+
+        Reads for display go through :meth:`get_post_view` instead.
 
         Args:
             slug: Post slug
             is_essay: Whether the post is an essay
-            lang: Language code ('en' or 'pt')
 
         Returns:
             Post object if found, None otherwise
         """
-        logger.debug(f"Fetching post/essay by slug: {slug}, is_essay: {is_essay}, lang: {lang}")
+        logger.debug(f"Fetching post/essay by slug: {slug}, is_essay: {is_essay}")
         query = (
             select(Post)
             .where(Post.slug == slug, Post.is_essay == is_essay) # Combined where clause
             .options(
                 selectinload(Post.tags),
                 selectinload(Post.author),
-                # Load ALL comments eagerly; filtering happens in frontend/template
-                selectinload(Post.comments)
+                selectinload(Post.translations),
             )
         )
         result = await self.db.execute(query)
         post = result.scalars().first() # Use scalars().first() as before
 
-        if post and lang == 'pt':
-            logger.debug(f"Post found, attempting to localize fields to Portuguese for slug: {slug}")
-            # Overwrite fields with Portuguese versions if they exist and are not empty
-            title_pt = getattr(post, 'title_pt', None)
-            content_pt = getattr(post, 'content_pt', None)
-            summary_pt = getattr(post, 'summary_pt', None)
-
-            if title_pt:
-                post.title = title_pt
-                logger.debug(f"Applied title_pt for slug: {slug}")
-            if content_pt:
-                post.content = content_pt
-                logger.debug(f"Applied content_pt for slug: {slug}")
-            if summary_pt:
-                post.summary = summary_pt
-                logger.debug(f"Applied summary_pt for slug: {slug}")
-            # Localize comments (already loaded and filtered by approved status)
-            if post.comments:
-                 for comment in post.comments:
-                     if hasattr(comment, 'content_pt') and comment.content_pt:
-                         comment.content = comment.content_pt
-                         logger.debug(f"Applied content_pt for comment ID: {comment.id} on post slug: {slug}")
-
-
-        # Removed potentially incorrect comment count logic mentioned in the prompt
+        if post:
+            await self._ensure_rendered(post)
 
         return post
 
+    async def get_post_view(
+        self,
+        slug: str,
+        is_essay: bool = False,
+        lang: str = 'en',
+    ) -> Optional[PostView]:
+        """
+        Get a read-only view of a post in one language, falling back to English.
+
+        Only the columns of the requested language and its fallback are
+        selected; stale rendered HTML is refreshed first.
+
+        Args:
+            slug: Post slug
+            is_essay: Whether the post is an essay
+            lang: Language code ('en' or 'pt')
+
+        Returns:
+            PostView if found, None otherwise
+        """
+        logger.debug(
+            f"Fetching post/essay view by slug: {slug}, "
+            f"is_essay: {is_essay}, lang: {lang}"
+        )
+        if content_store.ready:
+            view = content_store.get_post(slug, is_essay, lang)
+            if view is not None:
+                return view
+        query = detail_query(lang).where(Post.slug == slug, Post.is_essay == is_essay)
+        row = (await self.db.execute(query)).first()
+        if row is None:
+            return None
+        if needs_prerender(row, language_chain(lang)):
+            await self._ensure_rendered(
+                await self.db.get(
+                    Post, row.id, options=[selectinload(Post.translations)]
+                )
+            )
+            row = (await self.db.execute(query)).first()
+
+        views = await load_post_views(self.db, [row], lang)
+        return views[0]
+
+    async def get_post_validator(
+        self,
+        slug: str,
+        is_essay: bool = False,
+        include_comments: bool = False,
+    ) -> Optional[Row]:
+        """
+        Get the values a post response depends on, without loading the post.
+
+        Used to answer conditional requests before any body is loaded or rendered.
+
+        Args:
+            slug: Post slug
+            is_essay: Whether the post is an essay
+            include_comments: Also aggregate the post's comments, for comment responses
+
+        Returns:
+            Row (or stored view) with updated_at, author_updated_at and is_published
+            (plus comment_count, approved_ids_hash and last_comment_change if
+            requested), None if not found
+        """
+        if content_store.ready and not include_comments:
+            # Published posts only; drafts are looked up below
+            view = content_store.get_post(slug, is_essay)
+            if view is not None:
+                return view
+        query = (
+            select(
+                Post.updated_at,
+                Post.is_published,
+                Author.updated_at.label("author_updated_at"),
+            )
+            .outerjoin(Author, Author.id == Post.author_id)
+            .where(Post.slug == slug, Post.is_essay == is_essay)
+        )
+        if include_comments:
+            # Which comments are approved (a hash of their ids, so swaps show)
+            # and when any comment last changed (edits, approvals)
+            approved_ids = func.string_agg(
+                cast(Comment.id, Text), aggregate_order_by(literal(","), Comment.id)
+            ).filter(Comment.is_approved == True)
+            comment_stats = (
+                select(
+                    func.count(Comment.id).label("comment_count"),
+                    func.md5(approved_ids).label("approved_ids_hash"),
+                    func.max(func.coalesce(Comment.updated_at, Comment.created_at))
+                    .label("last_comment_change"),
+                )
+                .where(Comment.post_id == Post.id)
+                .lateral("comment_stats")
+            )
+            query = query.add_columns(
+                comment_stats.c.comment_count,
+                comment_stats.c.approved_ids_hash,
+                comment_stats.c.last_comment_change,
+            ).join(comment_stats, true())
+        result = await self.db.execute(query)
+        return result.first()
+
+    async def get_comment_threads(
+        self,
+        slug: str,
+        cursor: Optional[str] = None,
+        limit: int = settings.COMMENTS_PAGE_SIZE,
+    ) -> CommentThreadsResponse:
+        """
+        Get a page of a post's approved comments with their approved replies.
+
+        Top-level comments are paginated oldest first by (created_at, id);
+        replies come along with their thread, up to ``Settings.COMMENT_MAX_DEPTH``
+        levels deep, from one recursive query. A reply whose parent is not
+        approved is not shown.
+
+        Args:
+            slug: Post slug
+            cursor: Opaque cursor from a previous page's next_cursor
+            limit: Maximum number of top-level comments
+
+        Returns:
+            CommentThreadsResponse with nested comment views
+
+        Raises:
+            HTTPException: 404 if the post does not exist, 400 for a bad cursor
+        """
+        post_id = await resolve_post_id(self.db, slug, is_essay=False)
+        if post_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Post with slug '{slug}' not found",
+            )
+
+        thread_columns = (
+            Comment.id,
+            Comment.parent_id,
+            Comment.content,
+            Comment.author_name,
+            Comment.created_at,
+        )
+        roots = (
+            select(*thread_columns)
+            .where(
+                Comment.post_id == post_id,
+                Comment.parent_id.is_(None),
+                Comment.is_approved == True,
+            )
+            .order_by(Comment.created_at, Comment.id)
+            .limit(limit + 1)  # One extra root tells whether there is a next page
+        )
+        if cursor:
+            created_at, comment_id = decode_cursor(cursor)
+            roots = roots.where(
+                tuple_(Comment.created_at, Comment.id) > tuple_(created_at, comment_id)
+            )
+        roots = roots.subquery("roots")
+
+        tree = select(*roots.c, literal(0).label("depth")).cte(
+            "comment_tree", recursive=True
+        )
+        tree = tree.union_all(
+            select(*thread_columns, (tree.c.depth + 1).label("depth"))
+            .join(tree, Comment.parent_id == tree.c.id)
+            .where(
+                Comment.post_id == post_id,
+                Comment.is_approved == True,
+                tree.c.depth < settings.COMMENT_MAX_DEPTH,
+            )
+        )
+        rows = (await self.db.execute(
+            select(tree).order_by(tree.c.depth.desc(), tree.c.created_at, tree.c.id)
+        )).all()
+
+        # Deepest rows first, so every reply exists before its parent is built
+        replies: Dict[int, List[CommentView]] = {}
+        threads: List[CommentView] = []
+        for row in rows:
+            comment = CommentView(
+                id=row.id,
+                parent_id=row.parent_id,
+                content=row.content,
+                author_name=row.author_name,
+                created_at=row.created_at,
+                replies=tuple(replies.pop(row.id, ())),
+            )
+            if row.depth == 0:
+                threads.append(comment)
+            else:
+                replies.setdefault(row.parent_id, []).append(comment)
+
+        next_cursor = None
+        if len(threads) > limit:
+            threads = threads[:limit]
+            next_cursor = encode_keyset(threads[-1].created_at, threads[-1].id)
+
+        return CommentThreadsResponse(
+            items=threads,
+            page_size=limit,
+            next_cursor=next_cursor,
+        )
+
     async def create_post(self, post_data: Dict[str, Any]) -> Post:
         """
         Create a new blog post.
@@ -196,9 +482,8 @@ class BlogService:
         Returns:
             Created post object
         """
-        # Check if slug is already in use
-        existing_post = await self.get_post_by_slug(post_data["slug"])
-        if existing_post:
+        # Check if slug is already in use (slugs are unique across posts and essays)
+        if await resolve_post_id(self.db, post_data["slug"]) is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Post with slug '{post_data['slug']}' already exists",
@@ -216,6 +501,7 @@ class BlogService:
         # Create post instance
         post = Post(**post_data)
         post.tags = tags
+        await prerender_post(post)
         
         # Add publish date if post is published
         if post.is_published:
@@ -223,8 +509,11 @@ class BlogService:
         
         # Save to database
         self.db.add(post)
-        await self.db.commit()
-        await self.db.refresh(post)
+        await self.db.flush()
+        stale_pages = post_cache_tags(
+            post.slug, post.is_essay, [tag.slug for tag in tags]
+        )
+        await commit_post_write(self.db, post.id, post, tags, stale_pages, [post.slug])
         
         return post
     
@@ -245,10 +534,18 @@ class BlogService:
         Returns:
             Updated post object if found, None otherwise
         """
-        # Get existing post
-        post = await self.get_post_by_slug(slug, is_essay)
-        
+        # Get existing post; tags are needed for cache invalidation
+        post_id = await resolve_post_id(self.db, slug, is_essay)
+        post = None
+        if post_id is not None:
+            post = await self.db.get(
+                Post,
+                post_id,
+                options=[selectinload(Post.tags), selectinload(Post.translations)],
+            )
+
         if not post:
+            forget_slugs(slug)
             return None
         
         # Update post fields
@@ -258,13 +555,17 @@ class BlogService:
         new_slug = update_data.get("slug")
         if new_slug and new_slug != slug:
             # Check if new slug is already in use
-            existing_post = await self.get_post_by_slug(new_slug, is_essay)
-            if existing_post:
+            if await resolve_post_id(self.db, new_slug) is not None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Post with slug '{new_slug}' already exists",
                 )
         
+        # Pages showing the post before this update
+        stale_pages = post_cache_tags(
+            slug, post.is_essay, [tag.slug for tag in post.tags]
+        )
+
         # Handle tags
         tag_ids = update_data.pop("tag_ids", None)
         if tag_ids is not None:
@@ -277,12 +578,21 @@ class BlogService:
             post.publish_date = datetime.now()
         
         # Update other fields
+        previous_sources = (post.content, *(row.content for row in post.translations))
         for key, value in update_data.items():
             setattr(post, key, value)
+        await prerender_post(post)
+        tags = list(post.tags)
+        tag_slugs = [tag.slug for tag in tags]
+        stale_pages += post_cache_tags(post.slug, post.is_essay, tag_slugs)
         
-        # Save changes
-        await self.db.commit()
-        await self.db.refresh(post)
+        # Save changes and invalidate pages showing the old and new version
+        await commit_post_write(
+            self.db, post.id, post, tags, stale_pages, [slug, post.slug]
+        )
+
+        # Free cached renders of the replaced content
+        invalidate_rendered(*previous_sources)
         
         return post
     
@@ -301,15 +611,33 @@ class BlogService:
         Returns:
             True if deleted, False if not found
         """
-        # Get existing post
-        post = await self.get_post_by_slug(slug, is_essay)
-        
-        if not post:
+        post_id = await resolve_post_id(self.db, slug, is_essay)
+        if post_id is None:
             return False
+        post = (await self.db.execute(
+            select(Post.id, Post.slug, Post.is_essay, Post.content)
+            .where(Post.id == post_id)
+        )).first()
+        if post is None:
+            forget_slugs(slug)
+            return False
+        translated_sources = (await self.db.execute(
+            select(PostTranslation.content).where(PostTranslation.post_id == post_id)
+        )).scalars().all()
+        tag_slugs = (await self.db.execute(
+            select(Tag.slug)
+            .join(post_tags, post_tags.c.tag_id == Tag.id)
+            .where(post_tags.c.post_id == post_id)
+        )).scalars().all()
         
-        # Delete post
-        await self.db.delete(post)
-        await self.db.commit()
+        # Delete post with set-based statements, so comment trees are never
+        # loaded; translations go with the post through ON DELETE CASCADE
+        stale_pages = post_cache_tags(post.slug, post.is_essay, tag_slugs)
+        await self.db.execute(delete(Comment).where(Comment.post_id == post_id))
+        await self.db.execute(delete(post_tags).where(post_tags.c.post_id == post_id))
+        await self.db.execute(delete(Post).where(Post.id == post_id))
+        await commit_post_write(self.db, post_id, stale_pages=stale_pages, slugs=[slug])
+        invalidate_rendered(post.content, *translated_sources)
         
         return True
     
@@ -328,10 +656,10 @@ class BlogService:
         Returns:
             Created comment object
         """
-        # Get the post
-        post = await self.get_post_by_slug(slug)
+        # Only the id is needed
+        post_id = await resolve_post_id(self.db, slug, is_essay=False)
         
-        if not post:
+        if post_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Post with slug '{slug}' not found",
@@ -342,15 +670,19 @@ class BlogService:
             content=comment_data.content,
             author_name=comment_data.author_name,
             author_email=comment_data.author_email,
-            post_id=post.id,
+            post_id=post_id,
             parent_id=comment_data.parent_id,
             is_approved=False,  # Comments require approval by default
         )
         
         # Save to database
         self.db.add(comment)
+        await bus.publish(self.db, pages=["stats"])
         await self.db.commit()
         await self.db.refresh(comment)
+        # Comment counts appear in the about page stats
+        page_cache.invalidate("stats")
+        blog_stats.clear()
         
         return comment
     # Removed load_markdown_posts. Content syncing should be explicit.
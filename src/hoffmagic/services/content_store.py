@@ -0,0 +1,396 @@
+"""
+In-memory store of the published corpus, for sites small enough to keep in RAM.
+
+When ``Settings.CONTENT_STORE_ENABLED`` is set, every published post is
+loaded at startup as one immutable :class:`PostView` per language, along with
+authors and tags, and the blog, essays and about services answer reads from
+here without touching the database:
+
+* a slug dict for detail lookups;
+* a date-sorted key array per ``is_essay`` (listing order), so cursor pages
+  are a ``bisect`` and offset pages a slice;
+* a bitset per tag over post slots, so tag filters are a bit test and tag
+  totals a ``bit_count``.
+
+Writes made through the services refresh single posts; the periodic refresh
+rebuilds everything so changes made by other processes show up. Changes
+applied while a rebuild is reading are journaled and replayed onto the
+rebuilt store before it is swapped in, so the swap never loses them. Drafts
+and anything else not in the store fall through to the database.
+"""
+import heapq
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from hoffmagic.db.models import Author, Post, Tag, post_tags
+from hoffmagic.rendering import needs_prerender, prerender_post
+from hoffmagic.services.pagination import decode_cursor, encode_cursor
+from hoffmagic.services.read_models import (
+    FALLBACK_LANGUAGE, TRANSLATED_LANGUAGES, AuthorView, PostView, TagView,
+    detail_query, language_chain,
+)
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.services.content_store")
+
+LANGUAGES = (FALLBACK_LANGUAGE, *TRANSLATED_LANGUAGES)
+
+# Ascending sort key of a post in listing order:
+# (undated, -publish timestamp, -id), i.e. newest first and undated last
+SortKey = Tuple[bool, float, int]
+
+
+def _sort_key(publish_date: Optional[datetime], post_id: int) -> SortKey:
+    if publish_date is None:
+        return (True, 0.0, -post_id)
+    return (False, -publish_date.timestamp(), -post_id)
+
+
+class ContentStore:
+    """
+    Published posts, authors and tags, indexed for listing and detail reads.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.built_at: Optional[float] = None
+        # Changes applied during each running rebuild, to replay onto its result
+        self._journals: List[List[Callable[[ContentStore], None]]] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        self._views: Dict[int, Dict[str, PostView]] = {}
+        self._by_slug: Dict[str, int] = {}
+        self._order: Dict[bool, List[SortKey]] = {False: [], True: []}
+        self._slot_by_id: Dict[int, int] = {}
+        self._next_slot = 0
+        # Slots of removed posts, reused lowest first so bitsets stay short
+        self._free_slots: List[int] = []
+        self._kind_bits: Dict[bool, int] = {False: 0, True: 0}
+        self._tag_bits: Dict[str, int] = {}
+        self._authors: Dict[int, AuthorView] = {}
+
+    # --- building ---
+
+    @staticmethod
+    async def _detail_rows(
+        db: AsyncSession, lang: str, *conditions: Any
+    ) -> Sequence[Any]:
+        """Select published detail rows in a language, re-rendering stale HTML first."""
+        query = detail_query(lang).where(Post.is_published == True, *conditions)
+        rows = (await db.execute(query)).all()
+        stale = [row.id for row in rows if needs_prerender(row, language_chain(lang))]
+        if stale:
+            posts = (await db.execute(
+                select(Post).where(Post.id.in_(stale)).options(selectinload(Post.translations))
+            )).scalars().all()
+            for post in posts:
+                await prerender_post(post)
+            await db.commit()
+            logger.info(f"Refreshed stale rendered HTML for {len(posts)} posts")
+            rows = (await db.execute(query)).all()
+        return rows
+
+    @staticmethod
+    async def _tag_views(
+        db: AsyncSession, *conditions: Any
+    ) -> Dict[int, List[TagView]]:
+        """Get the tags of published posts, by post id."""
+        rows = await db.execute(
+            select(post_tags.c.post_id, Tag.id, Tag.name, Tag.slug)
+            .join(Tag, Tag.id == post_tags.c.tag_id)
+            .join(Post, Post.id == post_tags.c.post_id)
+            .where(Post.is_published == True, *conditions)
+            .order_by(Tag.id)
+        )
+        tags: Dict[int, List[TagView]] = {}
+        for row in rows:
+            tags.setdefault(row.post_id, []).append(
+                TagView(id=row.id, name=row.name, slug=row.slug)
+            )
+        return tags
+
+    @staticmethod
+    async def _author_views(
+        db: AsyncSession, *conditions: Any
+    ) -> Dict[int, AuthorView]:
+        rows = await db.execute(
+            select(
+                Author.id,
+                Author.name,
+                Author.bio,
+                Author.avatar,
+                Author.email,
+                Author.updated_at,
+            ).where(*conditions)
+        )
+        return {row.id: AuthorView.from_row(row) for row in rows}
+
+    def _add(self, views: Dict[str, PostView]) -> None:
+        """Index one post's views; the post must not be in the store."""
+        post = views[FALLBACK_LANGUAGE]
+        if self._free_slots:
+            slot = heapq.heappop(self._free_slots)
+        else:
+            slot = self._next_slot
+            self._next_slot += 1
+        mask = 1 << slot
+        self._views[post.id] = views
+        self._by_slug[post.slug] = post.id
+        self._slot_by_id[post.id] = slot
+        insort(self._order[post.is_essay], _sort_key(post.publish_date, post.id))
+        self._kind_bits[post.is_essay] |= mask
+        for tag in post.tags:
+            self._tag_bits[tag.slug] = self._tag_bits.get(tag.slug, 0) | mask
+
+    def _build(
+        self,
+        rows_by_lang: Dict[str, Sequence[Any]],
+        tags: Dict[int, List[TagView]],
+    ) -> None:
+        """Add posts from detail rows selected for every language."""
+        by_lang = {
+            lang: {row.id: row for row in rows} for lang, rows in rows_by_lang.items()
+        }
+        for post_id, row in by_lang[FALLBACK_LANGUAGE].items():
+            related = {
+                "author": self._authors.get(row.author_id),
+                "tags": tuple(tags.get(post_id, ())),
+            }
+            self._add(
+                {
+                    lang: PostView.from_localized_row(
+                        rows.get(post_id, row), lang, **related
+                    )
+                    for lang, rows in by_lang.items()
+                }
+            )
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Rebuild from every published post, author and tag.
+
+        Args:
+            db: SQLAlchemy async session
+        """
+        start = time.perf_counter()
+        fresh = ContentStore()
+        fresh._authors = await self._author_views(db)
+        journal: List[Callable[[ContentStore], None]] = []
+        self._journals.append(journal)
+        try:
+            rows_by_lang = {
+                lang: await self._detail_rows(db, lang) for lang in LANGUAGES
+            }
+            fresh._build(rows_by_lang, await self._tag_views(db))
+            # Writes applied while reading may be missing from the rows read
+            for change in journal:
+                change(fresh)
+        finally:
+            self._journals.remove(journal)
+        # Swap everything at once so concurrent reads never see a partial store
+        state = vars(fresh)
+        del state["_journals"]
+        vars(self).update(state)
+        self.ready = True
+        self.built_at = time.time()
+        logger.info(
+            f"Built content store: {len(self._views)} posts, "
+            f"{len(self._tag_bits)} tags "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    async def refresh_post(self, db: AsyncSession, post_id: int) -> None:
+        """
+        Reload one post after a write; unpublished or deleted posts are removed.
+
+        Args:
+            db: SQLAlchemy async session
+            post_id: Id of the changed post
+        """
+        rows_by_lang = {
+            lang: await self._detail_rows(db, lang, Post.id == post_id)
+            for lang in LANGUAGES
+        }
+        rows = rows_by_lang[FALLBACK_LANGUAGE]
+        tags = await self._tag_views(db, Post.id == post_id) if rows else {}
+        authors = {}
+        if rows:
+            authors = await self._author_views(db, Author.id == rows[0].author_id)
+
+        def replace(store: ContentStore) -> None:
+            store._authors.update(authors)
+            store._remove(post_id)
+            store._build(rows_by_lang, tags)
+
+        # No awaits from here on, so reads see the old version or the new one
+        self._apply(replace)
+
+    def remove_post(self, post_id: int) -> None:
+        """Remove a post from every index, if present."""
+        self._apply(lambda store: store._remove(post_id))
+
+    def _apply(self, change: Callable[["ContentStore"], None]) -> None:
+        """Apply a change, and journal it for every rebuild that is reading."""
+        change(self)
+        for journal in self._journals:
+            journal.append(change)
+
+    def _remove(self, post_id: int) -> None:
+        views = self._views.pop(post_id, None)
+        if views is None:
+            return
+        post = views[FALLBACK_LANGUAGE]
+        if self._by_slug.get(post.slug) == post_id:
+            del self._by_slug[post.slug]
+        order = self._order[post.is_essay]
+        del order[bisect_left(order, _sort_key(post.publish_date, post.id))]
+        slot = self._slot_by_id.pop(post_id)
+        heapq.heappush(self._free_slots, slot)
+        mask = ~(1 << slot)
+        self._kind_bits[post.is_essay] &= mask
+        for tag in post.tags:
+            self._tag_bits[tag.slug] &= mask
+            if not self._tag_bits[tag.slug]:
+                del self._tag_bits[tag.slug]
+
+    def upsert_author(self, author: Any) -> None:
+        """
+        Replace an author and the author embedded in their posts' views.
+
+        Args:
+            author: Author instance (column attributes must be loaded)
+        """
+        view = AuthorView(
+            id=author.id, name=author.name, bio=author.bio, avatar=author.avatar,
+            email=author.email, updated_at=author.updated_at,
+        )
+
+        def replace(store: ContentStore) -> None:
+            store._authors[view.id] = view
+            for post_id, views in store._views.items():
+                if views[FALLBACK_LANGUAGE].author_id == view.id:
+                    store._views[post_id] = {
+                        lang: post.replace(author=view) for lang, post in views.items()
+                    }
+
+        self._apply(replace)
+
+    # --- querying ---
+
+    def _view(self, post_id: int, lang: str) -> PostView:
+        views = self._views[post_id]
+        return views.get(lang) or views[FALLBACK_LANGUAGE]
+
+    def get_post(
+        self, slug: str, is_essay: bool, lang: str = FALLBACK_LANGUAGE
+    ) -> Optional[PostView]:
+        """
+        Get a published post or essay by slug.
+
+        Args:
+            slug: Post slug
+            is_essay: Whether the post is an essay
+            lang: Language code ('en' or 'pt')
+
+        Returns:
+            PostView if published, None otherwise
+        """
+        post_id = self._by_slug.get(slug)
+        if post_id is None:
+            return None
+        view = self._view(post_id, lang)
+        return view if view.is_essay == is_essay else None
+
+    def get_posts(
+        self, post_ids: Iterable[int], lang: str = FALLBACK_LANGUAGE
+    ) -> List[PostView]:
+        """Get published posts by id, in the given order, skipping unknown ids."""
+        return [
+            self._view(post_id, lang) for post_id in post_ids if post_id in self._views
+        ]
+
+    def list_posts(
+        self,
+        is_essay: bool,
+        lang: str = FALLBACK_LANGUAGE,
+        tag_slug: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[PostView], Optional[int], Optional[str]]:
+        """
+        Get a listing page in listing order, as the services' database path would.
+
+        Args:
+            is_essay: List essays (True) or blog posts (False)
+            lang: Language code ('en' or 'pt')
+            tag_slug: Only posts with this tag
+            page: Page number, used when there is no cursor
+            page_size: Number of posts per page
+            cursor: Opaque cursor from a previous page's next_cursor
+            include_total: Also count the matching posts
+
+        Returns:
+            Tuple of (posts, total or None, next cursor or None)
+        """
+        order = self._order[is_essay]
+        if cursor:
+            start, skip = bisect_right(order, _sort_key(*decode_cursor(cursor))), 0
+        else:
+            start, skip = 0, (page - 1) * page_size
+
+        # One extra post tells whether a next page exists
+        if tag_slug is None:
+            keys = order[start + skip:start + skip + page_size + 1]
+        else:
+            tag_bits = self._tag_bits.get(tag_slug, 0)
+            keys = []
+            for key in islice(order, start, None) if tag_bits else ():
+                if not tag_bits >> self._slot_by_id[-key[2]] & 1:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                keys.append(key)
+                if len(keys) > page_size:
+                    break
+
+        posts = [self._view(-key[2], lang) for key in keys[:page_size]]
+        next_cursor = encode_cursor(posts[-1]) if len(keys) > page_size else None
+        total = None
+        if include_total:
+            if tag_slug is None:
+                total = len(order)
+            else:
+                total = (
+                    self._tag_bits.get(tag_slug, 0) & self._kind_bits[is_essay]
+                ).bit_count()
+        return posts, total, next_cursor
+
+    def primary_author(self) -> Optional[AuthorView]:
+        """Get the author shown on the about page (lowest id)."""
+        return self._authors[min(self._authors)] if self._authors else None
+
+    def post_counts(self) -> Dict[str, int]:
+        """Get the about page post and essay counts.
+
+        Tag and comment counts aren't tracked here; they change through
+        writes that never refresh the store (see ``AboutService``).
+        """
+        return {
+            "post_count": len(self._order[False]),
+            "essay_count": len(self._order[True]),
+        }
+
+
+content_store = ContentStore()
@@ -9,13 +9,25 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 import frontmatter
 import markdown
 from fastapi import HTTPException, status
-from sqlalchemy import select, func, or_, and_, desc
+from sqlalchemy import select, delete, func, or_, and_, desc
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.future import select # Keep if used elsewhere or consolidate
 
+from hoffmagic.cache import post_cache_tags
 from hoffmagic.config import settings
-from hoffmagic.db.models import Post, Author, Tag, Comment, post_tags # Ensure Comment is imported if needed
+from hoffmagic.rendering import invalidate_rendered, needs_prerender, prerender_post
+from hoffmagic.services.blog import BlogService
+from hoffmagic.services.content_store import content_store
+from hoffmagic.services.invalidation import commit_post_write
+from hoffmagic.services.slugs import forget_slugs, resolve_post_id
+from hoffmagic.services.read_models import (
+    PostView, detail_query, language_chain, load_post_views
+)
+from hoffmagic.db.models import ( # Ensure Comment is imported if needed
+    Post, PostTranslation, Author, Tag, Comment, post_tags
+)
 from hoffmagic.api.schemas import (
     PostCreate, PostUpdate, EssaysResponse
 )
@@ -38,126 +50,133 @@ class EssaysService:
         """
         self.db = db
 
-    # --- Helper function (optional, remove if not used elsewhere) ---
-    # def _get_localized_field(self, obj, field_name: str, lang: str) -> Any:
-    #     if lang == "pt":
-    #         pt_field_name = f"{field_name}_pt"
-    #         localized_value = getattr(obj, pt_field_name, None)
-    #         if localized_value:
-    #             return localized_value
-    #     return getattr(obj, field_name, None)
+    async def _ensure_rendered(self, essay: Post) -> None:
+        """Re-render stored HTML if the source or renderer config changed."""
+        if await prerender_post(essay):
+            logger.info(f"Refreshed stale rendered HTML for slug: {essay.slug}")
+            await self.db.commit()
 
     async def get_essays(
         self,
         page: int = 1,
         page_size: int = 10,
         tag_slug: Optional[str] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         """
         Get essays with pagination, filtering, and search.
-        """
-        try:
-            query = (
-                select(Post)
-                .where(Post.is_published == True)
-                .where(Post.is_essay == True)
-                .options(
-                    selectinload(Post.author),
-                    selectinload(Post.tags)
-                )
-                .order_by(desc(Post.publish_date))
-            )
-
-            # Apply tag filter
-            if tag_slug:
-                tag_subquery = select(Tag.id).where(Tag.slug == tag_slug).scalar_subquery()
-                query = query.join(post_tags).where(post_tags.c.tag_id == tag_subquery)
-
-            # Apply search filter
-            if search:
-                search_term = f"%{search}%"
-                query = query.where(
-                    or_(
-                        Post.title.ilike(search_term),
-                        Post.content.ilike(search_term),
-                        Post.summary.ilike(search_term)
-                    )
-                )
 
-            # Get total count for pagination
-            count_query = select(func.count()).select_from(query.subquery())
-            total = await self.db.scalar(count_query) or 0
-
-            # Apply pagination
-            query = query.offset((page - 1) * page_size).limit(page_size)
-            essays = (await self.db.execute(query)).scalars().all()
-
-            # Calculate pages
-            pages = (total + page_size - 1) // page_size if total > 0 else 1
-
-            return {
-                "items": essays,
-                "total": total,
-                "page": page,
-                "page_size": page_size,
-                "pages": pages
-            }
-        except Exception as e:
-            logger.error(f"Error getting essays: {str(e)}")
-            raise
+        Pages are addressed either by ``page`` (offset) or by ``cursor`` (keyset,
+        constant cost at any depth); every response carries ``next_cursor``.
+        Totals come from a short-lived cache and can be skipped entirely.
+        Essays are posts with ``is_essay`` set, so this is
+        :meth:`BlogService.get_posts` for essays in English.
+        """
+        response = await BlogService(self.db).get_posts(
+            page=page,
+            page_size=page_size,
+            tag_slug=tag_slug,
+            search=search,
+            is_essay=True,
+            cursor=cursor,
+            include_total=include_total,
+        )
+        return dict(response)
 
-    async def get_essay_by_slug(self, slug: str, lang: str = 'en') -> Optional[Post]:
+    async def get_essay_by_slug(self, slug: str) -> Optional[Post]:
         """
-        Get an essay by its slug, applying localization if necessary.
+        Get an essay entity by its slug, for modification.
+
+        Reads for display go through :meth:`get_essay_view` instead.
 
         Args:
             slug: Essay slug
-            lang: Language code ('en' or 'pt')
 
         Returns:
             Essay object if found, None otherwise
         """
-        logger.debug(f"Fetching essay by slug: {slug}, lang: {lang}")
+        logger.debug(f"Fetching essay by slug: {slug}")
         # Essays are just posts with is_essay=True
         query = (
             select(Post)
             .where(Post.slug == slug, Post.is_essay == True) # Combined where
             .options(
                 selectinload(Post.tags), # Use selectinload for collections
-                selectinload(Post.author) # Use selectinload for one-to-one/many-to-one
-                # Comments might not be relevant for essays, adjust as needed
-                # If needed: selectinload(Post.comments).where(Comment.is_approved == True)
+                selectinload(Post.author), # Use selectinload for one-to-one/many-to-one
+                selectinload(Post.translations), # Synced when stale HTML is re-rendered
             )
         )
         result = await self.db.execute(query)
         essay = result.scalars().first() # Use scalars().first()
 
-        if essay and lang == 'pt':
-            logger.debug(f"Essay found, attempting to localize fields to Portuguese for slug: {slug}")
-            # Overwrite fields with Portuguese versions if they exist and are not empty
-            title_pt = getattr(essay, 'title_pt', None)
-            content_pt = getattr(essay, 'content_pt', None)
-            summary_pt = getattr(essay, 'summary_pt', None)
-
-            if title_pt:
-                essay.title = title_pt
-                logger.debug(f"Applied title_pt for essay slug: {slug}")
-            if content_pt:
-                essay.content = content_pt
-                logger.debug(f"Applied content_pt for essay slug: {slug}")
-            if summary_pt:
-                essay.summary = summary_pt
-                logger.debug(f"Applied summary_pt for essay slug: {slug}")
-            # Localize comments if loaded and relevant
-            # if essay.comments:
-            #      for comment in essay.comments:
-            #          if hasattr(comment, 'content_pt') and comment.content_pt:
-            #              comment.content = comment.content_pt
-            #              logger.debug(f"Applied content_pt for comment ID: {comment.id} on essay slug: {slug}")
+        if essay:
+            await self._ensure_rendered(essay)
 
         return essay
 
+    async def get_essay_view(self, slug: str, lang: str = 'en') -> Optional[PostView]:
+        """
+        Get a read-only view of an essay in one language, falling back to English.
+
+        Args:
+            slug: Essay slug
+            lang: Language code ('en' or 'pt')
+
+        Returns:
+            PostView if found, None otherwise
+        """
+        logger.debug(f"Fetching essay view by slug: {slug}, lang: {lang}")
+        if content_store.ready:
+            view = content_store.get_post(slug, True, lang)
+            if view is not None:
+                return view
+        query = detail_query(lang).where(Post.slug == slug, Post.is_essay == True)
+        row = (await self.db.execute(query)).first()
+        if row is None:
+            return None
+        if needs_prerender(row, language_chain(lang)):
+            await self._ensure_rendered(
+                await self.db.get(
+                    Post, row.id, options=[selectinload(Post.translations)]
+                )
+            )
+            row = (await self.db.execute(query)).first()
+
+        views = await load_post_views(self.db, [row], lang)
+        return views[0]
+
+    async def get_essay_validator(self, slug: str) -> Optional[Row]:
+        """
+        Get the values an essay response depends on, without loading the essay.
+
+        Used to answer conditional requests before any body is loaded or rendered.
+
+        Args:
+            slug: Essay slug
+
+        Returns:
+            Row (or stored view) with updated_at, author_updated_at and is_published,
+            None if not found
+        """
+        if content_store.ready:
+            # Published essays only; drafts are looked up below
+            view = content_store.get_post(slug, True)
+            if view is not None:
+                return view
+        query = (
+            select(
+                Post.updated_at,
+                Post.is_published,
+                Author.updated_at.label("author_updated_at"),
+            )
+            .outerjoin(Author, Author.id == Post.author_id)
+            .where(Post.slug == slug, Post.is_essay == True)
+        )
+        result = await self.db.execute(query)
+        return result.first()
+
     async def create_essay(self, essay_data: Dict[str, Any]) -> Post:
         """
         Create a new essay.
@@ -168,9 +187,8 @@ class EssaysService:
         Returns:
             Created essay object
         """
-        # Check if slug is already in use
-        existing_essay = await self.get_essay_by_slug(essay_data["slug"])
-        if existing_essay:
+        # Check if slug is already in use (slugs are unique across posts and essays)
+        if await resolve_post_id(self.db, essay_data["slug"]) is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Essay with slug '{essay_data['slug']}' already exists",
@@ -188,6 +206,7 @@ class EssaysService:
         # Create essay instance
         essay = Post(**essay_data)
         essay.tags = tags
+        await prerender_post(essay)
         
         # Add publish date if essay is published
         if essay.is_published:
@@ -195,9 +214,14 @@ class EssaysService:
         
         # Save to database
         self.db.add(essay)
-        await self.db.commit()
-        await self.db.refresh(essay)
-        
+        await self.db.flush()
+        stale_pages = post_cache_tags(
+            essay.slug, essay.is_essay, [tag.slug for tag in tags]
+        )
+        await commit_post_write(
+            self.db, essay.id, essay, tags, stale_pages, [essay.slug]
+        )
+
         return essay
     
     async def update_essay(
@@ -215,10 +239,18 @@ class EssaysService:
         Returns:
             Updated essay object if found, None otherwise
         """
-        # Get existing essay
-        essay = await self.get_essay_by_slug(slug)
-        
+        # Get existing essay; tags are needed for cache invalidation
+        essay_id = await resolve_post_id(self.db, slug, is_essay=True)
+        essay = None
+        if essay_id is not None:
+            essay = await self.db.get(
+                Post,
+                essay_id,
+                options=[selectinload(Post.tags), selectinload(Post.translations)],
+            )
+
         if not essay:
+            forget_slugs(slug)
             return None
         
         # Update essay fields
@@ -228,13 +260,17 @@ class EssaysService:
         new_slug = update_data.get("slug")
         if new_slug and new_slug != slug:
             # Check if new slug is already in use
-            existing_essay = await self.get_essay_by_slug(new_slug)
-            if existing_essay:
+            if await resolve_post_id(self.db, new_slug) is not None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Essay with slug '{new_slug}' already exists",
                 )
         
+        # Pages showing the post before this update
+        stale_pages = post_cache_tags(
+            slug, essay.is_essay, [tag.slug for tag in essay.tags]
+        )
+
         # Handle tags
         tag_ids = update_data.pop("tag_ids", None)
         if tag_ids is not None:
@@ -247,12 +283,21 @@ class EssaysService:
             essay.publish_date = datetime.now()
         
         # Update other fields
+        previous_sources = (essay.content, *(row.content for row in essay.translations))
         for key, value in update_data.items():
             setattr(essay, key, value)
+        await prerender_post(essay)
+        tags = list(essay.tags)
+        tag_slugs = [tag.slug for tag in tags]
+        stale_pages += post_cache_tags(essay.slug, essay.is_essay, tag_slugs)
         
-        # Save changes
-        await self.db.commit()
-        await self.db.refresh(essay)
+        # Save changes and invalidate pages showing the old and new version
+        await commit_post_write(
+            self.db, essay.id, essay, tags, stale_pages, [slug, essay.slug]
+        )
+
+        # Free cached renders of the replaced content
+        invalidate_rendered(*previous_sources)
         
         return essay
     
@@ -266,15 +311,35 @@ class EssaysService:
         Returns:
             True if deleted, False if not found
         """
-        # Get existing essay
-        essay = await self.get_essay_by_slug(slug)
-        
-        if not essay:
+        essay_id = await resolve_post_id(self.db, slug, is_essay=True)
+        if essay_id is None:
+            return False
+        essay = (await self.db.execute(
+            select(Post.id, Post.slug, Post.is_essay, Post.content)
+            .where(Post.id == essay_id)
+        )).first()
+        if essay is None:
+            forget_slugs(slug)
             return False
+        translated_sources = (await self.db.execute(
+            select(PostTranslation.content).where(PostTranslation.post_id == essay_id)
+        )).scalars().all()
+        tag_slugs = (await self.db.execute(
+            select(Tag.slug)
+            .join(post_tags, post_tags.c.tag_id == Tag.id)
+            .where(post_tags.c.post_id == essay_id)
+        )).scalars().all()
         
-        # Delete essay
-        await self.db.delete(essay)
-        await self.db.commit()
+        # Delete essay with set-based statements, so comment trees are never
+        # loaded; translations go with the essay through ON DELETE CASCADE
+        stale_pages = post_cache_tags(essay.slug, essay.is_essay, tag_slugs)
+        await self.db.execute(delete(Comment).where(Comment.post_id == essay_id))
+        await self.db.execute(delete(post_tags).where(post_tags.c.post_id == essay_id))
+        await self.db.execute(delete(Post).where(Post.id == essay_id))
+        await commit_post_write(
+            self.db, essay_id, stale_pages=stale_pages, slugs=[slug]
+        )
+        invalidate_rendered(essay.content, *translated_sources)
         
         return True
     # Removed load_markdown_essays. Content syncing should be explicit.
@@ -0,0 +1,172 @@
+"""
+Keeps caches and in-memory indexes in line with post writes, on every replica.
+
+The services commit post writes through :func:`commit_post_write`, which
+publishes an invalidation event (see :mod:`hoffmagic.cache.bus`) and applies
+the write to this process; other replicas apply the same event through
+:func:`apply_event`. Both end in :func:`after_post_write`. When events may
+have been missed, everything is rebuilt.
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from hoffmagic.cache import bus, page_cache
+from hoffmagic.db.models import Author, Post
+from hoffmagic.search import search_index, suggest_index
+from hoffmagic.services.about import blog_stats
+from hoffmagic.services.content_store import content_store
+from hoffmagic.services.pagination import post_counts
+from hoffmagic.services.slugs import forget_slugs, post_ids
+
+# Initialize logger
+logger = logging.getLogger("hoffmagic.services.invalidation")
+
+
+async def after_post_write(
+    db: AsyncSession,
+    post_id: int,
+    post: Optional[Post] = None,
+    tags: Sequence[Any] = (),
+    stale_pages: Iterable[str] = (),
+    slugs: Iterable[str] = (),
+) -> None:
+    """
+    Bring this process's caches and indexes in line with a committed post write.
+
+    Args:
+        db: SQLAlchemy async session
+        post_id: Id of the written post
+        post: The post as committed, with translations loaded, or None if it
+            was deleted
+        tags: The post's tags (with ``name`` and ``slug``)
+        stale_pages: Page cache tags of pages showing the post before and after
+        slugs: Slugs whose id lookups are stale
+    """
+    page_cache.invalidate(*stale_pages)
+    forget_slugs(*slugs)
+    post_counts.clear()
+    blog_stats.clear()
+    if post is None:
+        search_index.remove(post_id)
+        suggest_index.remove_post(post_id)
+        content_store.remove_post(post_id)
+        return
+    # Unpublished posts are dropped by each index
+    if search_index.ready:
+        search_index.upsert(post, [tag.slug for tag in tags])
+    suggest_index.upsert_post(post, tags)
+    if content_store.ready:
+        await content_store.refresh_post(db, post_id)
+
+
+async def commit_post_write(
+    db: AsyncSession,
+    post_id: int,
+    post: Optional[Post] = None,
+    tags: Sequence[Any] = (),
+    stale_pages: Sequence[str] = (),
+    slugs: Sequence[str] = (),
+) -> None:
+    """
+    Commit a post write and invalidate what it changed, here and on other replicas.
+
+    The invalidation event is published in the write's transaction, so other
+    replicas hear about it when it commits. Arguments are as for
+    :func:`after_post_write`; ``post`` is refreshed after the commit.
+    """
+    await bus.publish(db, pages=stale_pages, slugs=slugs, post_id=post_id)
+    await db.commit()
+    if post is not None:
+        await db.refresh(post)
+        # The indexes read the translations, which a plain refresh leaves
+        # unloaded unless the post was loaded with them
+        await db.refresh(post, ["translations"])
+    await after_post_write(db, post_id, post, tags, stale_pages, slugs)
+
+
+async def apply_event(
+    session_factory: Callable[[], Any], event: Dict[str, Any]
+) -> None:
+    """
+    Apply one invalidation event written by another process.
+
+    Args:
+        session_factory: Callable returning an async session context manager
+        event: Decoded event with pages, slugs, post_id and author_id
+    """
+    post_id, author_id = event.get("post_id"), event.get("author_id")
+    if post_id is None:
+        page_cache.invalidate(*event.get("pages", ()))
+        forget_slugs(*event.get("slugs", ()))
+        post_counts.clear()
+        blog_stats.clear()
+        if author_id is None:
+            return
+
+    async with session_factory() as db:
+        if post_id is not None:
+            post = (await db.execute(
+                select(Post)
+                .where(Post.id == post_id)
+                .options(selectinload(Post.tags), selectinload(Post.translations))
+            )).scalar_one_or_none()
+            await after_post_write(
+                db, post_id, post, post.tags if post is not None else (),
+                event.get("pages", ()), event.get("slugs", ()),
+            )
+        if author_id is not None and content_store.ready:
+            author = await db.get(Author, author_id)
+            if author is not None:
+                content_store.upsert_author(author)
+    logger.debug(f"Applied cache invalidation: {event}")
+
+
+async def resync(session_factory: Callable[[], Any], indexes: Iterable[Any]) -> None:
+    """
+    Drop every local cache and rebuild the in-memory indexes.
+
+    Args:
+        session_factory: Callable returning an async session context manager
+        indexes: Objects with an async ``rebuild(db)`` method
+    """
+    page_cache.clear()
+    post_counts.clear()
+    blog_stats.clear()
+    post_ids.clear()
+    for index in indexes:
+        try:
+            async with session_factory() as db:
+                await index.rebuild(db)
+        except Exception as e:
+            logger.error(
+                f"Error rebuilding {type(index).__name__} "
+                f"after missed invalidations: {e}"
+            )
+    logger.info("Resynced local caches")
+
+
+async def listen_for_invalidations(
+    session_factory: Callable[[], Any], indexes: Iterable[Any]
+) -> None:
+    """
+    Keep this process's caches in sync with writes made by other replicas.
+
+    Runs until cancelled; started as a background task at startup.
+
+    Args:
+        session_factory: Callable returning an async session context manager
+        indexes: In-memory indexes to rebuild after a reconnect
+    """
+    indexes = list(indexes)
+
+    async def handle(event: Dict[str, Any]) -> None:
+        await apply_event(session_factory, event)
+
+    async def full_resync() -> None:
+        await resync(session_factory, indexes)
+
+    await bus.listen(handle, full_resync)
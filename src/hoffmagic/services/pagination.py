@@ -0,0 +1,105 @@
+"""
+Keyset pagination helpers shared by the blog and essays services.
+
+Listings are ordered by ``(publish_date DESC NULLS LAST, id DESC)``. A cursor
+encodes the sort key of the last item on a page, so the next page is a range
+scan that costs the same at any depth, unlike ``OFFSET``.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Hashable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import Select
+
+from hoffmagic.cache.ttl import TTLCache
+from hoffmagic.config import settings
+from hoffmagic.db.models import Post
+
+# Listing totals per filter, so paging does not re-count the archive each time
+post_counts = TTLCache(settings.CACHE_TTL, name="post-counts")
+
+LISTING_ORDER = (Post.publish_date.desc().nulls_last(), Post.id.desc())
+
+
+def encode_keyset(sort_date: Optional[datetime], item_id: int) -> str:
+    """
+    Build an opaque cursor from a (date, id) sort key.
+
+    Args:
+        sort_date: Date part of the sort key, if any
+        item_id: Id tiebreaker
+
+    Returns:
+        URL-safe cursor string, readable with :func:`decode_cursor`
+    """
+    raw = json.dumps(
+        [sort_date.isoformat() if sort_date else None, item_id], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def encode_cursor(post: Any) -> str:
+    """
+    Build an opaque cursor pointing just after the given post.
+
+    Args:
+        post: Last post (or post view) of the current page
+
+    Returns:
+        URL-safe cursor string
+    """
+    return encode_keyset(post.publish_date, post.id)
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a cursor produced by :func:`encode_cursor` or :func:`encode_keyset`.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        publish_date, post_id = json.loads(raw)
+        return (datetime.fromisoformat(publish_date) if publish_date else None), int(
+            post_id
+        )
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from e
+
+
+def after_cursor(query: Select, cursor: str) -> Select:
+    """
+    Restrict a listing query to the items after a cursor.
+
+    Args:
+        query: Listing query ordered by ``LISTING_ORDER``
+        cursor: Cursor from a previous page
+
+    Returns:
+        Filtered query
+    """
+    publish_date, post_id = decode_cursor(cursor)
+    if publish_date is None:
+        # Undated posts sort last; only the id decides among them
+        return query.where(and_(Post.publish_date.is_(None), Post.id < post_id))
+    return query.where(
+        or_(
+            tuple_(Post.publish_date, Post.id) < tuple_(publish_date, post_id),
+            Post.publish_date.is_(None),
+        )
+    )
+
+
+def count_key(
+    is_essay: bool, tag_slug: Optional[str], search: Optional[str]
+) -> Hashable:
+    """Get the :data:`post_counts` key for a listing filter."""
+    return (is_essay, tag_slug or None, search or None)
@@ -0,0 +1,268 @@
+"""
+Immutable, language-resolved read models for posts.
+
+Services build these straight from column rows for one language (with the
+English fallback already applied) instead of loading ORM entities and
+overwriting their fields. They carry no session state and cannot be
+modified, so they can be cached and shared between requests.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from hoffmagic.cache.conditional import make_etag
+from hoffmagic.db.models import Author, Post, PostTranslation, Tag, post_tags
+from hoffmagic.rendering.renderer import renderer_signature
+
+FALLBACK_LANGUAGE = "en"
+
+# Languages stored in post_translations; English lives on the post row
+TRANSLATED_LANGUAGES = ("pt",)
+
+# Columns every post view needs, whatever the language
+POST_COLUMNS = (
+    Post.id,
+    Post.slug,
+    Post.is_published,
+    Post.is_essay,
+    Post.featured_image,
+    Post.created_at,
+    Post.updated_at,
+    Post.publish_date,
+    Post.author_id,
+    Post.content_meta,
+)
+
+# View field -> post_translations column
+TRANSLATION_COLUMNS = {
+    "title": PostTranslation.title,
+    "summary": PostTranslation.summary,
+    "content": PostTranslation.content,
+    "content_html": PostTranslation.rendered_html,
+    "content_hash": PostTranslation.content_hash,
+}
+
+LISTING_FIELDS = ("title", "summary")
+DETAIL_FIELDS = ("title", "summary", "content", "content_html", "content_hash")
+
+
+def language_chain(lang: str) -> Tuple[str, ...]:
+    """Get the languages to try for a field, requested language first."""
+    if lang in TRANSLATED_LANGUAGES:
+        return (lang, FALLBACK_LANGUAGE)
+    return (FALLBACK_LANGUAGE,)
+
+
+def localized_query(lang: str, fields: Iterable[str]) -> Select:
+    """
+    Select the post columns plus the given fields in a language and its fallback.
+
+    Only the requested language's translation row is joined, so row width does
+    not grow with the number of languages. Translated values are labelled
+    ``<field>_<lang>`` (e.g. ``title_pt``).
+
+    Args:
+        lang: Language code ('en' or 'pt')
+        fields: Field names, e.g. ``("title", "summary")``
+
+    Returns:
+        Query to extend with filters and ordering
+    """
+    fields = tuple(fields)
+    columns = [*POST_COLUMNS, *(getattr(Post, field) for field in fields)]
+    if lang not in TRANSLATED_LANGUAGES:
+        return select(*columns)
+    columns += [TRANSLATION_COLUMNS[field].label(f"{field}_{lang}") for field in fields]
+    return select(*columns).outerjoin(
+        PostTranslation,
+        and_(PostTranslation.post_id == Post.id, PostTranslation.lang == lang),
+    )
+
+
+def listing_query(lang: str) -> Select:
+    """Select what a listing row needs in a language (no bodies)."""
+    return localized_query(lang, LISTING_FIELDS)
+
+
+def detail_query(lang: str) -> Select:
+    """Select what a detail row needs in a language, including render state."""
+    return localized_query(lang, DETAIL_FIELDS)
+
+
+class ReadModel:
+    """
+    Base for slotted, read-only views. Fields missing from the constructor are None.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **values: Any) -> None:
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__[:3]
+        )
+        return f"{type(self).__name__}({fields}, ...)"
+
+    @classmethod
+    def from_row(cls, row: Any) -> "ReadModel":
+        """Build from a row whose column names match the slots."""
+        return cls(**row._mapping)
+
+    def replace(self, **changes: Any) -> "ReadModel":
+        """Get a copy with some fields changed."""
+        return type(self)(
+            **{**{name: getattr(self, name) for name in self.__slots__}, **changes}
+        )
+
+
+class AuthorView(ReadModel):
+    __slots__ = ("id", "name", "bio", "avatar", "email", "updated_at")
+
+
+class TagView(ReadModel):
+    __slots__ = ("id", "name", "slug")
+
+
+class CommentView(ReadModel):
+    """An approved comment with its approved replies, oldest first."""
+
+    __slots__ = ("id", "parent_id", "content", "author_name", "created_at", "replies")
+
+
+class PostView(ReadModel):
+    """A post resolved to one language; ``content`` fields are None for listing rows."""
+
+    __slots__ = (
+        "id", "slug", "lang", "title", "summary", "content", "content_html",
+        "content_meta", "is_published", "is_essay", "featured_image", "created_at",
+        "updated_at", "publish_date", "author_id", "author", "tags", "search_snippet",
+    )
+
+    @classmethod
+    def from_localized_row(cls, row: Any, lang: str, **related: Any) -> "PostView":
+        """
+        Build from a row selected with :func:`listing_query` or :func:`detail_query`.
+
+        Args:
+            row: Result row
+            lang: Language the row was selected for
+            **related: author, tags and search_snippet
+
+        Returns:
+            View with each localized field taken from the first non-empty
+            column in the language chain
+        """
+        values = dict(row._mapping)
+        chain = language_chain(lang)
+        for field in DETAIL_FIELDS:
+            names = [
+                field if chain_lang == FALLBACK_LANGUAGE else f"{field}_{chain_lang}"
+                for chain_lang in chain
+            ]
+            values[field] = next(
+                (values[name] for name in names if values.get(name)), None
+            )
+        values.setdefault("tags", ())
+        return cls(lang=lang, **{**values, **related})
+
+    @property
+    def author_updated_at(self) -> Optional[datetime]:
+        """When the embedded author last changed, for response validators."""
+        return self.author.updated_at if self.author is not None else None
+
+
+def post_validators(validator: Any, lang: str) -> Tuple[str, Optional[datetime]]:
+    """
+    Get the ETag and Last-Modified of a post detail response.
+
+    The body depends on the post, its author, the renderer configuration (via
+    the stored HTML) and the language, so a change to any of them must
+    change the ETag.
+
+    Args:
+        validator: Row or view with ``updated_at`` and ``author_updated_at``
+        lang: Language the response is rendered in
+
+    Returns:
+        Tuple of (weak ETag, last modification time or None)
+    """
+    author_updated_at = getattr(validator, "author_updated_at", None)
+    etag = make_etag(
+        validator.updated_at, author_updated_at, renderer_signature(), lang
+    )
+    candidates = [
+        value
+        for value in (validator.updated_at, author_updated_at)
+        if value is not None
+    ]
+    return etag, max(candidates) if candidates else None
+
+
+async def load_post_views(
+    db: AsyncSession,
+    rows: Sequence[Any],
+    lang: str,
+    search_snippets: Optional[Dict[int, str]] = None,
+) -> List[PostView]:
+    """
+    Build post views for rows, batch-loading authors and tags.
+
+    Args:
+        db: SQLAlchemy async session
+        rows: Rows selected with :func:`listing_query` or :func:`detail_query`
+        lang: Language the rows were selected for
+        search_snippets: Highlighted excerpts by post id, for search results
+
+    Returns:
+        Views in the order of ``rows``
+    """
+    if not rows:
+        return []
+    post_ids = [row.id for row in rows]
+    author_ids = {row.author_id for row in rows}
+
+    author_rows = await db.execute(
+        select(
+            Author.id,
+            Author.name,
+            Author.bio,
+            Author.avatar,
+            Author.email,
+            Author.updated_at,
+        ).where(Author.id.in_(author_ids))
+    )
+    authors = {author.id: AuthorView.from_row(author) for author in author_rows}
+
+    tags: Dict[int, List[TagView]] = {post_id: [] for post_id in post_ids}
+    tag_rows = await db.execute(
+        select(post_tags.c.post_id, Tag.id, Tag.name, Tag.slug)
+        .join(Tag, Tag.id == post_tags.c.tag_id)
+        .where(post_tags.c.post_id.in_(post_ids))
+        .order_by(Tag.id)
+    )
+    for tag in tag_rows:
+        tags[tag.post_id].append(TagView(id=tag.id, name=tag.name, slug=tag.slug))
+
+    snippets = search_snippets or {}
+    return [
+        PostView.from_localized_row(
+            row,
+            lang,
+            author=authors.get(row.author_id),
+            tags=tuple(tags[row.id]),
+            search_snippet=snippets.get(row.id),
+        )
+        for row in rows
+    ]
@@ -0,0 +1,98 @@
+"""
+Cheap slug -> id resolution for write paths.
+
+Writes mostly need a post's id, or to know whether a slug is taken, not the
+post with its tags, author and comments. Ids are looked up with an id-only
+query and remembered per slug; writes that change or remove a slug forget
+it, and entries expire after ``Settings.CACHE_TTL`` so changes made by other
+processes (seed_content, other replicas) show up.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Relative imports: seed_content loads the app as ``src.hoffmagic`` and uses
+# this module, and a second copy of the models would clash on the metadata
+from ..cache.ttl import TTLCache
+from ..config import settings
+from ..db.models import Post
+
+# Slug -> (post id, is_essay); only existing slugs are cached
+post_ids = TTLCache(settings.CACHE_TTL, max_entries=4096, name="post-ids")
+
+
+def _matches(entry: Tuple[int, bool], is_essay: Optional[bool]) -> bool:
+    return is_essay is None or entry[1] == is_essay
+
+
+async def resolve_post_id(
+    db: AsyncSession,
+    slug: str,
+    is_essay: Optional[bool] = None,
+) -> Optional[int]:
+    """
+    Get the id of the post with a slug.
+
+    Args:
+        db: SQLAlchemy async session
+        slug: Post slug
+        is_essay: Only match essays (True) or blog posts (False); None matches
+            either, e.g. to check that a slug is free
+
+    Returns:
+        Post id if found, None otherwise
+    """
+    entry = post_ids.get(slug)
+    if entry is None:
+        row = (
+            await db.execute(select(Post.id, Post.is_essay).where(Post.slug == slug))
+        ).first()
+        if row is None:
+            return None
+        entry = (row.id, row.is_essay)
+        post_ids.put(slug, entry)
+    return entry[0] if _matches(entry, is_essay) else None
+
+
+async def resolve_post_ids(
+    db: AsyncSession,
+    slugs: Iterable[str],
+    is_essay: Optional[bool] = None,
+) -> Dict[str, int]:
+    """
+    Get the ids of many posts by slug, with one query for the uncached ones.
+
+    Args:
+        db: SQLAlchemy async session
+        slugs: Post slugs
+        is_essay: Only match essays (True) or blog posts (False); None matches either
+
+    Returns:
+        Post id by slug, for the slugs that were found
+    """
+    entries = {}
+    missing = []
+    for slug in dict.fromkeys(slugs):
+        entry = post_ids.get(slug)
+        if entry is None:
+            missing.append(slug)
+        else:
+            entries[slug] = entry
+    if missing:
+        rows = await db.execute(
+            select(Post.slug, Post.id, Post.is_essay).where(Post.slug.in_(missing))
+        )
+        for row in rows:
+            entries[row.slug] = (row.id, row.is_essay)
+            post_ids.put(row.slug, entries[row.slug])
+    return {
+        slug: entry[0] for slug, entry in entries.items() if _matches(entry, is_essay)
+    }
+
+
+def forget_slugs(*slugs: Optional[str]) -> None:
+    """Drop cached ids of slugs that were changed, removed or reassigned."""
+    for slug in slugs:
+        if slug:
+            post_ids.discard(slug)
@@ -0,0 +1,157 @@
+"""
+The hot listing and lookup queries are planned on the indexes they were tuned for.
+
+Marked ``requires_db``: runs EXPLAIN against ``DATABASE_URL`` (migrated to
+head) and skips when the database is unreachable, unless ``REQUIRE_DB`` is
+set, which turns the skip into a failure. CI must run ``just query-plans``
+against a Postgres service; a plain ``pytest`` run without one proves nothing
+about the plans.
+
+The expected index names are the ones the indexes were added for; they have
+not yet been checked against recorded plans. In particular the tag listing
+may be planned from ``ix_posts_published_listing`` with ``post_tags_pkey``
+probes instead of ``ix_post_tags_tag_id_post_id``. When a plan legitimately
+differs, update ``QUERY_SHAPES`` from the plan printed by the failure.
+"""
+import asyncio
+import datetime
+import json
+import os
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Set, Tuple
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import Select
+
+from hoffmagic.config import settings
+from hoffmagic.db.models import Comment, Post, Tag, post_tags
+from hoffmagic.services.about import blog_stats_query
+from hoffmagic.services.pagination import LISTING_ORDER, after_cursor, encode_cursor
+from hoffmagic.services.read_models import detail_query, listing_query
+
+pytestmark = pytest.mark.requires_db
+
+
+def _listing(is_essay: bool) -> Select:
+    return (
+        listing_query("en")
+        .where(Post.is_published == True, Post.is_essay == is_essay)
+        .order_by(*LISTING_ORDER)
+        .limit(11)
+    )
+
+
+def _tag_listing() -> Select:
+    tag_subquery = select(Tag.id).where(Tag.slug == "python").scalar_subquery()
+    return (
+        _listing(False)
+        .join(post_tags, post_tags.c.post_id == Post.id)
+        .where(post_tags.c.tag_id == tag_subquery)
+    )
+
+
+def _cursor_page() -> Select:
+    last = SimpleNamespace(
+        publish_date=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+        id=1000,
+    )
+    return after_cursor(_listing(False), encode_cursor(last))
+
+
+def _detail() -> Select:
+    return detail_query("pt").where(Post.slug == "hello-world", Post.is_essay == False)
+
+
+def _approved_comments() -> Select:
+    # Top-level page of get_comment_threads; replies join on parent_id per post
+    return (
+        select(
+            Comment.id,
+            Comment.parent_id,
+            Comment.content,
+            Comment.author_name,
+            Comment.created_at,
+        )
+        .where(
+            Comment.post_id == 1,
+            Comment.parent_id.is_(None),
+            Comment.is_approved == True,
+        )
+        .order_by(Comment.created_at, Comment.id)
+        .limit(21)
+    )
+
+
+# Query shape -> (builder, indexes its plan must use). Mirrors the service queries:
+# get_posts/get_essays (first page, tag filter, cursor page), get_post_view /
+# get_essay_view, a page of approved comment threads and get_blog_stats. The
+# blog stats comment count has no post_id predicate, so no comment index is
+# expected for it; only the published-posts pass is tied to an index.
+QUERY_SHAPES: Dict[str, Tuple[Callable[[], Select], Set[str]]] = {
+    "blog listing": (lambda: _listing(False), {"ix_posts_published_listing"}),
+    "essays listing": (lambda: _listing(True), {"ix_posts_published_listing"}),
+    "tag listing": (_tag_listing, {"ix_post_tags_tag_id_post_id"}),
+    "cursor page": (_cursor_page, {"ix_posts_published_listing"}),
+    "post by slug": (_detail, {"ix_posts_slug", "ix_post_translations_post_id_lang"}),
+    "approved comments": (_approved_comments, {"ix_comments_post_id_approved"}),
+    "blog stats": (blog_stats_query, {"ix_posts_published_listing"}),
+}
+
+
+def plan_indexes(plan: Dict[str, Any]) -> Set[str]:
+    """Collect the index names used anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    found = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        found |= plan_indexes(child)
+    return found
+
+
+async def _explain_all() -> Dict[str, Any]:
+    """EXPLAIN every query shape; returns plans by shape name."""
+    engine = create_async_engine(
+        str(settings.DATABASE_URL),
+        poolclass=NullPool,
+        connect_args={"connect_timeout": 3},
+    )
+    plans = {}
+    try:
+        async with engine.connect() as conn:
+            # Test tables are tiny, where a sequential scan always wins; rule it out
+            # so the plans show which indexes the queries *can* use.
+            await conn.execute(text("SET enable_seqscan = off"))
+            for name, (build, _) in QUERY_SHAPES.items():
+                compiled = build().compile(dialect=conn.dialect)
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                )
+                plan = result.scalar()
+                plans[name] = json.loads(plan) if isinstance(plan, str) else plan
+    finally:
+        await engine.dispose()
+    return plans
+
+
+@pytest.fixture(scope="module")
+def plans() -> Dict[str, Any]:
+    try:
+        return asyncio.run(_explain_all())
+    except (OperationalError, OSError) as e:
+        if os.environ.get("REQUIRE_DB"):
+            pytest.fail(f"Database unreachable and REQUIRE_DB is set: {e}")
+        pytest.skip(f"Database unreachable (set REQUIRE_DB to fail instead): {e}")
+
+
+@pytest.mark.parametrize("name", list(QUERY_SHAPES))
+def test_query_uses_indexes(plans: Dict[str, Any], name: str) -> None:
+    _, expected = QUERY_SHAPES[name]
+    used = plan_indexes(plans[name][0]["Plan"])
+    missing = expected - used
+    assert not missing, (
+        f"{name} does not use {', '.join(sorted(missing))} "
+        f"(used: {', '.join(sorted(used)) or 'none'})\n"
+        f"{json.dumps(plans[name], indent=2)}"
+    )
@@ -0,0 +1,40 @@
+"""
+Every markdown engine renders the content corpus like python-markdown.
+"""
+from pathlib import Path
+
+import pytest
+
+from hoffmagic.rendering.conformance import load_corpus, render_diff
+from hoffmagic.rendering.engines import (
+    ENGINES, MarkdownEngine, PythonMarkdownEngine, create_engine
+)
+
+CONTENT_DIR = Path(__file__).resolve().parents[2] / "content"
+CORPUS = load_corpus(CONTENT_DIR)
+CANDIDATES = [name for name in ENGINES if name != PythonMarkdownEngine.name]
+
+
+@pytest.fixture(scope="module", params=CANDIDATES)
+def engine(request: pytest.FixtureRequest) -> MarkdownEngine:
+    try:
+        return create_engine(request.param)
+    except ImportError as e:
+        pytest.skip(f"{request.param} dependencies not installed: {e}")
+
+
+@pytest.fixture(scope="module")
+def reference() -> PythonMarkdownEngine:
+    return PythonMarkdownEngine()
+
+
+def test_corpus_includes_content_files() -> None:
+    assert any(not name.startswith("feature:") for name in CORPUS)
+
+
+@pytest.mark.parametrize("doc_name", list(CORPUS))
+def test_engine_matches_reference(
+    engine: MarkdownEngine, reference: PythonMarkdownEngine, doc_name: str
+) -> None:
+    diff = render_diff(reference, engine, CORPUS[doc_name])
+    assert not diff, "\n".join(diff[:40])